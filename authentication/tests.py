@@ -1,6 +1,7 @@
 from django.test import TestCase, override_settings
 from rest_framework.test import APIClient
 from django.core import mail
+from notifications.outbox import deliver_pending
 from django.contrib.auth import get_user_model
 
 @override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
@@ -19,6 +20,7 @@ class AuthEmailTests(TestCase):
         }
         response = self.client.post('/api/auth/register/', payload, format='json')
         self.assertEqual(response.status_code, 201)
+        deliver_pending()
         self.assertGreaterEqual(len(mail.outbox), 1)
         self.assertIn('Verify Your Email - Lost and Found Tracker', mail.outbox[-1].subject)
 
@@ -26,6 +28,7 @@ class AuthEmailTests(TestCase):
         user = self.User.objects.create_user(email='resend@example.com', username='resend', password='pass')
         response = self.client.post('/api/auth/resend-verification/', {'user_id': user.id}, format='json')
         self.assertEqual(response.status_code, 200)
+        deliver_pending()
         self.assertGreaterEqual(len(mail.outbox), 1)
         subjects = [m.subject for m in mail.outbox]
         self.assertTrue(any('Verify Your Email - Lost and Found Tracker' in s for s in subjects))
@@ -1,6 +1,7 @@
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from django.core import mail
+from notifications.outbox import deliver_pending
 from rest_framework.test import APIClient
 from .models import VerificationCode
 
@@ -36,4 +37,5 @@ class VerificationCodeTestCase(TestCase):
         response = client.post(url, {'user_id': self.user.id}, format='json')
         self.assertEqual(response.status_code, 200)
         self.assertTrue(VerificationCode.objects.filter(user=self.user).exists())
+        deliver_pending()
         self.assertGreaterEqual(len(mail.outbox), 1)
@@ -1,7 +1,6 @@
 import random
 from django.contrib.auth import login, authenticate
-from django.conf import settings
-from django.core.mail import send_mail
+from django.db import transaction
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 from rest_framework.decorators import api_view, permission_classes
@@ -10,7 +9,9 @@ from rest_framework import status, serializers
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework_simplejwt.tokens import RefreshToken
 from drf_spectacular.utils import extend_schema
+from lost_and_found_tracker.pagination import KeysetPagination
 from .models import User, VerificationCode
+from notifications.outbox import queue_email
 from .Serializers import UserSerializer, LoginSerializer, VerificationSerializer, ResendVerificationSerializer
 
 
@@ -56,7 +57,7 @@ class RegisterRequestSerializer(serializers.Serializer):
 # Utility function
 # ======================
 def send_verification_email(user, verification_code):
-    """Utility to send verification email."""
+    """Utility to queue the verification email for the outbox worker."""
     subject = 'Verify Your Email - Lost and Found Tracker'
     html_message = render_to_string('emails/verification_code.html', {
         'user': user,
@@ -64,14 +65,7 @@ def send_verification_email(user, verification_code):
     })
     plain_message = strip_tags(html_message)
 
-    send_mail(
-        subject,
-        plain_message,
-        settings.DEFAULT_FROM_EMAIL,
-        [user.email],
-        html_message=html_message,
-        fail_silently=False,
-    )
+    queue_email(subject, plain_message, [user.email], html_message=html_message)
 
 
 # ======================
@@ -87,6 +81,7 @@ def send_verification_email(user, verification_code):
 )
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@transaction.atomic
 def register_user(request):
     # Use request serializer for documentation, but persist via UserSerializer
     _ = RegisterRequestSerializer(data=request.data)
@@ -254,9 +249,10 @@ def resend_verification_code(request):
 def users_list(request):
 	if not request.user.is_staff:
 		return Response({'detail': 'Not authorized.'}, status=status.HTTP_403_FORBIDDEN)
-	users = User.objects.all().order_by('-date_joined')
+	paginator = KeysetPagination(ordering=('-date_joined', '-id'))
+	users = paginator.paginate_queryset(User.objects.all(), request)
 	serializer = UserSerializer(users, many=True)
-	return Response(serializer.data)
+	return paginator.get_paginated_response(serializer.data)
 
 
 @extend_schema(
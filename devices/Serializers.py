@@ -1,7 +1,11 @@
 
 from rest_framework import serializers
 from django.core.files.uploadedfile import UploadedFile
+from rest_framework.exceptions import PermissionDenied
 from .models import Device, LostItem, FoundItem, Match, Return, Contact
+from .permissions import STATUS_FORBIDDEN, can_change_status
+from .serials import normalize_serial
+from .status import ALLOWED_TRANSITIONS
 from rest_framework import serializers as rf_serializers
 
 class DeviceSerializer(serializers.ModelSerializer):
@@ -15,10 +19,25 @@ class DeviceSerializer(serializers.ModelSerializer):
 
     def validate_serial_number(self, value):
         user = self.context['request'].user
-        if Device.objects.filter(user=user, serial_number=value).exists():
+        normalized = normalize_serial(value)
+        if normalized and Device.objects.filter(user=user, serial_normalized=normalized).exists():
             raise serializers.ValidationError('You already registered a device with this serial number.')
         return value
 
+class LinkedFoundItemSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = FoundItem
+        fields = ['id', 'name', 'category', 'district', 'province', 'status', 'date_reported']
+        read_only_fields = fields
+
+
+class MyDeviceSerializer(DeviceSerializer):
+    # Found reports linked to the device through the registry cross-check
+    found_reports = LinkedFoundItemSerializer(source='found_items', many=True, read_only=True)
+
+    class Meta(DeviceSerializer.Meta):
+        fields = DeviceSerializer.Meta.fields + ['found_reports']
+
 class LostItemSerializer(serializers.ModelSerializer):
     # Expose exactly the new model fields with frontend keys
     title = serializers.CharField()
@@ -142,6 +161,28 @@ class FoundItemSerializer(serializers.ModelSerializer):
             validated_data['user'] = None
         return super().create(validated_data)
 
+class ItemUpdateMixin:
+    """Writable `status` for the item update views.
+
+    Only the item's owner or an authority user may change it. The view
+    applies it through devices.status rather than save(), so it is popped
+    from validated_data there.
+    """
+
+    def validate_status(self, value):
+        if value != self.instance.status and not can_change_status(self.context['request'], self.instance):
+            raise PermissionDenied(STATUS_FORBIDDEN)
+        return value
+
+
+class LostItemUpdateSerializer(ItemUpdateMixin, LostItemSerializer):
+    status = serializers.ChoiceField(choices=list(ALLOWED_TRANSITIONS[LostItem]), required=False)
+
+
+class FoundItemUpdateSerializer(ItemUpdateMixin, FoundItemSerializer):
+    status = serializers.ChoiceField(choices=list(ALLOWED_TRANSITIONS[FoundItem]), required=False)
+
+
 class MatchSerializer(serializers.ModelSerializer):
     # Accept input for creating matches while keeping response concise
     lost_item = serializers.PrimaryKeyRelatedField(queryset=LostItem.objects.all(), write_only=True, required=False)
@@ -163,36 +204,31 @@ class MatchSerializer(serializers.ModelSerializer):
             'id', 'match_status', 'match_date', 'matched',
             'loster_name', 'loster_phone_number', 'loster_email',
             'founder_name', 'founder_phone_number', 'founder_email',
-            'device_name', 'serial_number',
+            'device_name', 'serial_number', 'score',
             'lost_item', 'found_item'
         ]
         read_only_fields = [
             'id', 'match_date',
             'loster_name', 'loster_phone_number', 'loster_email',
             'founder_name', 'founder_phone_number', 'founder_email',
-            'device_name', 'serial_number'
+            'device_name', 'serial_number', 'score'
         ]
 
     def get_matched(self, obj):
-        lost = obj.lost_item
-        found = obj.found_item
-        loster = {
-            'name': ' '.join([p for p in [getattr(lost, 'first_name', None), getattr(lost, 'last_name', None)] if p]) or None,
-            'phone_number': getattr(lost, 'phone_number', None),
-            'email': getattr(lost, 'loster_email', None),
-        }
-        founder = {
-            'name': ' '.join([p for p in [getattr(found, 'reporter_first_name', None), getattr(found, 'reporter_last_name', None)] if p]) or None,
-            'phone_number': getattr(found, 'phone_number', None),
-            'email': getattr(found, 'founder_email', None) or getattr(found, 'contact_email', None),
-        }
-        device_name = getattr(found, 'name', None) or getattr(lost, 'title', None)
-        serial_number = getattr(found, 'serial_number', None) or getattr(lost, 'serial_number', None)
+        # From the snapshot columns, so list queries never touch the item tables
         return {
-            'loster': loster,
-            'founder': founder,
-            'device_name': device_name,
-            'serial_number': serial_number,
+            'loster': {
+                'name': obj.loster_name,
+                'phone_number': obj.loster_phone_number,
+                'email': obj.loster_email,
+            },
+            'founder': {
+                'name': obj.founder_name,
+                'phone_number': obj.founder_phone_number,
+                'email': obj.founder_email,
+            },
+            'device_name': obj.device_name,
+            'serial_number': obj.serial_number,
         }
 
 class ReturnSerializer(serializers.ModelSerializer):
@@ -235,3 +271,53 @@ class LostByEmailInputSerializer(EmailQuerySerializer):
 
 class FoundByEmailInputSerializer(EmailQuerySerializer):
     founderEmail = rf_serializers.EmailField(required=False)
+
+
+# Bulk reconciliation endpoints
+BULK_MAX_IDS = 500
+# Serials accepted per POST /api/devices/serial-check/
+SERIAL_CHECK_MAX_SERIALS = 1000
+
+
+class BulkIdsSerializer(rf_serializers.Serializer):
+    ids = rf_serializers.ListField(child=rf_serializers.IntegerField(min_value=1), min_length=1, max_length=BULK_MAX_IDS)
+
+    def validate_ids(self, value):
+        return list(dict.fromkeys(value))
+
+
+class BulkClaimSerializer(BulkIdsSerializer):
+    notes = rf_serializers.CharField(required=False, allow_blank=True, allow_null=True)
+
+
+class BulkStatusSerializer(BulkIdsSerializer):
+    status = rf_serializers.CharField(max_length=50)
+
+
+class BulkItemResultSerializer(rf_serializers.Serializer):
+    id = rf_serializers.IntegerField()
+    ok = rf_serializers.BooleanField()
+    detail = rf_serializers.CharField(required=False)
+
+
+class BulkResultSerializer(rf_serializers.Serializer):
+    updated = rf_serializers.IntegerField()
+    results = BulkItemResultSerializer(many=True)
+
+
+class SerialCheckSerializer(rf_serializers.Serializer):
+    serials = rf_serializers.ListField(
+        child=rf_serializers.CharField(max_length=100), min_length=1, max_length=SERIAL_CHECK_MAX_SERIALS,
+    )
+
+
+class SerialStatusSerializer(rf_serializers.Serializer):
+    serial = rf_serializers.CharField()
+    normalized = rf_serializers.CharField(allow_null=True)
+    registered = rf_serializers.BooleanField()
+    lost = rf_serializers.BooleanField()
+    found = rf_serializers.BooleanField()
+
+
+class SerialCheckResultSerializer(rf_serializers.Serializer):
+    results = SerialStatusSerializer(many=True)
@@ -15,8 +15,17 @@ class ReturnAdmin(admin.ModelAdmin):
 class LostItemAdmin(admin.ModelAdmin):
     list_display = ('user', 'serial_number', 'name', 'category', 'created_at', 'updated_at', 'device_image')
 
+class PartnerApiKeyAdmin(admin.ModelAdmin):
+    list_display = ('name', 'prefix', 'is_active', 'created_at')
+    readonly_fields = ('prefix', 'key_hash')
+
+    def has_add_permission(self, request):
+        # Keys are issued by `manage.py create_api_key`, the only place the key is shown
+        return False
+
 admin.site.register(Device, DeviceAdmin)
 admin.site.register(Match, MatchAdmin)
 admin.site.register(Return, ReturnAdmin)
 admin.site.register(LostItem, )
 admin.site.register(FoundItem, )
+admin.site.register(PartnerApiKey, PartnerApiKeyAdmin)
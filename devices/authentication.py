@@ -0,0 +1,54 @@
+from django.contrib.auth.models import AnonymousUser
+from drf_spectacular.extensions import OpenApiAuthenticationExtension
+from rest_framework.authentication import BaseAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import BasePermission
+from rest_framework.throttling import SimpleRateThrottle
+
+from .models import PartnerApiKey
+
+
+class ApiKeyAuthentication(BaseAuthentication):
+    """Partner API keys sent as ``Authorization: Api-Key <key>``.
+
+    Partners are not users: request.user stays anonymous and the key is
+    request.auth.
+    """
+    keyword = 'Api-Key'
+
+    def authenticate(self, request):
+        parts = request.headers.get('Authorization', '').split()
+        if len(parts) != 2 or parts[0] != self.keyword:
+            return None
+        key = PartnerApiKey.objects.filter(key_hash=PartnerApiKey.hash_key(parts[1]), is_active=True).first()
+        if key is None:
+            raise AuthenticationFailed('Invalid API key.')
+        return AnonymousUser(), key
+
+    def authenticate_header(self, request):
+        return self.keyword
+
+
+class HasApiKey(BasePermission):
+    message = 'A partner API key is required.'
+
+    def has_permission(self, request, view):
+        return isinstance(request.auth, PartnerApiKey)
+
+
+class ApiKeyRateThrottle(SimpleRateThrottle):
+    """Per-key request rate, from REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']['partner']."""
+    scope = 'partner'
+
+    def get_cache_key(self, request, view):
+        if not isinstance(request.auth, PartnerApiKey):
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': request.auth.pk}
+
+
+class ApiKeyScheme(OpenApiAuthenticationExtension):
+    target_class = 'devices.authentication.ApiKeyAuthentication'
+    name = 'PartnerApiKey'
+
+    def get_security_definition(self, auto_schema):
+        return {'type': 'apiKey', 'in': 'header', 'name': 'Authorization', 'description': 'Api-Key <key>'}
@@ -0,0 +1,23 @@
+import re
+import unicodedata
+
+_NON_WORD = re.compile(r'[^0-9a-z]+')
+
+
+def normalize_text(value):
+    """Lowercase ASCII words separated by single spaces ("Nyarugenge " -> "nyarugenge")."""
+    if not value:
+        return ''
+    value = unicodedata.normalize('NFKD', str(value)).encode('ascii', 'ignore').decode()
+    return _NON_WORD.sub(' ', value.lower()).strip()
+
+
+def block_key(category, region):
+    """Blocking key for candidate matching: normalized category and region.
+
+    Items only get compared with items sharing this key, so a new report
+    never has to be scored against the whole table. The region is the
+    state/province, the one level of place both kinds of report record;
+    finer places are compared by the score instead.
+    """
+    return f'{normalize_text(category)}|{normalize_text(region)}'
@@ -0,0 +1,334 @@
+"""Bloom filters of normalized serials, to answer "no such serial" without a query.
+
+Each kind (lost, found, device) has its own filter over every stored
+serial of that table. A serial the filter does not contain is certainly
+absent, so exact-serial lookups skip the database; a serial it does
+contain is looked up as usual (about SERIAL_BLOOM_ERROR_RATE of those are
+false positives).
+
+A process builds its filters lazily: from the snapshot written by
+``manage.py rebuild_serial_filter`` (mapped copy-on-write with mmap) when
+SERIAL_BLOOM_SNAPSHOT_DIR has one, otherwise from the database. Saved
+serials are added by devices.receivers, and once their transaction commits
+are also appended to a log in Django's cache under a per-kind generation
+number, so other processes sharing the cache replay them before their
+next lookup. When the log no longer covers a process's generation it
+rebuilds from the database. A lost counter restarts at the current time
+in nanoseconds, a jump too wide to replay, so that means a rebuild too.
+That only works when the cache is shared, so unless SERIAL_BLOOM_ENABLED
+says otherwise the filters are off with a per-process (locmem) cache.
+
+Lookup outcomes are counted per process and flushed to the cache every
+few seconds; see ``stats()``.
+"""
+import hashlib
+import math
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+KINDS = ('lost', 'found', 'device')
+MAGIC = b'SBLOOM01'
+HEADER = struct.Struct('<8sQQQQ')  # magic, bits, hashes, count, generation
+DEFAULT_ERROR_RATE = 0.01
+DEFAULT_MIN_CAPACITY = 100000
+DEFAULT_LOG_TTL = 24 * 60 * 60
+DEFAULT_MAX_REPLAY = 10000
+METRICS_FLUSH_SECONDS = 10
+OUTCOMES = ('negative', 'positive', 'false_positive')
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def enabled():
+    value = _setting('SERIAL_BLOOM_ENABLED', None)
+    if value is None:
+        backend = settings.CACHES['default']['BACKEND']
+        return not backend.endswith(('LocMemCache', 'DummyCache'))
+    return value
+
+
+class BloomFilter:
+    """A fixed-size Bloom filter over strings, backed by any writable buffer."""
+
+    def __init__(self, bits, hashes, buffer=None, count=0):
+        self.bits = bits
+        self.hashes = hashes
+        self.buffer = buffer if buffer is not None else bytearray((bits + 7) // 8)
+        self.count = count
+
+    @classmethod
+    def for_capacity(cls, capacity, error_rate=DEFAULT_ERROR_RATE):
+        capacity = max(capacity, 1)
+        bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        hashes = max(1, round(bits / capacity * math.log(2)))
+        return cls(bits, hashes)
+
+    def _positions(self, value):
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def add(self, value):
+        for pos in self._positions(value):
+            self.buffer[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, value):
+        return all(self.buffer[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(value))
+
+    def capacity(self, error_rate=DEFAULT_ERROR_RATE):
+        """How many values fit before the false-positive rate exceeds error_rate."""
+        return int(-self.bits * math.log(2) ** 2 / math.log(error_rate))
+
+    def expected_error_rate(self):
+        return (1 - math.exp(-self.hashes * self.count / self.bits)) ** self.hashes
+
+
+class SerialFilter:
+    """The Bloom filter of one kind's serials, kept in step with other processes."""
+
+    def __init__(self, kind):
+        self.kind = kind
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._generation = 0
+        self._mmap = None
+        self._counts = Counter()
+        self._flushed_at = time.monotonic()
+
+    @property
+    def _generation_key(self):
+        return f'serial-bloom:{self.kind}:generation'
+
+    def _log_key(self, generation):
+        return f'serial-bloom:{self.kind}:log:{generation}'
+
+    def _shared_generation(self):
+        return cache.get(self._generation_key) or 0
+
+    def _serials(self):
+        from .models import LostItem, FoundItem, Device
+
+        model = {'lost': LostItem, 'found': FoundItem, 'device': Device}[self.kind]
+        return (
+            model.objects.exclude(serial_normalized__isnull=True).exclude(serial_normalized='')
+            .values_list('serial_normalized', flat=True).iterator(chunk_size=5000)
+        )
+
+    def build(self):
+        """A fresh filter from the database, and the generation it includes."""
+        generation = self._shared_generation()
+        serials = list(self._serials())
+        capacity = max(len(serials) * 2, _setting('SERIAL_BLOOM_MIN_CAPACITY', DEFAULT_MIN_CAPACITY))
+        bloom = BloomFilter.for_capacity(capacity, _setting('SERIAL_BLOOM_ERROR_RATE', DEFAULT_ERROR_RATE))
+        for serial in serials:
+            bloom.add(serial)
+        return bloom, generation
+
+    def snapshot_path(self, directory=None):
+        directory = directory or _setting('SERIAL_BLOOM_SNAPSHOT_DIR', None)
+        return os.path.join(directory, f'serials-{self.kind}.bloom') if directory else None
+
+    def write_snapshot(self, directory=None):
+        """Build from the database and write the snapshot atomically; returns the filter."""
+        bloom, generation = self.build()
+        path = self.snapshot_path(directory)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, bloom.bits, bloom.hashes, bloom.count, generation))
+            f.write(bloom.buffer)
+        os.replace(tmp, path)
+        self._install(bloom, generation)
+        return bloom
+
+    def _read_snapshot(self):
+        path = self.snapshot_path()
+        if not path or not os.path.exists(path):
+            return None
+        with open(path, 'rb') as f:
+            # Copy-on-write: adds stay private to this process
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        if len(mapped) < HEADER.size:
+            mapped.close()
+            return None
+        magic, bits, hashes, count, generation = HEADER.unpack_from(mapped)
+        if magic != MAGIC or len(mapped) != HEADER.size + (bits + 7) // 8:
+            mapped.close()
+            return None
+        bloom = BloomFilter(bits, hashes, memoryview(mapped)[HEADER.size:], count)
+        return bloom, generation, mapped
+
+    def _install(self, bloom, generation, mapped=None):
+        with self._lock:
+            self._bloom, self._generation, self._mmap = bloom, generation, mapped
+
+    def rebuild(self):
+        self._install(*self.build())
+
+    def load(self):
+        """Start from the snapshot if there is one, else from the database."""
+        snapshot = self._read_snapshot()
+        if snapshot is None:
+            self._install(*self.build())
+            return
+        self._install(*snapshot)
+
+    def reset(self):
+        self._install(None, 0)
+        self._counts = Counter()
+
+    def _sync(self):
+        """Replay serials other processes added since our generation."""
+        if self._bloom is None:
+            self.load()
+        shared = self._shared_generation()
+        if shared < self._generation:
+            # The cache was cleared; our filter may have missed writes
+            self.rebuild()
+            return
+        if shared == self._generation:
+            return
+        if shared - self._generation > _setting('SERIAL_BLOOM_MAX_REPLAY', DEFAULT_MAX_REPLAY):
+            # Too far behind to replay, or the counter was restarted
+            self.rebuild()
+            return
+        keys = [self._log_key(g) for g in range(self._generation + 1, shared + 1)]
+        logged = cache.get_many(keys)
+        if len(logged) != len(keys):
+            # Entries expired (or the snapshot is older than the log)
+            self.rebuild()
+            return
+        with self._lock:
+            for key in keys:
+                self._bloom.add(logged[key])
+            self._generation = max(self._generation, shared)
+
+    def add(self, serial):
+        """Add a saved serial here at once, and for other processes when the save commits.
+
+        Publishing before the commit would let another process build from
+        the database without the row yet count it as replayed.
+        """
+        if not serial or not enabled():
+            return
+        if self._bloom is not None:
+            # A rollback only leaves a false positive behind
+            with self._lock:
+                self._bloom.add(serial)
+        transaction.on_commit(lambda: self._publish(serial))
+
+    def _publish(self, serial):
+        try:
+            generation = cache.incr(self._generation_key)
+        except ValueError:
+            # A new (or evicted) counter starts past any generation already
+            # handed out, so no process mistakes new entries for ones it replayed
+            cache.add(self._generation_key, time.time_ns(), timeout=None)
+            generation = cache.incr(self._generation_key)
+        cache.set(self._log_key(generation), serial, timeout=_setting('SERIAL_BLOOM_LOG_TTL', DEFAULT_LOG_TTL))
+        if self._bloom is not None:
+            # Picks up our own entry along with anything other processes logged
+            self._sync()
+
+    def _current(self):
+        """The filter, synced with other processes and resized if overfull."""
+        self._sync()
+        if self._bloom.count > self._bloom.capacity(_setting('SERIAL_BLOOM_ERROR_RATE', DEFAULT_ERROR_RATE)):
+            # Overfull; rebuild at a size that keeps the error rate
+            self.rebuild()
+        return self._bloom
+
+    def might_contain(self, serial):
+        """False only when no row of this kind has the serial."""
+        if not serial or not enabled():
+            return True
+        return bool(self.might_contain_many([serial]))
+
+    def might_contain_many(self, serials):
+        """The subset of `serials` that may be stored, syncing once for the whole batch."""
+        if not enabled():
+            return set(serials)
+        bloom = self._current()
+        found = set()
+        for serial in serials:
+            if not serial or serial in bloom:
+                found.add(serial)
+            else:
+                self._count('negative')
+        return found
+
+    def record(self, hit):
+        """Tell the filter whether a lookup it let through found rows."""
+        if enabled():
+            self._count('positive' if hit else 'false_positive')
+
+    def _count(self, outcome):
+        self._counts[outcome] += 1
+        if time.monotonic() - self._flushed_at >= METRICS_FLUSH_SECONDS:
+            self.flush_metrics()
+
+    def flush_metrics(self):
+        counts, self._counts = self._counts, Counter()
+        self._flushed_at = time.monotonic()
+        for outcome, n in counts.items():
+            key = f'serial-bloom:{self.kind}:{outcome}'
+            if not cache.add(key, n, timeout=None):
+                cache.incr(key, n)
+
+    def stats(self):
+        """Lookup outcomes across processes (as last flushed) and this process's filter shape."""
+        self.flush_metrics()
+        counts = {o: cache.get(f'serial-bloom:{self.kind}:{o}') or 0 for o in OUTCOMES}
+        absent = counts['negative'] + counts['false_positive']
+        bloom = self._bloom
+        return {
+            **counts,
+            'false_positive_rate': counts['false_positive'] / absent if absent else 0.0,
+            'expected_false_positive_rate': bloom.expected_error_rate() if bloom else None,
+            'serials': bloom.count if bloom else None,
+            'generation': self._generation,
+        }
+
+
+_filters = {}
+
+
+def get_filter(kind):
+    if kind not in _filters:
+        _filters[kind] = SerialFilter(kind)
+    return _filters[kind]
+
+
+def serial_lookup(kind, queryset, serial):
+    """Rows of `queryset` with this normalized serial; no query when the filter rules it out."""
+    serial_filter = get_filter(kind)
+    if not serial or not serial_filter.might_contain(serial):
+        return []
+    rows = list(queryset.filter(serial_normalized=serial))
+    serial_filter.record(bool(rows))
+    return rows
+
+
+def possible_serials(kind, serials):
+    """The subset of normalized `serials` that may be stored for `kind`."""
+    return get_filter(kind).might_contain_many(serials)
+
+
+def record_hits(kind, looked_up, hits):
+    serial_filter = get_filter(kind)
+    for serial in looked_up:
+        serial_filter.record(serial in hits)
@@ -0,0 +1,105 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.renderers import BaseRenderer
+
+from .models import LostItem, FoundItem, Match, Return
+
+EXPORT_CHUNK_SIZE = 2000
+
+# resource -> (model, exported columns, date column for ranges, status column)
+EXPORTS = {
+    'lost': (
+        LostItem,
+        [
+            'id', 'title', 'category', 'brand', 'serial_number', 'date_found', 'time_found',
+            'additional_info', 'address_type', 'state', 'city_town',
+            'first_name', 'last_name', 'phone_number', 'loster_email',
+            'user_id', 'status', 'date_reported', 'updated_at',
+        ],
+        'date_reported',
+        'status',
+    ),
+    'found': (
+        FoundItem,
+        [
+            'id', 'name', 'category', 'description', 'serial_number',
+            'contact_email', 'founder_email', 'phone_number',
+            'reporter_first_name', 'reporter_last_name',
+            'location', 'address', 'district', 'province',
+            'user_id', 'device_id', 'status', 'date_reported', 'updated_at',
+        ],
+        'date_reported',
+        'status',
+    ),
+    'matches': (
+        Match,
+        [
+            'id', 'lost_item_id', 'found_item_id', 'match_status', 'match_date', 'claimed_at',
+            'loster_name', 'loster_phone_number', 'loster_email',
+            'founder_name', 'founder_phone_number', 'founder_email',
+            'device_name', 'serial_number',
+        ],
+        'match_date',
+        'match_status',
+    ),
+    'returns': (
+        Return,
+        [
+            'id', 'lost_item_id', 'found_item_id', 'owner_id', 'finder_id',
+            'owner_email', 'owner_name', 'finder_email', 'finder_name',
+            'return_date', 'confirmation', 'claimed_at', 'claimed_by_id', 'notes',
+        ],
+        'return_date',
+        None,
+    ),
+}
+
+
+class NDJSONRenderer(BaseRenderer):
+    # Lets DRF accept ?format=ndjson; export rows are streamed by the view itself
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data, cls=DjangoJSONEncoder)
+
+
+class CSVRenderer(NDJSONRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+
+
+class _Echo:
+    """File-like object whose write() hands the formatted line back to csv.writer's caller."""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(resource, status=None, date_from=None, date_to=None):
+    """Iterate export rows as dicts without materializing the queryset."""
+    model, columns, date_field, status_field = EXPORTS[resource]
+    queryset = model.objects.all()
+    if status and status_field:
+        queryset = queryset.filter(**{status_field: status})
+    if date_from:
+        queryset = queryset.filter(**{f'{date_field}__date__gte': date_from})
+    if date_to:
+        queryset = queryset.filter(**{f'{date_field}__date__lte': date_to})
+    return columns, queryset.order_by('id').values(*columns).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def stream_ndjson(rows):
+    encoder = DjangoJSONEncoder()
+    for row in rows:
+        yield encoder.encode(row) + '\n'
+
+
+def stream_csv(columns, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([row[column] for column in columns])
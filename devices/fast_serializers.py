@@ -0,0 +1,237 @@
+"""Read-only serializers for list and search responses, driven by QuerySet.values().
+
+Full ModelSerializers build a model instance and walk dozens of field
+objects per row. These read only the needed columns as dicts and map them
+to the response keys through a table compiled once per serializer. Their
+output is the same JSON as LostItemSerializer, FoundItemSerializer and
+MatchSerializer; devices.tests_fast_serializers compares the two.
+
+Clients may ask for less with ``?fields=id,title`` or a named
+``?view=card``; ``for_request`` then returns a serializer that selects
+only those columns.
+"""
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
+
+from .models import LostItem, FoundItem
+
+
+URL_CACHE_SIZE = 4096
+MAX_CACHED_SUBSETS = 256
+_url_caches = []
+
+_drf_datetime = serializers.DateTimeField().to_representation
+
+
+def _datetime(value):
+    # What DateTimeField does for aware values in ISO 8601: current time
+    # zone and 'Z' for UTC, without its per-call settings lookups
+    if not settings.USE_TZ or api_settings.DATETIME_FORMAT != ISO_8601 or timezone.is_naive(value):
+        return _drf_datetime(value)
+    value = value.astimezone(timezone.get_current_timezone()).isoformat()
+    return value[:-6] + 'Z' if value.endswith('+00:00') else value
+
+
+def _isoformat(value):
+    return value.isoformat()
+
+
+def _file_url(model, field_name):
+    # Building a Cloudinary URL takes ~0.1 ms and depends only on the name,
+    # so hot pages reuse them
+    storage_url = lru_cache(maxsize=URL_CACHE_SIZE)(model._meta.get_field(field_name).storage.url)
+    _url_caches.append(storage_url)
+
+    def url(name):
+        # Empty names are files that were never uploaded
+        return storage_url(name) if name else None
+    return url
+
+
+def clear_url_caches():
+    for storage_url in _url_caches:
+        storage_url.cache_clear()
+
+
+class ValuesSerializer:
+    """Serialize values() rows with a precompiled (key, column, converter) table.
+
+    `fields` lists the response keys in order. A column may span relations
+    (``lost_item__title``); converter None passes the value through, and
+    None values are never converted. When the column is a tuple of
+    columns, the converter is called with the whole row instead.
+
+    `views` names sets of keys a client can ask for with ``?view=``;
+    ``full`` (everything) is always available.
+    """
+
+    def __init__(self, fields, extra_columns=(), views=None):
+        self.spec = list(fields)
+        self.keys = [key for key, _, _ in self.spec]
+        self.extra_columns = list(extra_columns)
+        self.views = {'full': self.keys, **(views or {})}
+        self._subsets = {}
+        self.fields = []
+        columns = []
+        for key, column, convert in fields:
+            if isinstance(column, tuple):
+                columns.extend(column)
+                self.fields.append((key, None, convert))
+            else:
+                columns.append(column)
+                self.fields.append((key, column, convert))
+        # Columns read for other reasons, e.g. keyset pagination cursors
+        columns.extend(extra_columns)
+        self.columns = list(dict.fromkeys(columns))
+
+    def subset(self, keys):
+        """A serializer for just these response keys (which must exist), in this serializer's order."""
+        keys = frozenset(keys)
+        if keys == frozenset(self.keys):
+            return self
+        subset = self._subsets.get(keys)
+        if subset is None:
+            # Rows still carry the id and pagination columns
+            subset = ValuesSerializer([f for f in self.spec if f[0] in keys], ['id', *self.extra_columns])
+            if len(self._subsets) < MAX_CACHED_SUBSETS:
+                self._subsets[keys] = subset
+        return subset
+
+    def for_request(self, request):
+        """The serializer for the request's ``?fields=`` or ``?view=``; all fields by default."""
+        return for_request(request, self)[0]
+
+    def values(self, queryset):
+        return queryset.values(*self.columns)
+
+    def to_representation(self, row):
+        data = {}
+        for key, column, convert in self.fields:
+            if column is None:
+                data[key] = convert(row)
+                continue
+            value = row[column]
+            data[key] = value if value is None or convert is None else convert(value)
+        return data
+
+    def serialize(self, rows):
+        to_representation = self.to_representation
+        return [to_representation(row) for row in rows]
+
+    def serialize_ids(self, queryset, ids):
+        """Rows of `queryset` with these ids, in the order given."""
+        by_id = {row['id']: row for row in self.values(queryset.filter(id__in=ids))}
+        return self.serialize(by_id[pk] for pk in ids if pk in by_id)
+
+
+def for_request(request, *serializers):
+    """Narrow each serializer to the request's ``?fields=`` or ``?view=``.
+
+    With several serializers (responses mixing lost and found items), a
+    field only has to exist in one of them.
+    """
+    fields = request.query_params.get('fields')
+    if fields:
+        keys = {f.strip() for f in fields.split(',') if f.strip()}
+        unknown = keys.difference(*(s.keys for s in serializers))
+        if unknown:
+            raise ValidationError({'fields': [f'Unknown fields: {", ".join(sorted(unknown))}']})
+        return [s.subset(keys.intersection(s.keys)) for s in serializers]
+    view = request.query_params.get('view')
+    if view:
+        views = [name for name in serializers[0].views if all(name in s.views for s in serializers)]
+        if view not in views:
+            raise ValidationError({'view': [f'Choose one of: {", ".join(views)}']})
+        return [s.subset(s.views[view]) for s in serializers]
+    return list(serializers)
+
+
+def _matched(row):
+    # MatchSerializer.get_matched, from the same snapshot columns
+    return {
+        'loster': {
+            'name': row['loster_name'],
+            'phone_number': row['loster_phone_number'],
+            'email': row['loster_email'],
+        },
+        'founder': {
+            'name': row['founder_name'],
+            'phone_number': row['founder_phone_number'],
+            'email': row['founder_email'],
+        },
+        'device_name': row['device_name'],
+        'serial_number': row['serial_number'],
+    }
+
+
+lost_items = ValuesSerializer([
+    ('id', 'id', None),
+    ('title', 'title', None),
+    ('dateFound', 'date_found', _isoformat),
+    ('category', 'category', None),
+    ('timeFound', 'time_found', _isoformat),
+    ('brand', 'brand', None),
+    ('image', 'image', _file_url(LostItem, 'image')),
+    ('recepiet', 'recepiet', _file_url(LostItem, 'recepiet')),
+    ('additionalInfo', 'additional_info', None),
+    ('addressType', 'address_type', None),
+    ('state', 'state', None),
+    ('cityTown', 'city_town', None),
+    ('serialNumber', 'serial_number', None),
+    ('firstName', 'first_name', None),
+    ('lastName', 'last_name', None),
+    ('phoneNumber', 'phone_number', None),
+    ('losterEmail', 'loster_email', None),
+    ('date_reported', 'date_reported', _datetime),
+    ('user', 'user_id', None),
+    ('status', 'status', None),
+    ('created_at', 'created_at', _datetime),
+    ('updated_at', 'updated_at', _datetime),
+], extra_columns=['date_reported'], views={
+    'card': ['id', 'title', 'category', 'brand', 'image', 'cityTown', 'status', 'date_reported'],
+})
+
+# FoundItemSerializer.to_representation drops the bookkeeping fields
+found_items = ValuesSerializer([
+    ('id', 'id', None),
+    ('name', 'name', None),
+    ('category', 'category', None),
+    ('description', 'description', None),
+    ('serialnumber', 'serial_number', None),
+    ('founderEmail', 'founder_email', None),
+    ('location', 'location', None),
+    ('phoneNumber', 'phone_number', None),
+    ('firstName', 'reporter_first_name', None),
+    ('address', 'address', None),
+    ('province', 'province', None),
+    ('district', 'district', None),
+    ('lastName', 'reporter_last_name', None),
+    ('deviceimage', 'device_image', _file_url(FoundItem, 'device_image')),
+], extra_columns=['date_reported'], views={
+    'card': ['id', 'name', 'category', 'province', 'district', 'deviceimage'],
+})
+
+matches = ValuesSerializer([
+    ('id', 'id', None),
+    ('match_status', 'match_status', None),
+    ('match_date', 'match_date', _datetime),
+    ('matched', (
+        'loster_name', 'loster_phone_number', 'loster_email',
+        'founder_name', 'founder_phone_number', 'founder_email',
+        'device_name', 'serial_number',
+    ), _matched),
+    *[
+        (key, key, None) for key in (
+            'loster_name', 'loster_phone_number', 'loster_email',
+            'founder_name', 'founder_phone_number', 'founder_email',
+            'device_name', 'serial_number', 'score',
+        )
+    ],
+], extra_columns=['match_date'], views={
+    'card': ['id', 'match_status', 'match_date', 'device_name', 'serial_number', 'score'],
+})
@@ -0,0 +1,219 @@
+"""Scored matching for reports that cannot be paired by serial number.
+
+Candidates come from the ``(match_block, date_reported)`` index: same
+category and region (see devices.blocking) and reported within
+FUZZY_MATCH_WINDOW_DAYS, newest first, at most FUZZY_MATCH_CANDIDATE_LIMIT
+rows. Only those are scored, so the cost of matching one report does not
+grow with the table. Scores are in [0, 1]:
+
+* text   0.45  word overlap of title/name, brand and descriptions
+* brand  0.25  normalized brand equality (0.5 when either side is blank)
+* date   0.20  how close the two dates are inside the window
+* place  0.10  city/town against district (0.5 when either side is blank)
+
+Photos within IMAGE_MATCH_MAX_DISTANCE bits of the report's photo (see
+devices.imagehash) are added as candidates wherever they were reported,
+and score at least 0.9 (identical hash) down to 0.5 (at the limit).
+"""
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from .blocking import normalize_text
+from .imagehash import get_index, max_distance
+from .matching import SERIAL_MATCH_SCORE, create_matches
+from .models import LostItem, FoundItem
+
+WEIGHTS = {'text': 0.45, 'brand': 0.25, 'date': 0.20, 'place': 0.10}
+
+DEFAULT_WINDOW_DAYS = 30
+DEFAULT_CANDIDATE_LIMIT = 200
+DEFAULT_MIN_SCORE = 0.5
+DEFAULT_MAX_MATCHES = 5
+# Kept below SERIAL_MATCH_SCORE, which marks matches made by serial number
+MAX_SCORE = round(SERIAL_MATCH_SCORE - 0.01, 3)
+
+# Words too common in reports to say anything about the item
+STOP_WORDS = {'a', 'an', 'and', 'the', 'with', 'of', 'in', 'on', 'my', 'for', 'is', 'it', 'at', 'to'}
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _words(*values):
+    return {w for v in values for w in normalize_text(v).split() if len(w) > 1 and w not in STOP_WORDS}
+
+
+def _day(value):
+    if isinstance(value, datetime):
+        if timezone.is_aware(value):
+            value = timezone.localtime(value)
+        return value.date()
+    return value
+
+
+def lost_profile(item):
+    return {
+        'words': _words(item.title, item.brand, item.additional_info),
+        'brand': normalize_text(item.brand),
+        'place': normalize_text(item.city_town),
+        'day': _day(item.date_found or item.date_reported),
+    }
+
+
+def found_profile(item):
+    return {
+        'words': _words(item.name, item.description),
+        # Found reports have no brand field; it usually appears in the name
+        'brand': '',
+        'place': normalize_text(item.district),
+        'day': _day(item.date_reported),
+    }
+
+
+def _equal_or_unknown(a, b):
+    if not a or not b:
+        return 0.5
+    return 1.0 if a == b else 0.0
+
+
+def score(lost, found, window_days=None):
+    """Similarity of a lost and a found profile (see lost_profile/found_profile)."""
+    window_days = window_days or _setting('FUZZY_MATCH_WINDOW_DAYS', DEFAULT_WINDOW_DAYS)
+    words = lost['words'] | found['words']
+    text = len(lost['words'] & found['words']) / len(words) if words else 0.0
+    if lost['brand'] and not found['brand']:
+        brand = 1.0 if lost['brand'] in found['words'] else 0.5
+    else:
+        brand = _equal_or_unknown(lost['brand'], found['brand'])
+    if lost['day'] and found['day']:
+        days = abs((found['day'] - lost['day']).days)
+        date = max(0.0, 1.0 - days / window_days)
+    else:
+        date = 0.5
+    place = _equal_or_unknown(lost['place'], found['place'])
+    total = (
+        WEIGHTS['text'] * text + WEIGHTS['brand'] * brand
+        + WEIGHTS['date'] * date + WEIGHTS['place'] * place
+    )
+    return round(total, 3)
+
+
+def _open_reports(model, item):
+    open_status = 'lost' if model is LostItem else 'found'
+    queryset = model.objects.filter(status=open_status)
+    if item.serial_normalized:
+        # A different recorded serial rules the pair out
+        queryset = queryset.filter(Q(serial_normalized__isnull=True) | Q(serial_normalized=item.serial_normalized))
+    return queryset
+
+
+def candidates(model, item, day, cache=None):
+    """Open reports of `model` in the item's block and date window.
+
+    Batch callers can pass a dict as `cache` to share the lookup between
+    reports with the same block, day and serial.
+    """
+    key = (model, item.match_block, day, item.serial_normalized)
+    if cache is not None and key in cache:
+        return list(cache[key])
+    window = timedelta(days=_setting('FUZZY_MATCH_WINDOW_DAYS', DEFAULT_WINDOW_DAYS))
+    start = timezone.make_aware(datetime.combine(day - window, time.min))
+    end = timezone.make_aware(datetime.combine(day + window, time.max))
+    queryset = _open_reports(model, item).filter(match_block=item.match_block, date_reported__range=(start, end))
+    limit = _setting('FUZZY_MATCH_CANDIDATE_LIMIT', DEFAULT_CANDIDATE_LIMIT)
+    items = list(queryset.order_by('-date_reported')[:limit])
+    if cache is not None:
+        cache[key] = items
+    return list(items)
+
+
+def image_score(distance):
+    """Score for a photo `distance` bits away; None when there is no similar photo."""
+    if distance is None:
+        return None
+    return round(0.9 - 0.4 * distance / max(max_distance(), 1), 3)
+
+
+def _candidates_and_photos(model, kind, item, day, cache=None):
+    """Block candidates plus reports with a similar photo; returns (items, {id: distance})."""
+    items = candidates(model, item, day, cache)
+    distances = {pk: d for d, pk in get_index(kind).search(item.image_hash)}
+    missing = set(distances) - {candidate.id for candidate in items}
+    if missing:
+        items += list(_open_reports(model, item).filter(id__in=missing))
+    return items, distances
+
+
+def _best(scored):
+    min_score = _setting('FUZZY_MATCH_MIN_SCORE', DEFAULT_MIN_SCORE)
+    ranked = sorted((s for s in scored if s[-1] >= min_score), key=lambda s: -s[-1])
+    return ranked[:_setting('FUZZY_MATCH_MAX_MATCHES', DEFAULT_MAX_MATCHES)]
+
+
+def _combined(profile_score, distance):
+    photo = image_score(distance)
+    combined = profile_score if photo is None else max(profile_score, photo)
+    return min(combined, MAX_SCORE)
+
+
+def _profile(build, item, cache):
+    if cache is None:
+        return build(item)
+    key = (build, item.pk)
+    if key not in cache:
+        cache[key] = build(item)
+    return cache[key]
+
+
+def rank_lost_item(lost_item, cache=None):
+    """Best (found_item, score) candidates for a lost report, without writing anything."""
+    if not lost_item.match_block:
+        return []
+    profile = lost_profile(lost_item)
+    found_items, distances = _candidates_and_photos(FoundItem, 'found', lost_item, profile['day'], cache)
+    return _best([
+        (found_item, _combined(score(profile, _profile(found_profile, found_item, cache)), distances.get(found_item.id)))
+        for found_item in found_items
+    ])
+
+
+def rank_found_item(found_item, cache=None):
+    """Best (lost_item, score) candidates for a found report, without writing anything."""
+    if not found_item.match_block:
+        return []
+    profile = found_profile(found_item)
+    lost_items, distances = _candidates_and_photos(LostItem, 'lost', found_item, profile['day'], cache)
+    return _best([
+        (lost_item, _combined(score(_profile(lost_profile, lost_item, cache), profile), distances.get(lost_item.id)))
+        for lost_item in lost_items
+    ])
+
+
+def fuzzy_match_lost_item(lost_item):
+    """Score open found reports against a lost report and write the best as matches.
+
+    Returns (found_item, score) pairs, best first.
+    """
+    best = rank_lost_item(lost_item)
+    create_matches(
+        [(lost_item, found_item) for found_item, _ in best],
+        scores={(lost_item.id, found_item.id): s for found_item, s in best},
+    )
+    return best
+
+
+def fuzzy_match_found_item(found_item):
+    """Score open lost reports against a found report and write the best as matches.
+
+    Returns (lost_item, score) pairs, best first.
+    """
+    best = rank_found_item(found_item)
+    create_matches(
+        [(lost_item, found_item) for lost_item, _ in best],
+        scores={(lost_item.id, found_item.id): s for lost_item, s in best},
+    )
+    return best
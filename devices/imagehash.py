@@ -0,0 +1,205 @@
+"""Perceptual hashes of item photos and an in-process index to query them.
+
+Each uploaded photo gets a 64-bit difference hash (dHash), stored as 16
+hex digits in ``image_hash``. Near-identical photos (re-encoded, resized,
+slightly cropped or recoloured) end up a few bits apart, so "same photo"
+becomes "Hamming distance <= IMAGE_MATCH_MAX_DISTANCE".
+
+Open items' hashes are kept in a multi-index hash table per kind. It is
+loaded from the database on first use, updated by devices.receivers on
+save/delete, and reloaded after IMAGE_INDEX_MAX_AGE seconds so writes from
+other processes show up.
+"""
+import threading
+import time
+import urllib.request
+from io import BytesIO
+from itertools import combinations
+
+from django.conf import settings
+from PIL import Image, UnidentifiedImageError
+
+HASH_SIZE = 8
+DEFAULT_MAX_DISTANCE = 7
+DEFAULT_MAX_AGE = 300
+
+
+def dhash(source, size=HASH_SIZE):
+    """dHash of an image (path, file object or PIL image) as a 16 digit hex string.
+
+    The image is shrunk to (size + 1) x size greyscale pixels and each bit
+    records whether a pixel is brighter than its right-hand neighbour.
+    """
+    image = source if isinstance(source, Image.Image) else Image.open(source)
+    pixels = list(image.convert('L').resize((size + 1, size), Image.LANCZOS).getdata())
+    value = 0
+    for row in range(size):
+        for col in range(size):
+            left = pixels[row * (size + 1) + col]
+            right = pixels[row * (size + 1) + col + 1]
+            value = (value << 1) | (left > right)
+    return f'{value:0{size * size // 4}x}'
+
+
+def hash_file(field_file):
+    """dHash of an uploaded ImageField file, or None if it is not a readable image."""
+    try:
+        field_file.seek(0)
+        value = dhash(field_file)
+    except (UnidentifiedImageError, OSError, ValueError):
+        return None
+    finally:
+        try:
+            field_file.seek(0)
+        except (OSError, ValueError):
+            pass
+    return value
+
+
+def hash_source(source):
+    """Hash a stored photo by URL or local path. Runs in worker processes, so no ORM use."""
+    pk, location = source
+    try:
+        if location.startswith(('http://', 'https://')):
+            with urllib.request.urlopen(location, timeout=30) as response:
+                data = BytesIO(response.read())
+            return pk, dhash(data)
+        return pk, dhash(location)
+    except Exception:
+        return pk, None
+
+
+def hamming(a, b):
+    return bin(int(a, 16) ^ int(b, 16)).count('1')
+
+
+def max_distance():
+    return getattr(settings, 'IMAGE_MATCH_MAX_DISTANCE', DEFAULT_MAX_DISTANCE)
+
+
+class MultiIndexHashTable:
+    """Hamming-radius search over 64-bit hashes (multi-index hashing).
+
+    Each hash is split into `chunks` slices, each with its own table. If two
+    hashes are within r bits, by pigeonhole at least one slice is within
+    r // chunks bits, so a search only probes slice values that close to
+    the query's and checks the full distance of what it finds there.
+    """
+
+    def __init__(self, chunks=4, bits=HASH_SIZE * HASH_SIZE):
+        self.chunks = chunks
+        self.width = bits // chunks
+        self.mask = (1 << self.width) - 1
+        self.tables = [{} for _ in range(chunks)]
+        self.values = {}
+        self._masks = {}
+
+    def __len__(self):
+        return len(self.values)
+
+    def _slices(self, value):
+        return [(value >> (i * self.width)) & self.mask for i in range(self.chunks)]
+
+    def _flip_masks(self, bits):
+        # Every mask of at most `bits` set bits within one slice
+        if bits not in self._masks:
+            masks = [0]
+            for count in range(1, bits + 1):
+                masks.extend(sum(1 << b for b in combo) for combo in combinations(range(self.width), count))
+            self._masks[bits] = masks
+        return self._masks[bits]
+
+    def add(self, value, key):
+        self.discard(key)
+        self.values[key] = value
+        for table, part in zip(self.tables, self._slices(value)):
+            table.setdefault(part, set()).add(key)
+
+    def discard(self, key):
+        value = self.values.pop(key, None)
+        if value is None:
+            return
+        for table, part in zip(self.tables, self._slices(value)):
+            bucket = table.get(part)
+            bucket.discard(key)
+            if not bucket:
+                del table[part]
+
+    def search(self, value, radius):
+        """(distance, key) pairs for every stored value within `radius` bits."""
+        masks = self._flip_masks(radius // self.chunks)
+        seen = set()
+        results = []
+        for table, part in zip(self.tables, self._slices(value)):
+            for mask in masks:
+                for key in table.get(part ^ mask, ()):
+                    if key not in seen:
+                        seen.add(key)
+                        distance = bin(self.values[key] ^ value).count('1')
+                        if distance <= radius:
+                            results.append((distance, key))
+        return results
+
+
+class ImageHashIndex:
+    """Hashes of one item kind's open reports, searchable by Hamming distance."""
+
+    def __init__(self, model, open_status):
+        self.model = model
+        self.open_status = open_status
+        self._lock = threading.Lock()
+        self._loaded_at = None
+        self._table = MultiIndexHashTable()
+
+    def _stale(self):
+        max_age = getattr(settings, 'IMAGE_INDEX_MAX_AGE', DEFAULT_MAX_AGE)
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > max_age
+
+    def load(self):
+        rows = self.model.objects.filter(status=self.open_status, image_hash__isnull=False).values_list('id', 'image_hash')
+        table = MultiIndexHashTable()
+        for pk, value in rows:
+            table.add(int(value, 16), pk)
+        with self._lock:
+            self._table = table
+            self._loaded_at = time.monotonic()
+
+    def reset(self):
+        with self._lock:
+            self._table = MultiIndexHashTable()
+            self._loaded_at = None
+
+    def update(self, instance):
+        """Track an item after it was saved: add, move or drop its hash."""
+        if self._loaded_at is None:
+            return
+        with self._lock:
+            if instance.image_hash and instance.status == self.open_status:
+                self._table.add(int(instance.image_hash, 16), instance.pk)
+            else:
+                self._table.discard(instance.pk)
+
+    def remove(self, pk):
+        with self._lock:
+            self._table.discard(pk)
+
+    def search(self, value, radius=None):
+        """Ids of open items whose photo is within `radius` bits, as (distance, id), closest first."""
+        if not value:
+            return []
+        if self._stale():
+            self.load()
+        radius = max_distance() if radius is None else radius
+        with self._lock:
+            return sorted(self._table.search(int(value, 16), radius))
+
+
+_indexes = {}
+
+
+def get_index(kind):
+    if kind not in _indexes:
+        from .models import LostItem, FoundItem
+        model, open_status = {'lost': (LostItem, 'lost'), 'found': (FoundItem, 'found')}[kind]
+        _indexes[kind] = ImageHashIndex(model, open_status)
+    return _indexes[kind]
@@ -0,0 +1,82 @@
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from devices.blocking import block_key
+from devices.fuzzy import fuzzy_match_lost_item
+from devices.models import CATEGORY_CHOICES, LostItem, FoundItem
+
+REGIONS = [f'Region {n}' for n in range(30)]
+BRANDS = ['Apple', 'Samsung', 'Tecno', 'Infinix', 'Sony', 'JBL', 'HP', 'Lenovo']
+COLORS = ['black', 'white', 'blue', 'red', 'silver', 'gold']
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Measure fuzzy matching cost per report against growing synthetic tables (rolled back afterwards).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000], help='Found reports per run.')
+        parser.add_argument('--probes', type=int, default=50, help='Lost reports matched per run.')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'found rows':>10} {'ms/report':>10} {'queries/report':>15} {'matches':>8}")
+        for size in options['sizes']:
+            rng = random.Random(options['seed'])
+            try:
+                with transaction.atomic():
+                    self.stdout.write(self._run(rng, size, options['probes']))
+                    raise _Rollback
+            except _Rollback:
+                pass
+
+    def _item(self, rng):
+        category = rng.choice(CATEGORY_CHOICES)[0]
+        return category, rng.choice(REGIONS), rng.choice(BRANDS), rng.choice(COLORS)
+
+    def _run(self, rng, size, probes):
+        now = timezone.now()
+        found = []
+        for _ in range(size):
+            category, region, brand, color = self._item(rng)
+            found.append(FoundItem(
+                name=f'{brand} {category}', description=f'{color} {category.lower()}', category=category,
+                province=region, match_block=block_key(category, region),
+            ))
+        FoundItem.objects.bulk_create(found, batch_size=2000)
+        # date_reported is auto_now_add; spread the rows over a year
+        for start in range(0, len(found), 2000):
+            chunk = found[start:start + 2000]
+            for item in chunk:
+                item.date_reported = now - timedelta(days=rng.randrange(365))
+            FoundItem.objects.bulk_update(chunk, ['date_reported'])
+
+        lost = []
+        for _ in range(probes):
+            category, region, brand, color = self._item(rng)
+            lost.append(LostItem(
+                title=f'{brand} {category}', brand=brand, additional_info=f'{color} case', category=category,
+                state=region, match_block=block_key(category, region),
+            ))
+        LostItem.objects.bulk_create(lost)
+        lost = list(LostItem.objects.filter(id__in=[item.id for item in lost]))
+
+        matches = 0
+        started = time.perf_counter()
+        with CaptureQueriesContext(connection) as queries:
+            for item in lost:
+                matches += len(fuzzy_match_lost_item(item))
+        elapsed = time.perf_counter() - started
+        return (
+            f'{size:>10} {elapsed * 1000 / probes:>10.2f} '
+            f'{len(queries) / probes:>15.1f} {matches:>8}'
+        )
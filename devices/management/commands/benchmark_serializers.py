@@ -0,0 +1,72 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from devices import fast_serializers as fast
+from devices.Serializers import LostItemSerializer, FoundItemSerializer, MatchSerializer
+from devices.models import LostItem, FoundItem, Match
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Compare list serialization throughput of the ModelSerializers and devices.fast_serializers (rolled back afterwards).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000, help='Rows of each kind to serialize.')
+        parser.add_argument('--repeat', type=int, default=3, help='Best of this many runs.')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._seed(options['rows'])
+                self.stdout.write(f"{'list':>8} {'rows':>8} {'model rows/s':>14} {'values rows/s':>14} {'speedup':>8}")
+                for name, queryset, model_serializer, serializer in (
+                    ('lost', LostItem.objects.order_by('-id'), LostItemSerializer, fast.lost_items),
+                    ('found', FoundItem.objects.order_by('-id'), FoundItemSerializer, fast.found_items),
+                    ('matches', Match.objects.select_related('lost_item', 'found_item').order_by('-id'), MatchSerializer, fast.matches),
+                ):
+                    slow = self._best(options['repeat'], lambda: model_serializer(list(queryset), many=True).data)
+                    quick = self._best(options['repeat'], lambda: self._cold(serializer, queryset))
+                    rows = queryset.count()
+                    self.stdout.write(
+                        f'{name:>8} {rows:>8} {rows / slow:>14.0f} {rows / quick:>14.0f} {slow / quick:>7.1f}x'
+                    )
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _cold(self, serializer, queryset):
+        # Without the URL memo, which would flatter repeated runs
+        fast.clear_url_caches()
+        return serializer.serialize(serializer.values(queryset))
+
+    def _best(self, repeat, run):
+        times = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - started)
+        return min(times)
+
+    def _seed(self, rows):
+        lost = LostItem.objects.bulk_create([
+            LostItem(
+                title=f'Phone {n}', category='Phone', brand='Tecno', serial_number=f'SN{n}', first_name='Ann',
+                last_name='Lee', loster_email=f'owner{n}@example.com', image=f'lost_item_images/{n}.jpg',
+            )
+            for n in range(rows)
+        ], batch_size=2000)
+        found = FoundItem.objects.bulk_create([
+            FoundItem(
+                name=f'Phone {n}', category='Phone', serial_number=f'SN{n}', reporter_first_name='Bob',
+                district='Gasabo', province='Kigali', device_image=f'device_images/{n}.jpg',
+            )
+            for n in range(rows)
+        ], batch_size=2000)
+        Match.objects.bulk_create([
+            Match(lost_item=l, found_item=f, score=1.0, serial_number=l.serial_number) for l, f in zip(lost, found)
+        ], batch_size=2000)
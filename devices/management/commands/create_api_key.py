@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from devices.models import PartnerApiKey
+
+
+class Command(BaseCommand):
+    help = 'Create a partner API key for the batch serial check. The key is only shown once.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', help='Partner the key is issued to.')
+
+    def handle(self, *args, **options):
+        api_key, key = PartnerApiKey.generate(options['name'])
+        self.stdout.write(f'Created key {api_key.prefix}... for {api_key.name}:')
+        self.stdout.write(key)
@@ -0,0 +1,63 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+from devices.imagehash import get_index, hash_source
+from devices.models import LostItem, FoundItem
+
+KINDS = {'lost': LostItem, 'found': FoundItem}
+
+
+def _location(field_file):
+    # Remote storages (Cloudinary) expose a URL, FileSystemStorage a local path
+    try:
+        return field_file.path
+    except NotImplementedError:
+        return field_file.url
+
+
+class Command(BaseCommand):
+    help = 'Compute perceptual hashes for item photos that do not have one yet.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kinds', nargs='*', help=f"Item kinds to hash (default: {', '.join(KINDS)}).")
+        parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count).')
+        parser.add_argument('--chunk-size', type=int, default=200, help='Photos fetched and written per batch.')
+        parser.add_argument('--rehash', action='store_true', help='Recompute hashes that are already set.')
+
+    def handle(self, *args, **options):
+        kinds = options['kinds'] or list(KINDS)
+        unknown = set(kinds) - set(KINDS)
+        if unknown:
+            raise CommandError(f"Unknown kinds: {', '.join(sorted(unknown))}")
+
+        # Workers only download and hash; spawned rather than forked so they
+        # never inherit this process's database connection
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=options['workers'], mp_context=context) as pool:
+            for kind in kinds:
+                hashed, failed = self._hash_kind(pool, KINDS[kind], options['chunk_size'], options['rehash'])
+                get_index(kind).reset()
+                self.stdout.write(self.style.SUCCESS(f'{kind}: {hashed} photos hashed, {failed} unreadable.'))
+
+    def _hash_kind(self, pool, model, chunk_size, rehash):
+        field = model.hashed_image_field
+        queryset = model.objects.exclude(**{field: ''}).exclude(**{f'{field}__isnull': True})
+        if not rehash:
+            queryset = queryset.filter(image_hash__isnull=True)
+        hashed = failed = 0
+        last_id = 0
+        while True:
+            chunk = list(queryset.filter(id__gt=last_id).order_by('id').only('id', field)[:chunk_size])
+            if not chunk:
+                return hashed, failed
+            last_id = chunk[-1].id
+            sources = [(item.id, _location(getattr(item, field))) for item in chunk]
+            hashes = dict(pool.map(hash_source, sources))
+            for item in chunk:
+                item.image_hash = hashes.get(item.id)
+            done = [item for item in chunk if item.image_hash]
+            model.objects.bulk_update(done, ['image_hash'])
+            hashed += len(done)
+            failed += len(chunk) - len(done)
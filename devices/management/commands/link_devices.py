@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from devices.models import FoundItem
+from devices.registry import link_found_items
+
+
+class Command(BaseCommand):
+    help = 'Link existing found reports to registered devices with the same serial number.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Found reports read and linked per batch.')
+        parser.add_argument('--notify', action='store_true', help='Also send device owners an in-app notification.')
+
+    def handle(self, *args, **options):
+        queryset = FoundItem.objects.filter(device__isnull=True, serial_normalized__isnull=False).only(
+            'id', 'serial_normalized', 'device_id', 'district', 'province',
+        )
+        linked = scanned = 0
+        last_id = 0
+        while True:
+            chunk = list(queryset.filter(id__gt=last_id).order_by('id')[:options['chunk_size']])
+            if not chunk:
+                break
+            last_id = chunk[-1].id
+            scanned += len(chunk)
+            linked += len(link_found_items(chunk, notify=options['notify']))
+        self.stdout.write(self.style.SUCCESS(f'{linked} of {scanned} found reports linked to a device.'))
@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from devices.bloom import KINDS, get_filter
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the serial Bloom filter snapshots that worker processes load at startup, '
+        'or show the filters\' false-positive metrics with --stats.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('kinds', nargs='*', help=f"Filters to rebuild (default: {', '.join(KINDS)}).")
+        parser.add_argument('--dir', help='Snapshot directory (default: SERIAL_BLOOM_SNAPSHOT_DIR).')
+        parser.add_argument('--stats', action='store_true', help='Only print lookup metrics.')
+
+    def handle(self, *args, **options):
+        kinds = options['kinds'] or list(KINDS)
+        unknown = set(kinds) - set(KINDS)
+        if unknown:
+            raise CommandError(f"Unknown kinds: {', '.join(sorted(unknown))}")
+
+        if options['stats']:
+            for kind in kinds:
+                stats = get_filter(kind).stats()
+                self.stdout.write(
+                    f"{kind}: {stats['negative']} skipped, {stats['positive']} hits, "
+                    f"{stats['false_positive']} false positives "
+                    f"(rate {stats['false_positive_rate']:.4f})"
+                )
+            return
+
+        directory = options['dir'] or getattr(settings, 'SERIAL_BLOOM_SNAPSHOT_DIR', None)
+        if not directory:
+            raise CommandError('Set SERIAL_BLOOM_SNAPSHOT_DIR or pass --dir.')
+        for kind in kinds:
+            bloom = get_filter(kind).write_snapshot(directory)
+            self.stdout.write(self.style.SUCCESS(
+                f'{kind}: {bloom.count} serials, {bloom.bits // 8} bytes, '
+                f'expected false-positive rate {bloom.expected_error_rate():.4f}.'
+            ))
@@ -0,0 +1,118 @@
+import json
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+
+from devices.matching import save_matches
+from devices.rematch import build_matches, init_worker, unmatched_ids, work
+
+KINDS = ('lost', 'found')
+PROGRESS_SECONDS = 10
+
+
+def _chunks(kind, ids, size):
+    ids = iter(ids)
+    while True:
+        chunk = list(islice(ids, size))
+        if not chunk:
+            return
+        yield kind, chunk
+
+
+class Command(BaseCommand):
+    help = 'Re-run serial and fuzzy matching over existing open reports, resumably.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kinds', nargs='*', help=f"Report kinds to rematch (default: {', '.join(KINDS)}).")
+        parser.add_argument('--chunk-size', type=int, default=500, help='Reports per work unit.')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='Worker processes; 0 runs everything in this process.')
+        parser.add_argument('--checkpoint', default='rematch.checkpoint.json',
+                            help='File recording the last finished id per kind.')
+        parser.add_argument('--restart', action='store_true', help='Ignore an existing checkpoint.')
+        parser.add_argument('--all', action='store_true', dest='include_matched',
+                            help='Also reconsider reports that already have matches.')
+
+    def handle(self, *args, **options):
+        kinds = options['kinds'] or list(KINDS)
+        unknown = set(kinds) - set(KINDS)
+        if unknown:
+            raise CommandError(f"Unknown kinds: {', '.join(sorted(unknown))}")
+        self.checkpoint_path = options['checkpoint']
+        checkpoint = {} if options['restart'] else self._load_checkpoint()
+
+        pool = None
+        if options['workers'] > 0:
+            # Spawned so workers open their own database connections
+            pool = ProcessPoolExecutor(
+                max_workers=options['workers'],
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=init_worker,
+            )
+        try:
+            for kind in kinds:
+                ids = unmatched_ids(kind, checkpoint.get(kind, 0), options['include_matched'])
+                tasks = _chunks(kind, ids.iterator(chunk_size=options['chunk_size']), options['chunk_size'])
+                self._run(kind, tasks, pool, options['workers'], checkpoint)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        # Finished kinds start from the beginning next time
+        for kind in kinds:
+            checkpoint.pop(kind, None)
+        if checkpoint:
+            self._save_checkpoint(checkpoint)
+        elif os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+
+    def _results(self, tasks, pool, workers):
+        if pool is None:
+            yield from map(work, tasks)
+            return
+        # Keep a bounded number of chunks in flight and yield them in id order,
+        # so the checkpoint never skips past unfinished work
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.submit(work, task))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+    def _run(self, kind, tasks, pool, workers, checkpoint):
+        started = self.last_report = time.perf_counter()
+        rows = matches = 0
+        for last_id, count, candidates in self._results(tasks, pool, workers):
+            matches += len(save_matches(build_matches(candidates)))
+            rows += count
+            checkpoint[kind] = last_id
+            self._save_checkpoint(checkpoint)
+            if time.perf_counter() - self.last_report >= PROGRESS_SECONDS:
+                self._report(kind, rows, matches, started)
+        self._report(kind, rows, matches, started, final=True)
+
+    def _report(self, kind, rows, matches, started, final=False):
+        self.last_report = time.perf_counter()
+        elapsed = max(self.last_report - started, 1e-9)
+        line = f'{kind}: {rows} reports, {matches} matches in {elapsed:.1f}s ({rows / elapsed:.0f} rows/s, {matches / elapsed:.1f} matches/s)'
+        self.stdout.write(self.style.SUCCESS(line) if final else line)
+
+    def _load_checkpoint(self):
+        try:
+            with open(self.checkpoint_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            raise CommandError(f'Unreadable checkpoint {self.checkpoint_path}; use --restart to start over.')
+
+    def _save_checkpoint(self, checkpoint):
+        tmp = f'{self.checkpoint_path}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp, self.checkpoint_path)
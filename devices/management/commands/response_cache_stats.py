@@ -0,0 +1,25 @@
+from importlib import import_module
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from devices import response_cache
+
+
+class Command(BaseCommand):
+    help = 'Show hit/miss counts of the cached API views, or reset them with --reset.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Zero the counters.')
+
+    def handle(self, *args, **options):
+        # Cached views register themselves when their modules are imported
+        import_module(settings.ROOT_URLCONF)
+        if options['reset']:
+            response_cache.reset_stats()
+            self.stdout.write(self.style.SUCCESS('Response cache counters reset.'))
+            return
+        if not response_cache.enabled():
+            self.stdout.write('Response cache is disabled (RESPONSE_CACHE_ENABLED / CACHES).')
+        for view, stats in sorted(response_cache.stats().items()):
+            self.stdout.write(f"{view}: {stats['hit']} hits, {stats['miss']} misses (hit rate {stats['hit_rate']:.2%})")
@@ -0,0 +1,103 @@
+from django.db import transaction
+
+from .models import LostItem, FoundItem, Match
+from .bloom import serial_lookup
+from .signals import matches_created
+
+# Score of matches made by serial number; scored matches stay below it
+SERIAL_MATCH_SCORE = 1.0
+
+
+def _full_name(*parts):
+    return ' '.join([p for p in parts if p]) or None
+
+
+def match_snapshot(lost_item, found_item, serial_number=None):
+    """Party/device fields copied onto a Match at creation time."""
+    return {
+        'loster_name': _full_name(getattr(lost_item, 'first_name', None), getattr(lost_item, 'last_name', None)),
+        'loster_phone_number': getattr(lost_item, 'phone_number', None),
+        'loster_email': getattr(lost_item, 'loster_email', None),
+        'founder_name': _full_name(getattr(found_item, 'reporter_first_name', None), getattr(found_item, 'reporter_last_name', None)),
+        'founder_phone_number': getattr(found_item, 'phone_number', None),
+        'founder_email': getattr(found_item, 'founder_email', None) or getattr(found_item, 'contact_email', None),
+        'device_name': getattr(found_item, 'name', None) or getattr(lost_item, 'title', None),
+        'serial_number': serial_number or getattr(found_item, 'serial_number', None) or getattr(lost_item, 'serial_number', None),
+    }
+
+
+def save_matches(matches):
+    """Insert unsaved Match instances in one statement, skipping pairs that already exist.
+
+    Existing pairs are filtered out with a single lookup, and the unique
+    constraint absorbs any that appear concurrently. Returns the matches
+    that were written.
+    """
+    matches = list(matches)
+    if not matches:
+        return []
+    existing = set(
+        Match.objects.filter(
+            lost_item_id__in={match.lost_item_id for match in matches},
+            found_item_id__in={match.found_item_id for match in matches},
+        ).values_list('lost_item_id', 'found_item_id')
+    )
+    seen = set()
+    fresh = []
+    for match in matches:
+        pair = (match.lost_item_id, match.found_item_id)
+        if pair not in existing and pair not in seen:
+            seen.add(pair)
+            fresh.append(match)
+    if fresh:
+        with transaction.atomic():
+            Match.objects.bulk_create(fresh, ignore_conflicts=True)
+            matches_created.send(sender=Match, matches=fresh)
+    return fresh
+
+
+def create_matches(pairs, serial_number=None, scores=None):
+    """Write unclaimed matches for (lost_item, found_item) pairs in one INSERT.
+
+    `scores` maps (lost_id, found_id) to a match score; pairs without one
+    get SERIAL_MATCH_SCORE.
+    """
+    scores = scores or {}
+    return save_matches(
+        Match(
+            lost_item=lost_item,
+            found_item=found_item,
+            match_status='unclaimed',
+            score=scores.get((lost_item.id, found_item.id), SERIAL_MATCH_SCORE),
+            **match_snapshot(lost_item, found_item, serial_number),
+        )
+        for lost_item, found_item in pairs
+    )
+
+
+def match_lost_item(lost_item):
+    """Match a lost report against open found reports with the same serial.
+
+    Returns the matched found items, newest first.
+    """
+    if not lost_item.serial_normalized:
+        return []
+    found_items = serial_lookup(
+        'found', FoundItem.objects.filter(status='found').order_by('-date_reported'), lost_item.serial_normalized,
+    )
+    create_matches([(lost_item, found_item) for found_item in found_items], lost_item.serial_number)
+    return found_items
+
+
+def match_found_item(found_item):
+    """Match a found report against open lost reports with the same serial.
+
+    Returns the matched lost items, newest first.
+    """
+    if not found_item.serial_normalized:
+        return []
+    lost_items = serial_lookup(
+        'lost', LostItem.objects.filter(status='lost').order_by('-date_reported'), found_item.serial_normalized,
+    )
+    create_matches([(lost_item, found_item) for lost_item in lost_items], found_item.serial_number)
+    return lost_items
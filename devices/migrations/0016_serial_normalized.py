@@ -0,0 +1,58 @@
+# Generated by Django 5.2.6 on 2026-10-18 09:30
+
+import re
+
+from django.db import migrations, models
+
+BACKFILL_CHUNK_SIZE = 1000
+
+
+def _normalize(value):
+    # Frozen copy of devices.serials.normalize_serial
+    if not value:
+        return None
+    return re.sub(r'[^0-9A-Za-z]+', '', str(value)).upper() or None
+
+
+def backfill_serial_normalized(apps, schema_editor):
+    for model_name in ('Device', 'LostItem', 'FoundItem'):
+        model = apps.get_model('devices', model_name)
+        last_id = 0
+        while True:
+            chunk = list(
+                model.objects.filter(id__gt=last_id, serial_number__isnull=False)
+                .order_by('id')
+                .only('id', 'serial_number')[:BACKFILL_CHUNK_SIZE]
+            )
+            if not chunk:
+                break
+            for row in chunk:
+                row.serial_normalized = _normalize(row.serial_number)
+            model.objects.bulk_update(chunk, ['serial_normalized'])
+            last_id = chunk[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devices', '0015_alter_device_device_image_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='device',
+            name='serial_normalized',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='founditem',
+            name='serial_normalized',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='lostitem',
+            name='serial_normalized',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=100, null=True),
+        ),
+        migrations.RunPython(backfill_serial_normalized, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.6 on 2026-10-18 14:30
+
+from django.db import migrations
+
+# kind -> (item table, title expr, body expr, location expr, serial expr)
+SOURCES = {
+    'lost': (
+        'devices_lostitem',
+        "coalesce(title, '') || ' ' || coalesce(brand, '')",
+        "coalesce(additional_info, '') || ' ' || coalesce(category, '')",
+        "coalesce(city_town, '') || ' ' || coalesce(state, '') || ' ' || coalesce(address_type, '')",
+        "coalesce(serial_number, '') || ' ' || coalesce(serial_normalized, '')",
+    ),
+    'found': (
+        'devices_founditem',
+        "coalesce(name, '')",
+        "coalesce(description, '') || ' ' || coalesce(category, '')",
+        "coalesce(location, '') || ' ' || coalesce(address, '') || ' ' || coalesce(district, '') || ' ' || coalesce(province, '')",
+        "coalesce(serial_number, '') || ' ' || coalesce(serial_normalized, '')",
+    ),
+}
+
+
+def create_search_tables(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for kind, (items, title, body, location, serial) in SOURCES.items():
+        if vendor == 'sqlite':
+            schema_editor.execute(
+                f'CREATE VIRTUAL TABLE devices_{kind}_fts USING fts5('
+                "title, body, location, serial, tokenize = 'unicode61 remove_diacritics 2')"
+            )
+            schema_editor.execute(
+                f'INSERT INTO devices_{kind}_fts (rowid, title, body, location, serial) '
+                f'SELECT id, {title}, {body}, {location}, {serial} FROM {items}'
+            )
+        elif vendor == 'postgresql':
+            schema_editor.execute(
+                f'CREATE TABLE devices_{kind}_search ('
+                f'item_id bigint PRIMARY KEY REFERENCES {items} (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, '
+                'document tsvector NOT NULL)'
+            )
+            schema_editor.execute(
+                f'CREATE INDEX devices_{kind}_search_document_gin ON devices_{kind}_search USING gin (document)'
+            )
+            schema_editor.execute(
+                f'INSERT INTO devices_{kind}_search (item_id, document) SELECT id, '
+                f"setweight(to_tsvector('simple', {title}), 'A') || "
+                f"setweight(to_tsvector('simple', {body}), 'D') || "
+                f"setweight(to_tsvector('simple', {location}), 'C') || "
+                f"setweight(to_tsvector('simple', {serial}), 'B') FROM {items}"
+            )
+
+
+def drop_search_tables(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for kind in SOURCES:
+        if vendor == 'sqlite':
+            schema_editor.execute(f'DROP TABLE IF EXISTS devices_{kind}_fts')
+        elif vendor == 'postgresql':
+            schema_editor.execute(f'DROP TABLE IF EXISTS devices_{kind}_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devices', '0017_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_tables, drop_search_tables),
+    ]
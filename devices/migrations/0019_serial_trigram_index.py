@@ -0,0 +1,65 @@
+# Generated by Django 5.2.6 on 2026-10-18 15:20
+
+from django.db import migrations
+
+GRAM_SIZE = 3
+CHUNK_SIZE = 1000
+
+
+def _trigrams(value):
+    value = value or ''
+    return {value[i:i + GRAM_SIZE] for i in range(len(value) - GRAM_SIZE + 1)}
+
+
+def create_trigram_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        for table in ('devices_lostitem', 'devices_founditem'):
+            schema_editor.execute(
+                f'CREATE INDEX {table}_serial_trgm ON {table} USING gin (serial_normalized gin_trgm_ops)'
+            )
+    elif vendor == 'sqlite':
+        schema_editor.execute(
+            'CREATE TABLE devices_serial_trigram ('
+            'gram varchar(3) NOT NULL, kind varchar(10) NOT NULL, item_id integer NOT NULL, '
+            'PRIMARY KEY (gram, kind, item_id)) WITHOUT ROWID'
+        )
+        schema_editor.execute('CREATE INDEX devices_serial_trigram_item ON devices_serial_trigram (kind, item_id)')
+        for kind, model_name in (('lost', 'LostItem'), ('found', 'FoundItem')):
+            model = apps.get_model('devices', model_name)
+            last_id = 0
+            while True:
+                chunk = list(
+                    model.objects.filter(id__gt=last_id).order_by('id')
+                    .values_list('id', 'serial_normalized')[:CHUNK_SIZE]
+                )
+                if not chunk:
+                    break
+                rows = [(gram, kind, pk) for pk, serial in chunk for gram in _trigrams(serial)]
+                if rows:
+                    with schema_editor.connection.cursor() as cursor:
+                        cursor.executemany(
+                            'INSERT INTO devices_serial_trigram (gram, kind, item_id) VALUES (%s, %s, %s)', rows
+                        )
+                last_id = chunk[-1][0]
+
+
+def drop_trigram_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        for table in ('devices_lostitem', 'devices_founditem'):
+            schema_editor.execute(f'DROP INDEX IF EXISTS {table}_serial_trgm')
+    elif vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS devices_serial_trigram')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devices', '0018_search_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
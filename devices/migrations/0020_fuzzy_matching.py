@@ -0,0 +1,80 @@
+# Generated by Django 5.2.6 on 2026-10-18 16:05
+
+import re
+import unicodedata
+
+from django.conf import settings
+from django.db import migrations, models
+
+BACKFILL_CHUNK_SIZE = 1000
+
+
+def _normalize_text(value):
+    # Frozen copy of devices.blocking.normalize_text
+    if not value:
+        return ''
+    value = unicodedata.normalize('NFKD', str(value)).encode('ascii', 'ignore').decode()
+    return re.sub(r'[^0-9a-z]+', ' ', value.lower()).strip()
+
+
+def _block_key(category, region):
+    return f'{_normalize_text(category)}|{_normalize_text(region)}'
+
+
+def backfill_match_blocks(apps, schema_editor):
+    for model_name, region in (('LostItem', 'state'), ('FoundItem', 'province')):
+        model = apps.get_model('devices', model_name)
+        last_id = 0
+        while True:
+            chunk = list(
+                model.objects.filter(id__gt=last_id)
+                .order_by('id')
+                .only('id', 'category', region)[:BACKFILL_CHUNK_SIZE]
+            )
+            if not chunk:
+                break
+            for row in chunk:
+                row.match_block = _block_key(row.category, getattr(row, region))
+            model.objects.bulk_update(chunk, ['match_block'])
+            last_id = chunk[-1].id
+    # Matches whose reports share a serial came from the exact serial
+    # comparison; the rest were made by hand and stay unscored
+    apps.get_model('devices', 'Match').objects.filter(
+        score__isnull=True,
+        lost_item__serial_normalized=models.F('found_item__serial_normalized'),
+    ).exclude(lost_item__serial_normalized__isnull=True).exclude(lost_item__serial_normalized='').update(score=1.0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devices', '0019_serial_trigram_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='founditem',
+            name='match_block',
+            field=models.CharField(blank=True, editable=False, max_length=220, null=True),
+        ),
+        migrations.AddField(
+            model_name='lostitem',
+            name='match_block',
+            field=models.CharField(blank=True, editable=False, max_length=220, null=True),
+        ),
+        migrations.AddField(
+            model_name='match',
+            name='score',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='founditem',
+            index=models.Index(fields=['match_block', 'date_reported'], name='devices_fou_match_b_c1f438_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lostitem',
+            index=models.Index(fields=['match_block', 'date_reported'], name='devices_los_match_b_b0fb91_idx'),
+        ),
+        migrations.RunPython(backfill_match_blocks, migrations.RunPython.noop),
+    ]
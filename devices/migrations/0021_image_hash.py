@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-18 17:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devices', '0020_fuzzy_matching'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='founditem',
+            name='image_hash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=16, null=True),
+        ),
+        migrations.AddField(
+            model_name='lostitem',
+            name='image_hash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=16, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 19:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devices', '0021_image_hash'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='match',
+            name='match_status',
+            field=models.CharField(choices=[('unclaimed', 'Unclaimed'), ('claimed', 'Claimed'), ('closed', 'Closed')], db_index=True, default='unclaimed', max_length=20),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.6 on 2026-10-18 20:30
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devices', '0022_match_closed_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatusTransition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('item_kind', models.CharField(choices=[('lost', 'Lost item'), ('found', 'Found item')], max_length=10)),
+                ('item_id', models.PositiveIntegerField()),
+                ('from_status', models.CharField(max_length=50)),
+                ('to_status', models.CharField(max_length=50)),
+                ('reason', models.CharField(choices=[('update', 'Item update'), ('bulk', 'Bulk update'), ('claim', 'Match claimed'), ('match', 'Propagated from a matched item')], max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='status_transitions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['item_kind', 'item_id', 'created_at'], name='devices_sta_item_ki_34167f_idx')],
+            },
+        ),
+    ]
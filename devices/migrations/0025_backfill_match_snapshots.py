@@ -0,0 +1,59 @@
+# Generated by Django 5.2.6 on 2026-10-18 21:40
+
+from django.db import migrations
+
+BACKFILL_CHUNK_SIZE = 1000
+SNAPSHOT_FIELDS = (
+    'loster_name', 'loster_phone_number', 'loster_email',
+    'founder_name', 'founder_phone_number', 'founder_email',
+    'device_name', 'serial_number',
+)
+
+
+def _full_name(first, last):
+    # Frozen copy of devices.matching._full_name
+    return ' '.join(part for part in (first, last) if part) or None
+
+
+def _snapshot(lost, found):
+    # Frozen copy of devices.matching.match_snapshot
+    return {
+        'loster_name': _full_name(lost.first_name, lost.last_name),
+        'loster_phone_number': lost.phone_number,
+        'loster_email': lost.loster_email,
+        'founder_name': _full_name(found.reporter_first_name, found.reporter_last_name),
+        'founder_phone_number': found.phone_number,
+        'founder_email': found.founder_email or found.contact_email,
+        'device_name': found.name or lost.title,
+        'serial_number': found.serial_number or lost.serial_number,
+    }
+
+
+def backfill_match_snapshots(apps, schema_editor):
+    """Fill in the party fields of matches saved without them."""
+    Match = apps.get_model('devices', 'Match')
+    missing = Match.objects.filter(**{f'{field}__isnull': True for field in SNAPSHOT_FIELDS})
+    last_id = 0
+    while True:
+        chunk = list(
+            missing.filter(id__gt=last_id).order_by('id')
+            .select_related('lost_item', 'found_item')[:BACKFILL_CHUNK_SIZE]
+        )
+        if not chunk:
+            break
+        for match in chunk:
+            for field, value in _snapshot(match.lost_item, match.found_item).items():
+                setattr(match, field, value)
+        Match.objects.bulk_update(chunk, SNAPSHOT_FIELDS)
+        last_id = chunk[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devices', '0024_partner_api_key'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_match_snapshots, migrations.RunPython.noop),
+    ]
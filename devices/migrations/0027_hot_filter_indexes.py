@@ -0,0 +1,29 @@
+# Generated by Django 5.2.6 on 2026-10-18 22:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devices', '0026_collection_version'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='founditem',
+            index=models.Index(fields=['status', 'date_reported', 'id'], name='devices_fou_status_b08584_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='founditem',
+            index=models.Index(fields=['founder_email', 'date_reported'], name='devices_fou_founder_c19514_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lostitem',
+            index=models.Index(fields=['status', 'date_reported', 'id'], name='devices_los_status_23b098_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lostitem',
+            index=models.Index(fields=['loster_email', 'date_reported'], name='devices_los_loster__0a7391_idx'),
+        ),
+    ]
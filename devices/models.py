@@ -1,7 +1,13 @@
+import hashlib
+import secrets
+
 from django.db import models
 from cloudinary_storage.storage import MediaCloudinaryStorage
 
 from authentication.models import User
+from .blocking import block_key
+from .imagehash import hash_file
+from .serials import normalize_serial
 
 # Predefined categories
 CATEGORY_CHOICES = [
@@ -14,7 +20,61 @@ CATEGORY_CHOICES = [
     ('Other electronics', 'Other electronics'),
 ]
 
-class Device(models.Model):
+class SerialNormalizedModel(models.Model):
+	# Indexed canonical copy of serial_number, kept in sync on save
+	serial_normalized = models.CharField(max_length=100, blank=True, null=True, db_index=True, editable=False)
+
+	class Meta:
+		abstract = True
+
+	def save(self, *args, **kwargs):
+		self.serial_normalized = normalize_serial(self.serial_number)
+		update_fields = kwargs.get('update_fields')
+		if update_fields is not None and 'serial_number' in update_fields:
+			kwargs['update_fields'] = set(update_fields) | {'serial_normalized'}
+		super().save(*args, **kwargs)
+
+
+class MatchBlockModel(models.Model):
+	# Region (state/province) field of the blocking key used by devices.fuzzy
+	block_region_field = None
+
+	match_block = models.CharField(max_length=220, blank=True, null=True, editable=False)
+
+	class Meta:
+		abstract = True
+
+	def save(self, *args, **kwargs):
+		self.match_block = block_key(self.category, getattr(self, self.block_region_field))
+		update_fields = kwargs.get('update_fields')
+		if update_fields is not None and {'category', self.block_region_field} & set(update_fields):
+			kwargs['update_fields'] = set(update_fields) | {'match_block'}
+		super().save(*args, **kwargs)
+
+
+class ImageHashModel(models.Model):
+	# Name of the ImageField whose upload is hashed by devices.imagehash
+	hashed_image_field = None
+
+	image_hash = models.CharField(max_length=16, blank=True, null=True, db_index=True, editable=False)
+
+	class Meta:
+		abstract = True
+
+	def save(self, *args, **kwargs):
+		image = getattr(self, self.hashed_image_field)
+		# Only fresh uploads are read; stored photos keep the hash taken at upload
+		if not image:
+			self.image_hash = None
+		elif not image._committed:
+			self.image_hash = hash_file(image)
+		update_fields = kwargs.get('update_fields')
+		if update_fields is not None and self.hashed_image_field in update_fields:
+			kwargs['update_fields'] = set(update_fields) | {'image_hash'}
+		super().save(*args, **kwargs)
+
+
+class Device(SerialNormalizedModel):
 	user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='devices')
 	serial_number = models.CharField(max_length=100)
 	name = models.CharField(max_length=100)
@@ -36,7 +96,10 @@ class Device(models.Model):
 
 
 
-class LostItem(models.Model):
+class LostItem(ImageHashModel, MatchBlockModel, SerialNormalizedModel):
+	block_region_field = 'state'
+	hashed_image_field = 'image'
+
 	# Exact schema per frontend (stored as snake_case fields)
 	title = models.CharField(max_length=150)
 	date_found = models.DateField(blank=True, null=True)
@@ -62,12 +125,24 @@ class LostItem(models.Model):
 	created_at = models.DateTimeField(auto_now_add=True)
 	updated_at = models.DateTimeField(auto_now=True)
 
+	class Meta:
+		indexes = [
+			models.Index(fields=['date_reported', 'id']),
+			models.Index(fields=['match_block', 'date_reported']),
+			# Status filters and by-email lookups, newest first (devices.tests_indexes)
+			models.Index(fields=['status', 'date_reported', 'id']),
+			models.Index(fields=['loster_email', 'date_reported']),
+		]
+
 	def __str__(self):
 		user_repr = self.user.email if getattr(self.user, 'email', None) else 'anonymous'
 		return f"Lost by {user_repr}"
 
 
-class FoundItem(models.Model):
+class FoundItem(ImageHashModel, MatchBlockModel, SerialNormalizedModel):
+	block_region_field = 'province'
+	hashed_image_field = 'device_image'
+
 	name = models.CharField(max_length=100)
 	category = models.CharField(max_length=100, choices=CATEGORY_CHOICES)
 	description = models.TextField(blank=True, null=True)
@@ -90,6 +165,14 @@ class FoundItem(models.Model):
 	created_at = models.DateTimeField(auto_now_add=True)
 	updated_at = models.DateTimeField(auto_now=True)
 
+	class Meta:
+		indexes = [
+			models.Index(fields=['date_reported', 'id']),
+			models.Index(fields=['match_block', 'date_reported']),
+			models.Index(fields=['status', 'date_reported', 'id']),
+			models.Index(fields=['founder_email', 'date_reported']),
+		]
+
 	def __str__(self):
 		user_email = self.user.email if getattr(self.user, 'email', None) else 'anonymous'
 		return f"Found: {self.name} by {user_email}"
@@ -101,6 +184,8 @@ class Match(models.Model):
 	STATUS_CHOICES = (
 		('unclaimed', 'Unclaimed'),
 		('claimed', 'Claimed'),
+		# Another match for the same lost or found item was claimed
+		('closed', 'Closed'),
 	)
 	match_status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='unclaimed', db_index=True)
 	match_date = models.DateTimeField(auto_now_add=True)
@@ -114,6 +199,28 @@ class Match(models.Model):
 	founder_email = models.EmailField(blank=True, null=True)
 	device_name = models.CharField(max_length=200, blank=True, null=True)
 	serial_number = models.CharField(max_length=100, blank=True, null=True)
+	# 1.0 for serial matches, devices.fuzzy score otherwise
+	score = models.FloatField(blank=True, null=True)
+
+	# Columns the API reads; `matched` is built from the snapshots, not the items
+	READ_FIELDS = (
+		'id', 'match_status', 'match_date',
+		'loster_name', 'loster_phone_number', 'loster_email',
+		'founder_name', 'founder_phone_number', 'founder_email',
+		'device_name', 'serial_number', 'score',
+	)
+	SNAPSHOT_FIELDS = READ_FIELDS[3:-1]
+
+	def save(self, *args, **kwargs):
+		if (
+			self._state.adding and self.lost_item_id and self.found_item_id
+			and not any(getattr(self, field) for field in self.SNAPSHOT_FIELDS)
+		):
+			# Matches made outside devices.matching (admin, API) still get snapshots
+			from .matching import match_snapshot
+			for field, value in match_snapshot(self.lost_item, self.found_item).items():
+				setattr(self, field, value)
+		super().save(*args, **kwargs)
 
 	def __str__(self):
 		return f"Match: Lost({self.lost_item_id}) - Found({self.found_item_id})"
@@ -123,8 +230,38 @@ class Match(models.Model):
 		indexes = [
 			models.Index(fields=['match_status']),
 			models.Index(fields=['lost_item', 'found_item']),
+			models.Index(fields=['match_date', 'id']),
+		]
+
+
+class StatusTransition(models.Model):
+	"""Audit row for every item status change made through devices.status."""
+	KIND_CHOICES = (
+		('lost', 'Lost item'),
+		('found', 'Found item'),
+	)
+	REASON_CHOICES = (
+		('update', 'Item update'),
+		('bulk', 'Bulk update'),
+		('claim', 'Match claimed'),
+		('match', 'Propagated from a matched item'),
+	)
+	item_kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+	item_id = models.PositiveIntegerField()
+	from_status = models.CharField(max_length=50)
+	to_status = models.CharField(max_length=50)
+	reason = models.CharField(max_length=20, choices=REASON_CHOICES)
+	user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='status_transitions')
+	created_at = models.DateTimeField(auto_now_add=True)
+
+	class Meta:
+		indexes = [
+			models.Index(fields=['item_kind', 'item_id', 'created_at']),
 		]
 
+	def __str__(self):
+		return f"{self.item_kind} {self.item_id}: {self.from_status} -> {self.to_status}"
+
 
 class Return(models.Model):
 	lost_item = models.ForeignKey(LostItem, on_delete=models.CASCADE, related_name='returns')
@@ -143,6 +280,11 @@ class Return(models.Model):
 	claimed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='returns_claimed')
 	notes = models.TextField(blank=True, null=True)
 
+	class Meta:
+		indexes = [
+			models.Index(fields=['return_date', 'id']),
+		]
+
 	def __str__(self):
 		return f"Return: Lost({self.lost_item_id}) - Found({self.found_item_id})"
 
@@ -155,5 +297,50 @@ class Contact(models.Model):
 	message = models.TextField()
 	created_at = models.DateTimeField(auto_now_add=True)
 
+	class Meta:
+		indexes = [
+			models.Index(fields=['created_at', 'id']),
+		]
+
 	def __str__(self):
 		return f"Contact from {self.first_name} {self.last_name} - {self.subject}"
+
+
+class PartnerApiKey(models.Model):
+	"""API key for partners (pawn shops, repair centres) using the serial check.
+
+	Only a SHA-256 of the key is stored; the key itself is shown once, by
+	``manage.py create_api_key``.
+	"""
+	name = models.CharField(max_length=100)
+	prefix = models.CharField(max_length=8)
+	key_hash = models.CharField(max_length=64, unique=True)
+	is_active = models.BooleanField(default=True)
+	created_at = models.DateTimeField(auto_now_add=True)
+
+	@staticmethod
+	def hash_key(key):
+		return hashlib.sha256(key.encode()).hexdigest()
+
+	@classmethod
+	def generate(cls, name):
+		"""Create a key; returns (instance, key)."""
+		key = secrets.token_urlsafe(32)
+		return cls.objects.create(name=name, prefix=key[:8], key_hash=cls.hash_key(key)), key
+
+	def __str__(self):
+		return f"{self.name} ({self.prefix}...)"
+
+
+class CollectionVersion(models.Model):
+	"""Change counter of an API collection, for ETag / Last-Modified on list endpoints.
+
+	Bumped by devices.versions.touch() whenever a row the collection is
+	built from changes.
+	"""
+	name = models.CharField(max_length=50, primary_key=True)
+	version = models.PositiveBigIntegerField(default=0)
+	updated_at = models.DateTimeField()
+
+	def __str__(self):
+		return f"{self.name} v{self.version}"
@@ -0,0 +1,21 @@
+from rest_framework.permissions import BasePermission
+
+
+STATUS_FORBIDDEN = 'Only the reporting user or an authority user can change the status.'
+
+
+class IsAuthority(BasePermission):
+    """Authority accounts (and staff) that reconcile reports offline."""
+    message = 'Only authority users can perform this action.'
+
+    def has_permission(self, request, view):
+        user = request.user
+        if not (user and user.is_authenticated):
+            return False
+        return getattr(user, 'role', None) == 'authority' or user.is_staff
+
+
+def can_change_status(request, item):
+    """Status changes spread to matched items, so they need the item's owner or an authority."""
+    user = request.user
+    return user.is_authenticated and (item.user_id == user.id or IsAuthority().has_permission(request, None))
@@ -0,0 +1,73 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Device, LostItem, FoundItem, Match, Return
+from .search import get_search_backend, kind_for_model
+from .serial_search import index_serial, unindex_serial
+from .imagehash import get_index
+from .bloom import get_filter
+from .signals import items_status_changed, matches_created, matches_status_changed, returns_created
+from .response_cache import invalidate
+from .versions import touch
+
+# model -> CollectionVersion name of the list built from it
+COLLECTIONS = {LostItem: 'lost_items', FoundItem: 'found_items', Match: 'matches', Return: 'returns'}
+
+
+@receiver(post_save, sender=LostItem, dispatch_uid='search-index-lost')
+@receiver(post_save, sender=FoundItem, dispatch_uid='search-index-found')
+def index_item(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    kind = kind_for_model(sender)
+    get_search_backend().index(kind, instance)
+    if update_fields is None or 'serial_number' in update_fields:
+        index_serial(kind, instance.pk, instance.serial_normalized)
+        get_filter(kind).add(instance.serial_normalized)
+    get_index(kind).update(instance)
+
+
+@receiver(post_save, sender=Device, dispatch_uid='serial-filter-device')
+def add_device_serial(sender, instance, raw=False, **kwargs):
+    if not raw:
+        get_filter('device').add(instance.serial_normalized)
+
+
+@receiver(post_delete, sender=LostItem, dispatch_uid='search-remove-lost')
+@receiver(post_delete, sender=FoundItem, dispatch_uid='search-remove-found')
+def unindex_item(sender, instance, **kwargs):
+    kind = kind_for_model(sender)
+    get_search_backend().remove(kind, instance.pk)
+    unindex_serial(kind, instance.pk)
+    get_index(kind).remove(instance.pk)
+
+
+@receiver(items_status_changed, dispatch_uid='image-index-status')
+def drop_closed_images(sender, changes, new_status, **kwargs):
+    kind = kind_for_model(sender)
+    index = get_index(kind)
+    if new_status != index.open_status:
+        for pk, _ in changes:
+            index.remove(pk)
+
+
+@receiver(post_save, sender=LostItem, dispatch_uid='version-save-lost')
+@receiver(post_save, sender=FoundItem, dispatch_uid='version-save-found')
+@receiver(post_save, sender=Match, dispatch_uid='version-save-match')
+@receiver(post_save, sender=Return, dispatch_uid='version-save-return')
+@receiver(post_delete, sender=LostItem, dispatch_uid='version-delete-lost')
+@receiver(post_delete, sender=FoundItem, dispatch_uid='version-delete-found')
+@receiver(post_delete, sender=Match, dispatch_uid='version-delete-match')
+@receiver(post_delete, sender=Return, dispatch_uid='version-delete-return')
+@receiver(items_status_changed, dispatch_uid='version-status')
+@receiver(matches_created, dispatch_uid='version-bulk-matches')
+@receiver(matches_status_changed, dispatch_uid='version-match-status')
+@receiver(returns_created, dispatch_uid='version-bulk-returns')
+def touch_collection(sender, raw=False, instance=None, changes=(), ids=(), **kwargs):
+    if raw or sender not in COLLECTIONS:
+        return
+    name = COLLECTIONS[sender]
+    touch(name)
+    # Detail responses are cached per object
+    pks = [instance.pk] if instance is not None else [*(pk for pk, _ in changes), *ids]
+    invalidate(*(f'{name}:{pk}' for pk in pks))
@@ -0,0 +1,75 @@
+"""Cross-check found reports against the registered Device list.
+
+A found report whose serial belongs to a registered device is linked to
+it through ``FoundItem.device`` (the oldest registration wins when several
+users registered the serial). Every owner of the serial gets an in-app
+Notification. Lookups use the ``serial_normalized`` index, one query per
+batch of found items.
+"""
+from collections import defaultdict
+
+from notifications.models import Notification
+
+from .bloom import possible_serials
+from .models import Device, FoundItem
+
+
+def devices_by_serial(serials):
+    """{serial_normalized: [devices, oldest first]} for the given serials."""
+    devices = defaultdict(list)
+    serials = possible_serials('device', serials)
+    if serials:
+        for device in Device.objects.filter(serial_normalized__in=serials).order_by('created_at', 'id'):
+            devices[device.serial_normalized].append(device)
+    return devices
+
+
+def _message(device, found_item):
+    place = ', '.join(p for p in (found_item.district, found_item.province) if p)
+    where = f' in {place}' if place else ''
+    return (
+        f'A found item matching your registered device "{device.name}" '
+        f'({device.serial_number}) was reported{where}.'
+    )
+
+
+def link_found_items(found_items, notify=True):
+    """Link found items to registered devices with their serial; returns the linked items.
+
+    Items already linked are left alone. With `notify`, each device owner
+    gets one Notification per linked item, written in one INSERT.
+    """
+    pending = [item for item in found_items if item.serial_normalized and item.device_id is None]
+    devices = devices_by_serial({item.serial_normalized for item in pending})
+    linked = []
+    notifications = []
+    for item in pending:
+        owned = devices.get(item.serial_normalized)
+        if not owned:
+            continue
+        item.device = owned[0]
+        linked.append(item)
+        if notify:
+            seen = set()
+            for device in owned:
+                if device.user_id not in seen:
+                    seen.add(device.user_id)
+                    notifications.append(Notification(user_id=device.user_id, message=_message(device, item)))
+    if linked:
+        # update() rather than save(): the search and serial indexes need no refresh
+        for device_id, ids in _ids_by_device(linked).items():
+            FoundItem.objects.filter(id__in=ids).update(device_id=device_id)
+        Notification.objects.bulk_create(notifications)
+    return linked
+
+
+def _ids_by_device(items):
+    ids = defaultdict(list)
+    for item in items:
+        ids[item.device_id].append(item.id)
+    return ids
+
+
+def link_found_item(found_item):
+    """Link one new found report to its registered device, if any, and notify the owners."""
+    return bool(link_found_items([found_item]))
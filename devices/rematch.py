@@ -0,0 +1,78 @@
+"""Batch re-matching of existing reports (see ``manage.py rematch``).
+
+Work is split into chunks of item ids. ``candidate_rows`` only reads, so it
+can run in worker processes; the caller turns the rows into Match instances
+and writes them with ``save_matches`` from a single process.
+
+Workers are spawned, and unpickling ``work`` imports this module before
+Django is set up, so models are imported inside the functions.
+"""
+from collections import defaultdict
+
+import django
+
+
+def _sides():
+    from .fuzzy import rank_lost_item, rank_found_item
+    from .models import LostItem, FoundItem
+
+    # kind -> (model, its open status, the other side's model and open status, ranker)
+    return {
+        'lost': (LostItem, 'lost', FoundItem, 'found', rank_lost_item),
+        'found': (FoundItem, 'found', LostItem, 'lost', rank_found_item),
+    }
+
+
+def unmatched_ids(kind, after=0, include_matched=False):
+    """Ids of open reports of `kind` past `after`, in id order, for .iterator()."""
+    model, open_status = _sides()[kind][:2]
+    queryset = model.objects.filter(status=open_status, id__gt=after)
+    if not include_matched:
+        queryset = queryset.filter(matches__isnull=True)
+    return queryset.order_by('id').values_list('id', flat=True)
+
+
+def candidate_rows(kind, ids):
+    """Match field dicts for a chunk of report ids: serial matches plus fuzzy candidates."""
+    from .matching import SERIAL_MATCH_SCORE, match_snapshot
+
+    model, open_status, other_model, other_status, rank = _sides()[kind]
+    items = list(model.objects.filter(id__in=ids, status=open_status))
+    serials = {item.serial_normalized for item in items if item.serial_normalized}
+    by_serial = defaultdict(list)
+    if serials:
+        for other in other_model.objects.filter(serial_normalized__in=serials, status=other_status):
+            by_serial[other.serial_normalized].append(other)
+
+    rows = []
+    # Reports in the same block share candidate lookups and profiles
+    cache = {}
+    for item in items:
+        best = {other.id: (other, SERIAL_MATCH_SCORE) for other in by_serial.get(item.serial_normalized, ())}
+        for other, score in rank(item, cache):
+            best.setdefault(other.id, (other, score))
+        for other, score in best.values():
+            lost_item, found_item = (item, other) if kind == 'lost' else (other, item)
+            rows.append({
+                'lost_item_id': lost_item.id,
+                'found_item_id': found_item.id,
+                'score': score,
+                **match_snapshot(lost_item, found_item),
+            })
+    return rows
+
+
+def build_matches(rows):
+    from .models import Match
+
+    return [Match(match_status='unclaimed', **row) for row in rows]
+
+
+def init_worker():
+    django.setup()
+
+
+def work(task):
+    """Worker entry point: (kind, ids) -> (last id, ids processed, candidate rows)."""
+    kind, ids = task
+    return ids[-1], len(ids), candidate_rows(kind, ids)
@@ -0,0 +1,153 @@
+"""Cache of public GET responses, invalidated by model signals.
+
+A cached view declares the tags its response depends on: a collection
+(``lost_items``) for lists and stats, or one object (``lost_items:{id}``)
+for a detail view. Each tag has a generation number in Django's cache,
+and a response is stored under its view, normalized query string and the
+current generations of its tags. ``invalidate()`` bumps generations when
+rows change (see devices.receivers and devices.versions.touch), so stale
+entries are never read again and simply expire.
+
+The response data is cached, not the rendered bytes, so content
+negotiation still happens per request. Like the serial Bloom filters this
+needs a cache shared by every process: unless RESPONSE_CACHE_ENABLED says
+otherwise it is off with a per-process (locmem) cache. Hits and misses are
+counted per view; see ``stats()`` and ``manage.py response_cache_stats``.
+"""
+import functools
+import hashlib
+import time
+from collections import Counter
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from rest_framework.response import Response
+
+PREFIX = 'response-cache'
+DEFAULT_TIMEOUT = 300
+METRICS_FLUSH_SECONDS = 10
+OUTCOMES = ('hit', 'miss')
+
+_views = []
+_counts = Counter()
+_flushed_at = time.monotonic()
+
+
+def enabled():
+    value = getattr(settings, 'RESPONSE_CACHE_ENABLED', None)
+    if value is None:
+        backend = settings.CACHES['default']['BACKEND']
+        return not backend.endswith(('LocMemCache', 'DummyCache'))
+    return value
+
+
+def _generation_key(tag):
+    return f'{PREFIX}:generation:{tag}'
+
+
+def generations(tags):
+    keys = [_generation_key(tag) for tag in tags]
+    found = cache.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        # New (or evicted) tags start past any generation already used for them
+        start = time.time_ns()
+        for key in missing:
+            cache.add(key, start, timeout=None)
+        found.update(cache.get_many(missing))
+    return [found.get(key) for key in keys]
+
+
+def _bump(tags):
+    for tag in tags:
+        try:
+            cache.incr(_generation_key(tag))
+        except ValueError:
+            # Nothing was cached under this tag
+            pass
+
+
+def invalidate(*tags):
+    """Drop cached responses depending on these tags, now and again on commit.
+
+    Bumping before commit hides the old data from this transaction's own
+    reads; bumping after stops other requests from re-caching rows they
+    read before the commit.
+    """
+    if not tags or not enabled():
+        return
+    _bump(tags)
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: _bump(tags))
+
+
+def normalized_query(request):
+    """The query string with parameters sorted by name, values in request order."""
+    return urlencode(sorted(request.query_params.lists()), doseq=True)
+
+
+def cached(*tags, key=None, timeout=None):
+    """Cache a function view's 200 responses under the given tags.
+
+    Tags are formatted with the view's URL kwargs, e.g. ``'matches:{id}'``.
+    `key(request)` adds anything else the response depends on.
+    """
+    def decorator(view):
+        name = view.__name__
+        _views.append(name)
+
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not enabled():
+                return view(request, *args, **kwargs)
+            view_tags = [tag.format(**kwargs) for tag in tags]
+            # Paginated responses carry absolute links, so the host is part of the key
+            parts = [name, request.build_absolute_uri('/'), normalized_query(request), *map(str, generations(view_tags))]
+            if key is not None:
+                parts.append(key(request))
+            cache_key = f'{PREFIX}:{name}:' + hashlib.blake2b('|'.join(parts).encode(), digest_size=16).hexdigest()
+            data = cache.get(cache_key)
+            if data is not None:
+                _count(name, 'hit')
+                return Response(data)
+            _count(name, 'miss')
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200:
+                cache.set(cache_key, response.data, timeout=timeout or getattr(settings, 'RESPONSE_CACHE_TIMEOUT', DEFAULT_TIMEOUT))
+            return response
+        return wrapper
+    return decorator
+
+
+def _count(view, outcome):
+    _counts[view, outcome] += 1
+    if time.monotonic() - _flushed_at >= METRICS_FLUSH_SECONDS:
+        flush_metrics()
+
+
+def flush_metrics():
+    global _counts, _flushed_at
+    counts, _counts = _counts, Counter()
+    _flushed_at = time.monotonic()
+    for (view, outcome), n in counts.items():
+        metric_key = f'{PREFIX}:{outcome}:{view}'
+        if not cache.add(metric_key, n, timeout=None):
+            cache.incr(metric_key, n)
+
+
+def stats():
+    """{view: {'hit', 'miss', 'hit_rate'}} across processes, as last flushed."""
+    flush_metrics()
+    result = {}
+    for view in _views:
+        hits, misses = (cache.get(f'{PREFIX}:{outcome}:{view}') or 0 for outcome in OUTCOMES)
+        result[view] = {'hit': hits, 'miss': misses, 'hit_rate': hits / (hits + misses) if hits + misses else 0.0}
+    return result
+
+
+def reset_stats():
+    global _counts
+    _counts = Counter()
+    cache.delete_many([f'{PREFIX}:{outcome}:{view}' for view in _views for outcome in OUTCOMES])
@@ -0,0 +1,221 @@
+"""Full-text search over lost and found reports.
+
+Each item kind has a side table holding its searchable text, kept in sync
+by devices.receivers on save/delete:
+
+* SQLite: an FTS5 virtual table (``devices_<kind>_fts``) keyed by rowid.
+* PostgreSQL: a ``tsvector`` table (``devices_<kind>_search``) with a GIN index.
+
+Other databases fall back to ``icontains`` filtering. The backend can be
+overridden with the ``DEVICES_SEARCH_BACKEND`` setting (dotted path).
+"""
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils.module_loading import import_string
+
+from .models import LostItem, FoundItem
+
+_TOKEN = re.compile(r'\w+', re.UNICODE)
+
+# Document columns, in bm25/setweight order: title, body, location, serial
+SEARCH_SOURCES = {
+    'lost': {
+        'model': LostItem,
+        'title': ['title', 'brand'],
+        'body': ['additional_info', 'category'],
+        'location': ['city_town', 'state', 'address_type'],
+        'serial': ['serial_number', 'serial_normalized'],
+    },
+    'found': {
+        'model': FoundItem,
+        'title': ['name'],
+        'body': ['description', 'category'],
+        'location': ['location', 'address', 'district', 'province'],
+        'serial': ['serial_number', 'serial_normalized'],
+    },
+}
+DOCUMENT_COLUMNS = ('title', 'body', 'location', 'serial')
+# Columns of the item table that search results may be filtered on, and the
+# ORM lookups the SQL backends accept for them
+FILTERABLE = ('status', 'category')
+FILTER_LOOKUPS = ('exact', 'icontains')
+
+
+def _escape_like(value):
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def filter_sql(filters):
+    """WHERE clauses and params on the item table `i` for ORM-style filters ({'category__icontains': ...})."""
+    where, params = [], []
+    for key, value in (filters or {}).items():
+        column, _, lookup = key.partition('__')
+        lookup = lookup or 'exact'
+        if column not in FILTERABLE or lookup not in FILTER_LOOKUPS:
+            raise ValueError(f'Cannot filter search on {key}')
+        if lookup == 'icontains':
+            where.append(f"LOWER(i.{column}) LIKE %s ESCAPE '\\'")
+            params.append(f'%{_escape_like(value.lower())}%')
+        else:
+            where.append(f'i.{column} = %s')
+            params.append(value)
+    return where, params
+
+
+def tokenize(text):
+    return _TOKEN.findall(text or '')
+
+
+def kind_for_model(model):
+    for kind, source in SEARCH_SOURCES.items():
+        if source['model'] is model:
+            return kind
+    return None
+
+
+def document(kind, instance):
+    """The column -> text mapping stored for an item."""
+    source = SEARCH_SOURCES[kind]
+    return {
+        column: ' '.join(str(v) for v in (getattr(instance, f, None) for f in source[column]) if v)
+        for column in DOCUMENT_COLUMNS
+    }
+
+
+class BaseSearchBackend:
+    def index(self, kind, instance):
+        pass
+
+    def remove(self, kind, pk):
+        pass
+
+    def search(self, kind, text, filters=None, limit=20, offset=0):
+        """Return item ids ranked by relevance."""
+        raise NotImplementedError
+
+
+class LikeSearchBackend(BaseSearchBackend):
+    """Unindexed fallback for databases without a full-text engine."""
+
+    def search(self, kind, text, filters=None, limit=20, offset=0):
+        source = SEARCH_SOURCES[kind]
+        queryset = source['model'].objects.filter(**(filters or {}))
+        for token in tokenize(text):
+            match = Q()
+            for column in DOCUMENT_COLUMNS:
+                for field in source[column]:
+                    match |= Q(**{f'{field}__icontains': token})
+            queryset = queryset.filter(match)
+        return list(queryset.order_by('-date_reported', '-id').values_list('id', flat=True)[offset:offset + limit])
+
+
+class SQLiteFTSBackend(BaseSearchBackend):
+    # bm25 weights for title, body, location, serial
+    weights = (10.0, 1.0, 2.0, 8.0)
+
+    @staticmethod
+    def table(kind):
+        return f'devices_{kind}_fts'
+
+    def index(self, kind, instance):
+        doc = document(kind, instance)
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table(kind)} WHERE rowid = %s', [instance.pk])
+            cursor.execute(
+                f'INSERT INTO {self.table(kind)} (rowid, title, body, location, serial) VALUES (%s, %s, %s, %s, %s)',
+                [instance.pk] + [doc[c] for c in DOCUMENT_COLUMNS],
+            )
+
+    def remove(self, kind, pk):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table(kind)} WHERE rowid = %s', [pk])
+
+    def search(self, kind, text, filters=None, limit=20, offset=0):
+        tokens = tokenize(text)
+        if not tokens:
+            return []
+        # Every token must match, each as a prefix: "iph 13" -> "iph"* "13"*
+        match = ' '.join('"%s"*' % t.replace('"', '""') for t in tokens)
+        fts = self.table(kind)
+        items = SEARCH_SOURCES[kind]['model']._meta.db_table
+        where, params = [f'{fts} MATCH %s'], [match]
+        clauses, values = filter_sql(filters)
+        where += clauses
+        params += values
+        weights = ', '.join(str(w) for w in self.weights)
+        sql = (
+            f'SELECT i.id FROM {fts} JOIN {items} i ON i.id = {fts}.rowid '
+            f'WHERE {" AND ".join(where)} '
+            f'ORDER BY bm25({fts}, {weights}), i.id DESC LIMIT %s OFFSET %s'
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params + [limit, offset])
+            return [row[0] for row in cursor.fetchall()]
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    config = 'simple'
+
+    @staticmethod
+    def table(kind):
+        return f'devices_{kind}_search'
+
+    def index(self, kind, instance):
+        doc = document(kind, instance)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {self.table(kind)} (item_id, document) VALUES (%s, '
+                f"setweight(to_tsvector('{self.config}', %s), 'A') || "
+                f"setweight(to_tsvector('{self.config}', %s), 'D') || "
+                f"setweight(to_tsvector('{self.config}', %s), 'C') || "
+                f"setweight(to_tsvector('{self.config}', %s), 'B')) "
+                'ON CONFLICT (item_id) DO UPDATE SET document = EXCLUDED.document',
+                [instance.pk] + [doc[c] for c in DOCUMENT_COLUMNS],
+            )
+
+    def remove(self, kind, pk):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table(kind)} WHERE item_id = %s', [pk])
+
+    def search(self, kind, text, filters=None, limit=20, offset=0):
+        tokens = tokenize(text)
+        if not tokens:
+            return []
+        # to_tsquery prefix syntax: iph:* & 13:*
+        query = ' & '.join(f'{t}:*' for t in tokens)
+        search = self.table(kind)
+        items = SEARCH_SOURCES[kind]['model']._meta.db_table
+        where, params = [f"s.document @@ to_tsquery('{self.config}', %s)"], [query]
+        clauses, values = filter_sql(filters)
+        where += clauses
+        params += values
+        sql = (
+            f'SELECT i.id FROM {search} s JOIN {items} i ON i.id = s.item_id '
+            f'WHERE {" AND ".join(where)} '
+            f"ORDER BY ts_rank(s.document, to_tsquery('{self.config}', %s)) DESC, i.id DESC "
+            'LIMIT %s OFFSET %s'
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params + [query, limit, offset])
+            return [row[0] for row in cursor.fetchall()]
+
+
+_backends = {}
+
+
+def get_search_backend():
+    path = getattr(settings, 'DEVICES_SEARCH_BACKEND', None)
+    key = path or connection.vendor
+    if key not in _backends:
+        if path:
+            _backends[key] = import_string(path)()
+        elif connection.vendor == 'sqlite':
+            _backends[key] = SQLiteFTSBackend()
+        elif connection.vendor == 'postgresql':
+            _backends[key] = PostgresSearchBackend()
+        else:
+            _backends[key] = LikeSearchBackend()
+    return _backends[key]
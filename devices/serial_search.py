@@ -0,0 +1,111 @@
+"""Substring lookups on normalized serial numbers.
+
+``serial_normalized LIKE '%ABC%'`` cannot use a b-tree index, so partial
+serial searches are served from a trigram index instead:
+
+* PostgreSQL: a ``gin_trgm_ops`` index on ``serial_normalized`` (pg_trgm),
+  which the planner uses directly for ``__contains``.
+* SQLite: the ``devices_serial_trigram`` side table, kept in sync by
+  devices.receivers. An item is a candidate when it has every trigram of the
+  query; candidates are then confirmed with ``__contains``.
+
+Queries shorter than a trigram only match whole serials.
+"""
+from django.conf import settings
+from django.db import connection
+from django.db.models.expressions import RawSQL
+
+from .serials import normalize_serial
+
+GRAM_SIZE = 3
+TRIGRAM_TABLE = 'devices_serial_trigram'
+
+
+def trigrams(value):
+    value = value or ''
+    return sorted({value[i:i + GRAM_SIZE] for i in range(len(value) - GRAM_SIZE + 1)})
+
+
+def max_results():
+    return getattr(settings, 'SERIAL_SEARCH_MAX_RESULTS', 50)
+
+
+def _uses_side_table():
+    return connection.vendor == 'sqlite'
+
+
+def index_serial(kind, pk, serial_normalized):
+    if not _uses_side_table():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {TRIGRAM_TABLE} WHERE kind = %s AND item_id = %s', [kind, pk])
+        grams = trigrams(serial_normalized)
+        if grams:
+            cursor.executemany(
+                f'INSERT INTO {TRIGRAM_TABLE} (gram, kind, item_id) VALUES (%s, %s, %s)',
+                [(gram, kind, pk) for gram in grams],
+            )
+
+
+def unindex_serial(kind, pk):
+    if _uses_side_table():
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {TRIGRAM_TABLE} WHERE kind = %s AND item_id = %s', [kind, pk])
+
+
+def filter_serial_contains(queryset, kind, serial):
+    """Restrict an item queryset to serials containing `serial` (normalized)."""
+    needle = normalize_serial(serial)
+    if not needle:
+        return queryset.none()
+    if len(needle) < GRAM_SIZE:
+        return queryset.filter(serial_normalized=needle)
+    if _uses_side_table():
+        grams = trigrams(needle)
+        placeholders = ', '.join(['%s'] * len(grams))
+        candidates = RawSQL(
+            f'SELECT item_id FROM {TRIGRAM_TABLE} WHERE kind = %s AND gram IN ({placeholders}) '
+            'GROUP BY item_id HAVING COUNT(*) = %s',
+            [kind, *grams, len(grams)],
+        )
+        queryset = queryset.filter(id__in=candidates)
+    return queryset.filter(serial_normalized__contains=needle)
+
+
+def check_serials(serials):
+    """Registry and report status of many serials, with one IN query per table.
+
+    Returns one dict per input serial, in order: the serial as given, its
+    normalized form, and whether it is a registered device, has an open
+    lost report or has an open found report.
+    """
+    from .bloom import possible_serials, record_hits
+    from .models import Device, LostItem, FoundItem
+
+    normalized = [normalize_serial(serial) for serial in serials]
+    wanted = {value for value in normalized if value}
+    hits = {}
+    for kind, queryset in (
+        ('device', Device.objects.all()),
+        ('lost', LostItem.objects.filter(status='lost')),
+        ('found', FoundItem.objects.filter(status='found')),
+    ):
+        # Serials the Bloom filter rules out need no query
+        candidates = possible_serials(kind, wanted)
+        hits[kind] = set()
+        if candidates:
+            hits[kind] = set(
+                queryset.filter(serial_normalized__in=candidates).values_list('serial_normalized', flat=True).distinct()
+            )
+            record_hits(kind, candidates, hits[kind])
+    registered, lost, found = hits['device'], hits['lost'], hits['found']
+    return [
+        {
+            'serial': serial,
+            'normalized': value,
+            'registered': value in registered,
+            'lost': value in lost,
+            'found': value in found,
+        }
+        for serial, value in zip(serials, normalized)
+    ]
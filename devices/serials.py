@@ -0,0 +1,15 @@
+import re
+
+_NON_ALNUM = re.compile(r'[^0-9A-Za-z]+')
+
+
+def normalize_serial(value):
+    """Canonical form used for serial lookups: uppercase alphanumerics only.
+
+    "SN-123 abc" and "sn123abc" both normalize to "SN123ABC". Returns None
+    when nothing is left so blank serials never match each other.
+    """
+    if not value:
+        return None
+    normalized = _NON_ALNUM.sub('', str(value)).upper()
+    return normalized or None
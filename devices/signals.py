@@ -0,0 +1,19 @@
+from django.dispatch import Signal
+
+# Sent by devices.matching after Match rows are bulk-inserted, since
+# bulk_create() does not send post_save. Receivers get `matches`, the list
+# of newly created (unsaved-pk) Match instances.
+matches_created = Signal()
+
+# Sent by devices.status.set_status() after a set-based status UPDATE, which
+# bypasses post_save. Receivers get `changes`, a list of (id, old_status)
+# tuples, and `new_status`.
+items_status_changed = Signal()
+
+# Sent by devices.status.bulk_claim_matches() after Return rows are
+# bulk-inserted. Receivers get `returns`, the list of created Returns.
+returns_created = Signal()
+
+# Sent by devices.status after claims flip Match.match_status with UPDATEs.
+# Receivers get `ids`, the matches whose status changed.
+matches_status_changed = Signal()
@@ -0,0 +1,225 @@
+"""Item status state machine.
+
+Every status change goes through set_status, which applies it with one
+UPDATE, writes a StatusTransition per item and sends items_status_changed.
+Claiming an item also claims the items it is serial-matched with, found
+through Match rows (indexed foreign keys) rather than by scanning for the
+serial, so the cost does not depend on how many old reports share it.
+"""
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .matching import SERIAL_MATCH_SCORE
+from .models import LostItem, FoundItem, Match, Return, StatusTransition
+from .signals import items_status_changed, matches_status_changed, returns_created
+
+# previous status -> statuses an item may move to; unlisted statuses are unrestricted
+ALLOWED_TRANSITIONS = {
+    LostItem: {
+        'lost': ['claimed'],
+        'claimed': [],
+        'found': ['claimed'],
+    },
+    FoundItem: {
+        'found': ['claimed'],
+        'claimed': [],
+        'lost': ['claimed'],
+    },
+}
+KINDS = {LostItem: 'lost', FoundItem: 'found'}
+# model -> (other side's model, Match FK to this side, Match FK to the other side)
+COUNTERPARTS = {
+    LostItem: (FoundItem, 'lost_item_id', 'found_item_id'),
+    FoundItem: (LostItem, 'found_item_id', 'lost_item_id'),
+}
+
+
+class ClaimConflict(Exception):
+    """The match, or one of its items, was already claimed or closed."""
+
+
+def transition_allowed(model, previous_status, new_status):
+    allowed = ALLOWED_TRANSITIONS[model]
+    return previous_status not in allowed or new_status in allowed[previous_status]
+
+
+def record_transitions(model, changes, new_status, reason, user=None):
+    """Write StatusTransition rows for (id, old_status) changes in one INSERT."""
+    StatusTransition.objects.bulk_create([
+        StatusTransition(
+            item_kind=KINDS[model], item_id=pk, from_status=old_status, to_status=new_status,
+            reason=reason, user=user,
+        )
+        for pk, old_status in changes
+    ])
+
+
+def set_status(queryset, new_status, reason='update', user=None):
+    """Set `status` on every row of an item queryset with one UPDATE.
+
+    Rows already in new_status are left alone. Returns the number of rows
+    changed, records their transitions and sends items_status_changed so
+    derived counters stay in sync.
+    """
+    model = queryset.model
+    changes = list(queryset.exclude(status=new_status).values_list('id', 'status'))
+    if not changes:
+        return 0
+    with transaction.atomic():
+        model.objects.filter(id__in=[pk for pk, _ in changes]).update(status=new_status, updated_at=timezone.now())
+        record_transitions(model, changes, new_status, reason, user)
+        items_status_changed.send(sender=model, changes=changes, new_status=new_status)
+    return len(changes)
+
+
+def propagate_claim(model, ids, user=None):
+    """Claim the open items that are serial-matched with the given claimed items."""
+    other_model, own_fk, other_fk = COUNTERPARTS[model]
+    # Scored (fuzzy) matches are only suggestions; unscored ones were made by hand
+    other_ids = Match.objects.filter(
+        Q(score=SERIAL_MATCH_SCORE) | Q(score__isnull=True), **{f'{own_fk}__in': ids}, match_status='unclaimed',
+    ).values_list(other_fk, flat=True)
+    return set_status(other_model.objects.filter(id__in=list(other_ids)), 'claimed', reason='match', user=user)
+
+
+def change_status(model, ids, new_status, reason='update', user=None):
+    """set_status for already validated items, claiming their counterparts too."""
+    with transaction.atomic():
+        changed = set_status(model.objects.filter(id__in=ids), new_status, reason=reason, user=user)
+        if new_status == 'claimed' and ids:
+            propagate_claim(model, ids, user)
+    return changed
+
+
+def bulk_set_status(model, ids, new_status, user=None):
+    """Move many items to new_status, checking each against ALLOWED_TRANSITIONS.
+
+    Valid items are updated together with set_status, and claiming also
+    claims their serial-matched counterparts. Returns {id: None on success
+    or an error message}.
+    """
+    rows = dict(model.objects.filter(id__in=ids).values_list('id', 'status'))
+    results = {}
+    valid = []
+    for pk in ids:
+        if pk not in rows:
+            results[pk] = 'Not found.'
+        elif rows[pk] != new_status and not transition_allowed(model, rows[pk], new_status):
+            results[pk] = 'Invalid status transition'
+        else:
+            results[pk] = None
+            valid.append(pk)
+    change_status(model, valid, new_status, reason='bulk', user=user)
+    return results
+
+
+def _full_name(*parts):
+    return ' '.join([p for p in parts if p]) or None
+
+
+def _return_for(lost_item, found_item, user, notes):
+    return Return(
+        lost_item=lost_item,
+        found_item=found_item,
+        owner=lost_item.user,
+        finder=found_item.user,
+        confirmation=True,
+        claimed_by=user,
+        notes=notes,
+        owner_email=lost_item.loster_email,
+        owner_name=_full_name(lost_item.first_name, lost_item.last_name),
+        finder_email=found_item.founder_email,
+        finder_name=_full_name(found_item.reporter_first_name, found_item.reporter_last_name),
+    )
+
+
+def _close_matches(condition):
+    """Close the unclaimed matches meeting `condition`; returns their ids."""
+    # The callers hold the item locks, so the set cannot change in between
+    ids = list(Match.objects.filter(condition, match_status='unclaimed').values_list('id', flat=True))
+    if ids:
+        Match.objects.filter(id__in=ids).update(match_status='closed')
+    return ids
+
+
+def claim_match(match_id, user=None, notes=None):
+    """Claim an unclaimed match and record the Return, safe under concurrent claims.
+
+    Both items are locked (lost, then found, so claims cannot deadlock) and
+    the match is flipped with a conditional UPDATE, so exactly one of any
+    set of competing claims wins; the others raise ClaimConflict and leave
+    nothing behind. Other unclaimed matches of either item are closed in
+    the same transaction. Raises Match.DoesNotExist for unknown ids.
+    """
+    pair = Match.objects.filter(id=match_id).values_list('lost_item_id', 'found_item_id').first()
+    if pair is None:
+        raise Match.DoesNotExist
+    lost_id, found_id = pair
+    with transaction.atomic():
+        lost_item = LostItem.objects.select_for_update().get(id=lost_id)
+        found_item = FoundItem.objects.select_for_update().get(id=found_id)
+        now = timezone.now()
+        if not Match.objects.filter(id=match_id, match_status='unclaimed').update(match_status='claimed', claimed_at=now):
+            raise ClaimConflict('Already claimed')
+        if lost_item.status == 'claimed' or found_item.status == 'claimed':
+            # Another match for one of the items won; undo the UPDATE above
+            raise ClaimConflict('Item already claimed')
+
+        set_status(LostItem.objects.filter(id=lost_id), 'claimed', reason='claim', user=user)
+        set_status(FoundItem.objects.filter(id=found_id), 'claimed', reason='claim', user=user)
+        closed = _close_matches(Q(lost_item_id=lost_id) | Q(found_item_id=found_id))
+        matches_status_changed.send(sender=Match, ids=[match_id, *closed])
+
+        _return_for(lost_item, found_item, user, notes).save()
+    return Match.objects.only(*Match.READ_FIELDS).get(id=match_id)
+
+
+def bulk_claim_matches(match_ids, user=None, notes=None):
+    """Claim many matches at once with set-based UPDATEs and one Return INSERT.
+
+    Same rules and locking order as claim_match. Within the batch the first
+    match listed for an item wins and later ones conflict. Returns
+    {id: None on success or an error message}, in request order.
+    """
+    pairs = {
+        pk: (lost_id, found_id)
+        for pk, lost_id, found_id in Match.objects.filter(id__in=match_ids).values_list('id', 'lost_item_id', 'found_item_id')
+    }
+    results = {pk: 'Not found.' for pk in match_ids if pk not in pairs}
+    with transaction.atomic():
+        lost_items = LostItem.objects.select_for_update().in_bulk(sorted({lost for lost, _ in pairs.values()}))
+        found_items = FoundItem.objects.select_for_update().in_bulk(sorted({found for _, found in pairs.values()}))
+        # Read under the item locks: no other claim can touch these matches now
+        statuses = dict(Match.objects.filter(id__in=list(pairs)).values_list('id', 'match_status'))
+        taken_lost = {pk for pk, item in lost_items.items() if item.status == 'claimed'}
+        taken_found = {pk for pk, item in found_items.items() if item.status == 'claimed'}
+        winners = []
+        for pk in match_ids:
+            if pk not in pairs or pk in results:
+                continue
+            lost_id, found_id = pairs[pk]
+            if statuses[pk] != 'unclaimed':
+                results[pk] = 'Already claimed'
+            elif lost_id in taken_lost or found_id in taken_found:
+                results[pk] = 'Item already claimed'
+            else:
+                results[pk] = None
+                winners.append(pk)
+                taken_lost.add(lost_id)
+                taken_found.add(found_id)
+        if not winners:
+            return {pk: results[pk] for pk in match_ids}
+
+        won_lost = [pairs[pk][0] for pk in winners]
+        won_found = [pairs[pk][1] for pk in winners]
+        Match.objects.filter(id__in=winners, match_status='unclaimed').update(match_status='claimed', claimed_at=timezone.now())
+        set_status(LostItem.objects.filter(id__in=won_lost), 'claimed', reason='claim', user=user)
+        set_status(FoundItem.objects.filter(id__in=won_found), 'claimed', reason='claim', user=user)
+        closed = _close_matches(Q(lost_item_id__in=won_lost) | Q(found_item_id__in=won_found))
+        matches_status_changed.send(sender=Match, ids=[*winners, *closed])
+        returns = Return.objects.bulk_create([
+            _return_for(lost_items[pairs[pk][0]], found_items[pairs[pk][1]], user, notes) for pk in winners
+        ])
+        returns_created.send(sender=Return, returns=returns)
+    return {pk: results[pk] for pk in match_ids}
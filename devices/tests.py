@@ -1,5 +1,6 @@
 from django.test import TestCase, override_settings
 from django.core import mail
+from notifications.outbox import deliver_pending
 from rest_framework.test import APIClient
 from django.contrib.auth import get_user_model
 from .models import LostItem, FoundItem, Match
@@ -23,6 +24,7 @@ class DeviceTests(TestCase):
         response = self.client.post('/api/devices/found/', payload, format='json')
         self.assertEqual(response.status_code, 201)
         self.assertTrue(Match.objects.filter(lost_item=lost).exists())
+        deliver_pending()
         self.assertGreaterEqual(len(mail.outbox), 1)
         # Check subjects to both parties
         subjects = [m.subject for m in mail.outbox]
@@ -42,6 +44,7 @@ class DeviceTests(TestCase):
         self.assertEqual(response.status_code, 201)
         lost_id = response.data.get('id')
         self.assertTrue(Match.objects.filter(lost_item_id=lost_id).exists())
+        deliver_pending()
         self.assertGreaterEqual(len(mail.outbox), 1)
         subjects = [m.subject for m in mail.outbox]
         self.assertTrue(any('Possible Match Found for Your Lost Item' in s for s in subjects))
@@ -73,8 +76,8 @@ class DeviceTests(TestCase):
         Match.objects.create(lost_item=lost, found_item=found, match_status='unclaimed')
         resp = self.client.get('/api/devices/matches/list/')
         self.assertEqual(resp.status_code, 200)
-        self.assertGreaterEqual(len(resp.data), 1)
-        first = resp.data[0]
+        self.assertGreaterEqual(len(resp.data['results']), 1)
+        first = resp.data['results'][0]
         self.assertIn('matched', first)
         matched = first['matched']
         self.assertIn('loster', matched)
@@ -83,3 +86,67 @@ class DeviceTests(TestCase):
         self.assertEqual(matched['founder']['email'], 'bob@example.com')
         self.assertEqual(matched['serial_number'], 'SN-MAC')
         self.assertTrue(matched['device_name'] in ['Macbook Pro', 'Macbook'])
+
+    def test_serial_matching_ignores_case_and_separators(self):
+        FoundItem.objects.create(name='Galaxy', category='Phone', serial_number='sn123abc', status='found')
+        payload = {
+            'title': 'My Galaxy',
+            'category': 'Phone',
+            'serialNumber': 'SN-123 abc',
+        }
+        response = self.client.post('/api/devices/lost/', payload, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(Match.objects.filter(lost_item_id=response.data['id']).exists())
+        self.assertEqual(LostItem.objects.get(id=response.data['id']).serial_normalized, 'SN123ABC')
+
+    def test_device_search_uses_normalized_serial(self):
+        from .models import Device
+        Device.objects.create(user=self.user, serial_number='ab-12 cd', name='Laptop', category='Laptop')
+        resp = self.client.get('/api/devices/search/', {'serial_number': 'AB12CD'})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(resp.data), 1)
+
+    def test_match_creation_is_set_based(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .matching import match_found_item
+
+        def run(serial, candidates):
+            for i in range(candidates):
+                LostItem.objects.create(title=f'Phone {i}', category='Phone', serial_number=serial, status='lost')
+            found = FoundItem.objects.create(name='Phone', category='Phone', serial_number=serial.lower(), status='found')
+            with CaptureQueriesContext(connection) as ctx:
+                lost_items = match_found_item(found)
+            self.assertEqual(len(lost_items), candidates)
+            self.assertEqual(Match.objects.filter(found_item=found).count(), candidates)
+            # re-running is a no-op rather than an IntegrityError
+            match_found_item(found)
+            self.assertEqual(Match.objects.filter(found_item=found).count(), candidates)
+            return len(ctx.captured_queries)
+
+        run('POP-0', 1)  # warm up: first match of the month creates its rollup row
+        self.assertEqual(run('POP-1', 5), run('POP-2', 25))
+
+    def test_lostitem_list_cursor_pagination(self):
+        created = [LostItem.objects.create(title=f'Item {i}', category='Phone').id for i in range(5)]
+        seen = []
+        url = '/api/devices/lost/list/?page_size=2'
+        while url:
+            resp = self.client.get(url)
+            self.assertEqual(resp.status_code, 200)
+            self.assertLessEqual(len(resp.data['results']), 2)
+            seen.extend(item['id'] for item in resp.data['results'])
+            url = resp.data['next']
+        self.assertEqual(seen, list(reversed(created)))
+
+    def test_list_rejects_invalid_cursor(self):
+        resp = self.client.get('/api/devices/found/list/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(resp.status_code, 404)
+
+    def test_list_rejects_tampered_cursor_values(self):
+        from lost_and_found_tracker.pagination import KeysetPagination
+
+        encode = KeysetPagination().encode_cursor
+        for values in (['notadate', 5], ['2025-01-01T00:00:00+00:00', 'abc'], [{'a': 1}, 1], [None, 1]):
+            resp = self.client.get('/api/devices/lost/list/', {'cursor': encode(values)})
+            self.assertEqual(resp.status_code, 404, values)
@@ -0,0 +1,129 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from .bloom import KINDS, BloomFilter, SerialFilter, get_filter, possible_serials, serial_lookup
+from .matching import match_found_item
+from .models import Device, LostItem, FoundItem, Match
+
+
+class BloomFilterTests(TestCase):
+    def test_no_false_negatives_and_bounded_false_positives(self):
+        bloom = BloomFilter.for_capacity(2000, error_rate=0.01)
+        for i in range(2000):
+            bloom.add(f'SN{i}')
+        self.assertTrue(all(f'SN{i}' in bloom for i in range(2000)))
+        false_positives = sum(f'OTHER{i}' in bloom for i in range(10000))
+        self.assertLess(false_positives / 10000, 0.03)
+        self.assertAlmostEqual(bloom.expected_error_rate(), 0.01, delta=0.005)
+
+
+@override_settings(SERIAL_BLOOM_ENABLED=True)
+class SerialFilterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        for kind in KINDS:
+            get_filter(kind).reset()
+        self.owner = get_user_model().objects.create_user(email='owner@example.com', username='owner', password='pass')
+        Device.objects.create(user=self.owner, serial_number='REG1', name='Laptop', category='Laptop')
+
+    def test_unknown_serial_skips_the_database(self):
+        self.client.get('/api/devices/search/', {'serial_number': 'warmup'})
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.get('/api/devices/search/', {'serial_number': 'NOPE42'})
+        self.assertEqual((resp.status_code, resp.json(), len(queries)), (200, [], 0))
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.get('/api/devices/search/', {'serial_number': 'reg-1'})
+        self.assertEqual(len(resp.json()), 1)
+        self.assertEqual(len(queries), 1)
+
+    def test_saved_serials_are_added(self):
+        self.assertFalse(get_filter('lost').might_contain('NEW1'))
+        lost = LostItem.objects.create(title='Phone', category='Phone', serial_number='new-1')
+        found = FoundItem.objects.create(name='Phone', category='Phone', serial_number='NEW1')
+        self.assertEqual(match_found_item(found), [lost])
+        self.assertTrue(Match.objects.filter(lost_item=lost, found_item=found).exists())
+
+    def test_other_processes_replay_the_cache_log(self):
+        other = SerialFilter('device')
+        self.assertFalse(other.might_contain('LATER1'))
+        with self.captureOnCommitCallbacks(execute=True):
+            Device.objects.create(user=self.owner, serial_number='LATER1', name='Phone', category='Phone')
+        self.assertTrue(other.might_contain('LATER1'))
+        # An expired log entry forces a rebuild from the database
+        with self.captureOnCommitCallbacks(execute=True):
+            Device.objects.create(user=self.owner, serial_number='LATER2', name='Phone', category='Phone')
+        cache.delete_many([other._log_key(g) for g in range(1, 10)])
+        self.assertTrue(other.might_contain('LATER2'))
+
+    def test_serials_are_published_on_commit(self):
+        here, other = get_filter('device'), SerialFilter('device')
+        here.might_contain('warmup')
+        other.might_contain('warmup')
+        with self.captureOnCommitCallbacks() as callbacks:
+            Device.objects.create(user=self.owner, serial_number='PENDING1', name='Phone', category='Phone')
+            # Visible to this process's later lookups, not yet to others'
+            self.assertTrue(here.might_contain('PENDING1'))
+            self.assertFalse(other.might_contain('PENDING1'))
+            self.assertIsNone(cache.get(here._generation_key))
+        for callback in callbacks:
+            callback()
+        self.assertTrue(other.might_contain('PENDING1'))
+
+    def test_batch_lookup_syncs_once(self):
+        possible_serials('device', ['warmup'])
+        serials = [f'CHK{i}' for i in range(1000)] + ['REG1']
+        with mock.patch('devices.bloom.cache', mock.Mock(wraps=cache)) as shared:
+            self.assertEqual(possible_serials('device', serials), {'REG1'})
+        self.assertEqual(len(shared.mock_calls), 1)
+
+    def test_lost_generation_counter_never_hides_serials(self):
+        other = SerialFilter('device')
+        with self.captureOnCommitCallbacks(execute=True):
+            Device.objects.create(user=self.owner, serial_number='BEFORE1', name='Phone', category='Phone')
+        self.assertTrue(other.might_contain('BEFORE1'))
+        # The cache restarts; the next writes must not reuse generations `other` already replayed
+        cache.delete(other._generation_key)
+        with self.captureOnCommitCallbacks(execute=True):
+            for n in range(3):
+                Device.objects.create(user=self.owner, serial_number=f'AFTER{n}', name='Phone', category='Phone')
+        self.assertEqual(other.might_contain_many(['AFTER0', 'AFTER1', 'AFTER2']), {'AFTER0', 'AFTER1', 'AFTER2'})
+
+    def test_snapshot_is_memory_mapped(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        out = StringIO()
+        call_command('rebuild_serial_filter', 'device', dir=directory, stdout=out)
+        self.assertIn('device: 1 serials', out.getvalue())
+        path = os.path.join(directory, 'serials-device.bloom')
+        before = open(path, 'rb').read()
+        with override_settings(SERIAL_BLOOM_SNAPSHOT_DIR=directory):
+            worker = SerialFilter('device')
+            self.assertTrue(worker.might_contain('REG1'))
+            self.assertIsNotNone(worker._mmap)
+            with self.captureOnCommitCallbacks(execute=True):
+                Device.objects.create(user=self.owner, serial_number='AFTER1', name='Phone', category='Phone')
+            self.assertTrue(worker.might_contain('AFTER1'))
+        self.assertEqual(open(path, 'rb').read(), before)
+
+    def test_false_positive_metrics(self):
+        serial_filter = get_filter('device')
+        serial_lookup('device', Device.objects.all(), 'NOPE1')
+        serial_lookup('device', Device.objects.all(), 'REG1')
+        # Pretend the filter let a missing serial through
+        serial_filter.record(False)
+        stats = serial_filter.stats()
+        self.assertEqual((stats['negative'], stats['positive'], stats['false_positive']), (1, 1, 1))
+        self.assertEqual(stats['false_positive_rate'], 0.5)
+        out = StringIO()
+        call_command('rebuild_serial_filter', 'device', stats=True, stdout=out)
+        self.assertIn('1 false positives', out.getvalue())
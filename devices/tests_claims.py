@@ -0,0 +1,171 @@
+import threading
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from .models import LostItem, FoundItem, Match, Return
+
+CLAIM_URL = '/api/devices/matches/claim/'
+BULK_CLAIM_URL = '/api/devices/matches/claim/bulk/'
+
+
+class ClaimMatchTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email='owner@example.com', username='owner', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.lost = LostItem.objects.create(title='Phone', category='Phone', first_name='Ann', loster_email='ann@example.com')
+        self.found = FoundItem.objects.create(name='Phone', category='Phone', founder_email='finder@example.com')
+        self.match = Match.objects.create(lost_item=self.lost, found_item=self.found)
+
+    def test_claim_updates_items_and_records_return(self):
+        resp = self.client.post(CLAIM_URL, {'match_id': self.match.id, 'notes': 'ID checked'}, format='json')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data['match_status'], 'claimed')
+        self.match.refresh_from_db()
+        self.assertIsNotNone(self.match.claimed_at)
+        self.assertEqual(LostItem.objects.get(id=self.lost.id).status, 'claimed')
+        self.assertEqual(FoundItem.objects.get(id=self.found.id).status, 'claimed')
+        ret = Return.objects.get()
+        self.assertEqual((ret.owner_name, ret.finder_email, ret.claimed_by, ret.notes), ('Ann', 'finder@example.com', self.user, 'ID checked'))
+
+    def test_second_claim_is_rejected(self):
+        self.client.post(CLAIM_URL, {'match_id': self.match.id}, format='json')
+        resp = self.client.post(CLAIM_URL, {'match_id': self.match.id}, format='json')
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(Return.objects.count(), 1)
+
+    def test_conflicting_matches_are_closed(self):
+        other_found = FoundItem.objects.create(name='Phone', category='Phone')
+        other_lost = LostItem.objects.create(title='Phone', category='Phone')
+        sibling = Match.objects.create(lost_item=self.lost, found_item=other_found)
+        rival = Match.objects.create(lost_item=other_lost, found_item=self.found)
+        unrelated = Match.objects.create(lost_item=other_lost, found_item=other_found)
+        self.client.post(CLAIM_URL, {'match_id': self.match.id}, format='json')
+        statuses = dict(Match.objects.values_list('id', 'match_status'))
+        self.assertEqual(statuses[sibling.id], 'closed')
+        self.assertEqual(statuses[rival.id], 'closed')
+        self.assertEqual(statuses[unrelated.id], 'unclaimed')
+        resp = self.client.post(CLAIM_URL, {'match_id': sibling.id}, format='json')
+        self.assertEqual(resp.status_code, 400)
+
+    def test_unknown_match(self):
+        self.assertEqual(self.client.post(CLAIM_URL, {'match_id': 999}, format='json').status_code, 404)
+        self.assertEqual(self.client.post(CLAIM_URL, {'match_id': 'abc'}, format='json').status_code, 404)
+        self.assertEqual(self.client.post(CLAIM_URL, {}, format='json').status_code, 400)
+
+
+class BulkEndpointTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.authority = User.objects.create_user(email='police@example.com', username='police', password='pass', role='authority')
+        self.client = APIClient()
+        self.client.force_authenticate(self.authority)
+
+    def _pairs(self, n, prefix='P'):
+        return [
+            Match.objects.create(
+                lost_item=LostItem.objects.create(title='Phone', category='Phone', first_name=f'{prefix}{i}'),
+                found_item=FoundItem.objects.create(name='Phone', category='Phone'),
+            )
+            for i in range(n)
+        ]
+
+    def test_bulk_claim_reports_per_match_results(self):
+        good, taken = self._pairs(2)
+        rival = Match.objects.create(lost_item=good.lost_item, found_item=FoundItem.objects.create(name='Phone', category='Phone'))
+        self.client.post(BULK_CLAIM_URL, {'ids': [taken.id]}, format='json')
+        resp = self.client.post(BULK_CLAIM_URL, {'ids': [good.id, rival.id, taken.id, 999], 'notes': 'batch'}, format='json')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data['updated'], 1)
+        self.assertEqual([(r['id'], r['ok'], r.get('detail')) for r in resp.data['results']], [
+            (good.id, True, None),
+            (rival.id, False, 'Item already claimed'),
+            (taken.id, False, 'Already claimed'),
+            (999, False, 'Not found.'),
+        ])
+        self.assertEqual(Match.objects.get(id=rival.id).match_status, 'closed')
+        self.assertEqual(Return.objects.filter(notes='batch').get().owner_name, 'P0')
+        self.assertEqual(LostItem.objects.get(id=good.lost_item_id).status, 'claimed')
+
+    def test_bulk_claim_query_count_does_not_grow(self):
+        def run(matches):
+            with CaptureQueriesContext(connection) as queries:
+                resp = self.client.post(BULK_CLAIM_URL, {'ids': [m.id for m in matches]}, format='json')
+            self.assertEqual(resp.data['updated'], len(matches))
+            return len(queries)
+
+        run(self._pairs(1, 'W'))  # first-month rollup rows
+        self.assertEqual(run(self._pairs(3, 'A')), run(self._pairs(12, 'B')))
+        self.assertEqual(Return.objects.count(), 16)
+
+    def test_bulk_status_validates_transitions(self):
+        open_item = LostItem.objects.create(title='Phone', category='Phone', serial_number='SN1')
+        closed = LostItem.objects.create(title='Phone', category='Phone', status='claimed')
+        counterpart = FoundItem.objects.create(name='Phone', category='Phone', serial_number='SN1')
+        Match.objects.create(lost_item=open_item, found_item=counterpart, score=1.0)
+        resp = self.client.patch('/api/devices/lost/bulk/', {'ids': [open_item.id, closed.id], 'status': 'claimed'}, format='json')
+        self.assertEqual(resp.data['updated'], 2)
+        self.assertEqual(LostItem.objects.get(id=open_item.id).status, 'claimed')
+        self.assertEqual(FoundItem.objects.get(id=counterpart.id).status, 'claimed')
+        resp = self.client.patch('/api/devices/found/bulk/', {'ids': [counterpart.id], 'status': 'found'}, format='json')
+        self.assertEqual(resp.data['results'], [{'id': counterpart.id, 'ok': False, 'detail': 'Invalid status transition'}])
+        self.assertEqual(FoundItem.objects.get(id=counterpart.id).status, 'claimed')
+
+    def test_bulk_requests_are_validated_and_restricted(self):
+        self.assertEqual(self.client.patch('/api/devices/lost/bulk/', {'ids': [], 'status': 'claimed'}, format='json').status_code, 400)
+        self.assertEqual(self.client.patch('/api/devices/lost/bulk/', {'ids': [1]}, format='json').status_code, 400)
+        self.assertEqual(self.client.post(BULK_CLAIM_URL, {'ids': 'x'}, format='json').status_code, 400)
+        user = get_user_model().objects.create_user(email='u@example.com', username='u', password='pass')
+        self.client.force_authenticate(user)
+        self.assertEqual(self.client.post(BULK_CLAIM_URL, {'ids': [1]}, format='json').status_code, 403)
+
+
+class ConcurrentClaimTests(TransactionTestCase):
+    threads = 8
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email='owner@example.com', username='owner', password='pass')
+        self.lost = LostItem.objects.create(title='Phone', category='Phone')
+        # Several candidate matches for the same lost item
+        self.matches = [
+            Match.objects.create(lost_item=self.lost, found_item=FoundItem.objects.create(name='Phone', category='Phone'))
+            for _ in range(4)
+        ]
+
+    def _hammer(self, match_ids):
+        barrier = threading.Barrier(len(match_ids))
+        codes = []
+
+        def claim(match_id):
+            client = APIClient()
+            client.force_authenticate(self.user)
+            barrier.wait()
+            try:
+                codes.append(client.post(CLAIM_URL, {'match_id': match_id}, format='json').status_code)
+            finally:
+                connection.close()
+
+        workers = [threading.Thread(target=claim, args=(match_id,)) for match_id in match_ids]
+        # Losing claims log their 400s
+        with self.assertLogs('django.request', 'WARNING'):
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+        return sorted(codes)
+
+    def test_same_match_claimed_once(self):
+        codes = self._hammer([self.matches[0].id] * self.threads)
+        self.assertEqual(codes, [200] + [400] * (self.threads - 1))
+        self.assertEqual(Return.objects.count(), 1)
+
+    def test_competing_matches_for_one_item(self):
+        codes = self._hammer([m.id for m in self.matches] * 2)
+        self.assertEqual(codes.count(200), 1)
+        self.assertEqual(Return.objects.count(), 1)
+        self.assertEqual(Match.objects.filter(match_status='claimed').count(), 1)
+        self.assertEqual(Match.objects.filter(match_status='closed').count(), len(self.matches) - 1)
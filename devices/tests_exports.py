@@ -0,0 +1,48 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from .models import LostItem, FoundItem
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        User = get_user_model()
+        self.authority = User.objects.create_user(email='police@example.com', username='police', password='pass', role='authority')
+        self.regular = User.objects.create_user(email='user@example.com', username='user', password='pass')
+        LostItem.objects.create(title='Phone', category='Phone', serial_number='L1', status='lost')
+        LostItem.objects.create(title='Laptop', category='Laptop', serial_number='L2', status='claimed')
+        FoundItem.objects.create(name='Tablet', category='Tablet', serial_number='F1')
+
+    def _content(self, response):
+        return b''.join(response.streaming_content).decode()
+
+    def test_ndjson_export_streams_filtered_rows(self):
+        self.client.force_authenticate(self.authority)
+        resp = self.client.get('/api/devices/export/lost/', {'format': 'ndjson', 'status': 'lost'})
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.streaming)
+        rows = [json.loads(line) for line in self._content(resp).splitlines()]
+        self.assertEqual([row['serial_number'] for row in rows], ['L1'])
+
+    def test_csv_export_has_header_and_rows(self):
+        self.client.force_authenticate(self.authority)
+        resp = self.client.get('/api/devices/export/found/', {'format': 'csv'})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp['Content-Type'], 'text/csv')
+        lines = self._content(resp).strip().splitlines()
+        self.assertTrue(lines[0].startswith('id,name,category'))
+        self.assertEqual(len(lines), 2)
+
+    def test_export_requires_authority(self):
+        self.client.force_authenticate(self.regular)
+        resp = self.client.get('/api/devices/export/lost/')
+        self.assertEqual(resp.status_code, 403)
+
+    def test_export_rejects_bad_input(self):
+        self.client.force_authenticate(self.authority)
+        self.assertEqual(self.client.get('/api/devices/export/users/').status_code, 404)
+        self.assertEqual(self.client.get('/api/devices/export/lost/', {'date_from': '2025/01/01'}).status_code, 400)
@@ -0,0 +1,113 @@
+from datetime import date, time
+from importlib import import_module
+from io import StringIO
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from . import fast_serializers as fast
+from .Serializers import LostItemSerializer, FoundItemSerializer, MatchSerializer
+from .models import LostItem, FoundItem, Match
+
+
+class FastSerializerTests(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user(email='owner@example.com', username='owner', password='pass')
+        self.lost = LostItem.objects.create(
+            title='Phone', category='Phone', serial_number='SN1', user=user, date_found=date(2024, 5, 1),
+            time_found=time(14, 30), first_name='Ann', last_name='Lee', loster_email='ann@example.com',
+        )
+        LostItem.objects.create(title='Bag', category='Bag')
+        # Stored file names, without uploading anything
+        LostItem.objects.filter(id=self.lost.id).update(image='lost_item_images/phone.jpg')
+        self.found = FoundItem.objects.create(
+            name='Phone', category='Phone', serial_number='SN1', reporter_first_name='Bob', district='Gasabo',
+        )
+        FoundItem.objects.filter(id=self.found.id).update(device_image='device_images/phone.jpg')
+        FoundItem.objects.create(name='Keys', category='Other')
+        Match.objects.create(lost_item=self.lost, found_item=self.found, score=0.75)
+
+    def _same(self, serializer, model_serializer, queryset):
+        queryset = queryset.order_by('id')
+        self.assertEqual(
+            serializer.serialize(serializer.values(queryset)),
+            model_serializer(queryset, many=True).data,
+        )
+
+    def test_output_matches_model_serializers(self):
+        self._same(fast.lost_items, LostItemSerializer, LostItem.objects.all())
+        self._same(fast.found_items, FoundItemSerializer, FoundItem.objects.all())
+        self._same(fast.matches, MatchSerializer, Match.objects.select_related('lost_item', 'found_item'))
+        with timezone.override('Africa/Kigali'):
+            self._same(fast.lost_items, LostItemSerializer, LostItem.objects.all())
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command('benchmark_serializers', rows=20, repeat=1, stdout=out)
+        self.assertEqual(len(out.getvalue().splitlines()), 4)
+        self.assertEqual(LostItem.objects.count(), 2)
+
+    def test_list_endpoints_and_search_keep_their_shape(self):
+        client = APIClient()
+        resp = client.get('/api/devices/lost/list/', {'page_size': 1})
+        self.assertEqual(resp.data['results'], LostItemSerializer(LostItem.objects.order_by('-id')[:1], many=True).data)
+        resp = client.get(resp.data['next'])
+        self.assertEqual(resp.data['results'][0]['id'], self.lost.id)
+        resp = client.get('/api/devices/found/search/', {'serial_number': 'sn1'})
+        self.assertEqual(resp.data['results'], FoundItemSerializer(FoundItem.objects.filter(id=self.found.id), many=True).data)
+        resp = client.get('/api/devices/matches/list/')
+        self.assertEqual(resp.data['results'][0]['matched']['loster']['name'], 'Ann Lee')
+
+    def test_matched_comes_from_snapshot_columns(self):
+        match = Match.objects.get()
+        self.assertEqual((match.loster_name, match.founder_name, match.serial_number), ('Ann Lee', 'Bob', 'SN1'))
+        # Later edits to the reports do not rewrite what the match recorded
+        LostItem.objects.filter(id=self.lost.id).update(first_name='Changed')
+        with CaptureQueriesContext(connection) as queries:
+            resp = APIClient().get('/api/devices/matches/list/')
+        self.assertEqual(resp.data['results'][0]['matched']['loster']['name'], 'Ann Lee')
+        self.assertFalse([q for q in queries if 'devices_lostitem' in q['sql'] or 'devices_founditem' in q['sql']])
+        self.assertEqual(MatchSerializer(Match.objects.get()).data['matched'], resp.data['results'][0]['matched'])
+
+    def test_backfill_migration_fills_missing_snapshots(self):
+        backfill = import_module('devices.migrations.0025_backfill_match_snapshots').backfill_match_snapshots
+        Match.objects.update(**{field: None for field in Match.SNAPSHOT_FIELDS})
+        backfill(apps, None)
+        match = Match.objects.get()
+        self.assertEqual((match.loster_email, match.device_name, match.serial_number), ('ann@example.com', 'Phone', 'SN1'))
+
+    def test_sparse_fieldsets_select_only_requested_columns(self):
+        client = APIClient()
+        with CaptureQueriesContext(connection) as queries:
+            resp = client.get('/api/devices/lost/list/', {'fields': 'id,title,image', 'page_size': 1})
+        self.assertEqual(list(resp.data['results'][0]), ['id', 'title', 'image'])
+        self.assertNotIn('additional_info', queries[-1]['sql'])
+        self.assertNotIn('loster_email', queries[-1]['sql'])
+        # Pagination still works without the cursor columns in the response
+        resp = client.get(resp.data['next'])
+        full = LostItemSerializer(LostItem.objects.get(id=self.lost.id)).data
+        self.assertEqual(resp.data['results'], [{key: full[key] for key in ('id', 'title', 'image')}])
+
+        resp = client.get('/api/devices/found/list/', {'view': 'card'})
+        self.assertEqual(list(resp.data['results'][0]), ['id', 'name', 'category', 'province', 'district', 'deviceimage'])
+        resp = client.get('/api/devices/matches/list/', {'fields': 'matched'})
+        self.assertEqual(resp.data['results'], [{'matched': MatchSerializer(Match.objects.get()).data['matched']}])
+        resp = client.get('/api/devices/found/search/', {'q': 'phone', 'fields': 'name'})
+        self.assertEqual(resp.status_code, 200)
+
+    def test_fields_spanning_lost_and_found_items(self):
+        resp = APIClient().get('/api/devices/search/serial/', {'serial_number': 'SN1', 'fields': 'title,name'})
+        self.assertEqual(resp.data, {'lost_items': [{'title': 'Phone'}], 'found_items': [{'name': 'Phone'}]})
+
+    def test_unknown_fields_and_views_are_rejected(self):
+        client = APIClient()
+        resp = client.get('/api/devices/lost/list/', {'fields': 'id,password'})
+        self.assertEqual((resp.status_code, resp.data['fields']), (400, ['Unknown fields: password']))
+        resp = client.get('/api/devices/matches/list/', {'view': 'tiny'})
+        self.assertEqual(resp.status_code, 400)
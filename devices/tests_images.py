@@ -0,0 +1,111 @@
+import os
+import random
+import tempfile
+from io import BytesIO, StringIO
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+from PIL import Image, ImageDraw
+
+from .fuzzy import fuzzy_match_lost_item
+from .imagehash import MultiIndexHashTable, dhash, get_index, hamming, hash_source
+from .models import LostItem, FoundItem, Match
+
+
+def _photo(seed=0, size=(320, 240)):
+    rng = random.Random(seed)
+    image = Image.new('RGB', size, 'white')
+    draw = ImageDraw.Draw(image)
+    for _ in range(12):
+        x, y = rng.randrange(size[0]), rng.randrange(size[1])
+        color = tuple(rng.randrange(256) for _ in range(3))
+        draw.rectangle([x, y, x + rng.randrange(20, 120), y + rng.randrange(20, 120)], fill=color)
+    return image
+
+
+def _jpeg(image, **kwargs):
+    buf = BytesIO()
+    image.save(buf, 'JPEG', **kwargs)
+    buf.seek(0)
+    return buf
+
+
+class DHashTests(TestCase):
+    def test_resized_and_recompressed_copy_is_close(self):
+        original = dhash(_photo())
+        copy = dhash(_jpeg(_photo().resize((160, 120)), quality=40))
+        self.assertLessEqual(hamming(original, copy), 6)
+        self.assertGreater(hamming(original, dhash(_photo(seed=1))), 16)
+        self.assertEqual(len(original), 16)
+
+    def test_hash_table_matches_brute_force(self):
+        rng = random.Random(3)
+        values = [rng.getrandbits(64) for _ in range(2000)]
+        # A cluster around values[0], spread over every slice
+        values += [values[0] ^ (1 << rng.randrange(64)) ^ (1 << rng.randrange(64)) for _ in range(50)]
+        table = MultiIndexHashTable()
+        for key, value in enumerate(values):
+            table.add(value, key)
+        table.discard(1)
+        query = values[0] ^ 0b1011  # three bits away from an entry
+        for radius in (0, 3, 7, 12):
+            expected = sorted(
+                (bin(v ^ query).count('1'), k) for k, v in enumerate(values)
+                if k != 1 and bin(v ^ query).count('1') <= radius
+            )
+            self.assertEqual(sorted(table.search(query, radius)), expected)
+        self.assertIn((3, 0), table.search(query, 3))
+
+
+class ImageIndexTests(TestCase):
+    def setUp(self):
+        get_index('found').reset()
+        self.near = dhash(_photo())
+
+    def _found(self, image_hash, **kwargs):
+        item = FoundItem.objects.create(name='Phone', category='Phone', **kwargs)
+        FoundItem.objects.filter(id=item.id).update(image_hash=image_hash)
+        item.image_hash = image_hash
+        return item
+
+    def test_index_follows_saves_and_status(self):
+        item = self._found(self.near)
+        index = get_index('found')
+        self.assertEqual(index.search(self.near), [(0, item.id)])
+        item.status = 'claimed'
+        item.save()
+        self.assertEqual(index.search(self.near), [])
+
+    def test_upload_is_hashed_once(self):
+        field = FoundItem._meta.get_field('device_image')
+        upload = SimpleUploadedFile('phone.jpg', _jpeg(_photo()).read(), content_type='image/jpeg')
+        with mock.patch.object(field.storage, 'save', return_value='found_item_images/phone.jpg'):
+            item = FoundItem.objects.create(name='Phone', category='Phone', device_image=upload)
+        self.assertLessEqual(hamming(item.image_hash, self.near), 6)
+        item.name = 'Black phone'
+        item.save()
+        item.refresh_from_db()
+        self.assertIsNotNone(item.image_hash)
+
+    def test_similar_photo_feeds_match_candidates(self):
+        # Reported in another district, so only the photo links the two
+        found = self._found(self.near, district='Huye')
+        lost = LostItem.objects.create(title='Phone', category='Phone', city_town='Gasabo')
+        lost.image_hash = dhash(_jpeg(_photo(), quality=50))
+        results = fuzzy_match_lost_item(lost)
+        self.assertEqual([item.id for item, _ in results], [found.id])
+        self.assertGreaterEqual(Match.objects.get(lost_item=lost, found_item=found).score, 0.8)
+
+    def test_hash_images_command(self):
+        item = FoundItem.objects.create(name='Phone', category='Phone')
+        FoundItem.objects.filter(id=item.id).update(device_image='found_item_images/phone.jpg')
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'phone.jpg')
+            _photo().save(path, 'JPEG')
+            self.assertEqual(hash_source((item.id, path)), (item.id, dhash(path)))
+            with mock.patch('devices.management.commands.hash_images._location', return_value=path):
+                call_command('hash_images', 'found', workers=2, stdout=StringIO())
+        item.refresh_from_db()
+        self.assertEqual(item.image_hash, dhash(_photo()))
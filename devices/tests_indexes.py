@@ -0,0 +1,98 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from authentication.models import VerificationCode
+from notifications.models import Notification
+from .models import LostItem, FoundItem
+
+ROWS = 3000
+STATUSES = ('lost', 'found', 'claimed', 'returned')
+
+
+def plan(sql):
+    """The database's plan for `sql`, one line per node."""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+            return '\n'.join(row[-1] for row in cursor.fetchall())
+        cursor.execute('EXPLAIN ' + sql)
+        return '\n'.join(row[0] for row in cursor.fetchall())
+
+
+def full_scans(text, table):
+    if connection.vendor == 'sqlite':
+        return [line for line in text.splitlines() if re.search(rf'\bSCAN {table}\b(?! USING (COVERING )?INDEX)', line)]
+    return [line for line in text.splitlines() if f'Seq Scan on {table}' in line]
+
+
+def filtered_by_index(text, table):
+    if connection.vendor == 'sqlite':
+        return f'SEARCH {table} USING' in text
+    return 'Index Cond' in text and not full_scans(text, table)
+
+
+class IndexPlanTests(TestCase):
+    """Hot view queries must be answered from an index on a large table."""
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        User.objects.bulk_create([
+            User(email=f'user{i}@example.com', username=f'user{i}') for i in range(ROWS // 10)
+        ])
+        users = list(User.objects.order_by('id'))
+        cls.user = users[0]
+        LostItem.objects.bulk_create([
+            LostItem(
+                title=f'Item {i}', category='Phone', status=STATUSES[i % 4],
+                loster_email=f'user{i % len(users)}@example.com', serial_number=f'SN{i}',
+            ) for i in range(ROWS)
+        ])
+        FoundItem.objects.bulk_create([
+            FoundItem(
+                name=f'Item {i}', category='Phone', status=STATUSES[i % 4],
+                founder_email=f'user{i % len(users)}@example.com', serial_number=f'SN{i}',
+            ) for i in range(ROWS)
+        ])
+        Notification.objects.bulk_create([
+            Notification(user=users[i % len(users)], message='m', is_read=bool(i % 2)) for i in range(ROWS)
+        ])
+        VerificationCode.objects.bulk_create([
+            VerificationCode(user=users[i % len(users)], code=f'{i:06d}') for i in range(ROWS)
+        ])
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def assert_indexed(self, method, url, table, data=None, user=None):
+        client = APIClient()
+        if user is not None:
+            client.force_authenticate(user)
+        with CaptureQueriesContext(connection) as queries:
+            resp = getattr(client, method)(url, data, format='json' if method == 'post' else None)
+        self.assertLess(resp.status_code, 500)
+        selects = [q['sql'] for q in queries if q['sql'].startswith('SELECT') and f'"{table}"' in q['sql']]
+        self.assertTrue(selects, f'{url} did not read {table}')
+        for sql in selects:
+            text = plan(sql)
+            self.assertFalse(full_scans(text, table), f'{url}: full scan of {table}\n{sql}\n{text}')
+            if ' WHERE ' in sql:
+                self.assertTrue(filtered_by_index(text, table), f'{url}: {table} filter not indexed\n{sql}\n{text}')
+
+    def test_item_views_filter_through_indexes(self):
+        for kind, table in (('lost', 'devices_lostitem'), ('found', 'devices_founditem')):
+            self.assert_indexed('get', f'/api/devices/{kind}/filter/?status=claimed', table)
+            self.assert_indexed('get', f'/api/devices/{kind}/search/?status=claimed&page_size=20', table)
+            self.assert_indexed('get', f'/api/devices/{kind}/by-email/?email=user7@example.com', table)
+            self.assert_indexed('get', f'/api/devices/{kind}/list/?page_size=20', table)
+
+    def test_notification_and_verification_lookups(self):
+        self.assert_indexed('get', '/api/notifications/', 'notifications_notification', user=self.user)
+        self.assert_indexed(
+            'post', '/api/auth/verify-email/', 'authentication_verificationcode',
+            data={'email': self.user.email, 'code': '000000'},
+        )
@@ -0,0 +1,189 @@
+import json
+import os
+import tempfile
+from datetime import timedelta
+from importlib import import_module
+
+from django.apps import apps
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from io import StringIO
+
+from .blocking import block_key
+from .fuzzy import fuzzy_match_lost_item, fuzzy_match_found_item
+from .models import LostItem, FoundItem, Match
+
+
+class BlockKeyTests(TestCase):
+    def test_block_key_normalizes_category_and_region(self):
+        self.assertEqual(block_key('Phone', '  Kigali City '), 'phone|kigali city')
+        self.assertEqual(block_key('phone', 'KIGALI-CITY'), 'phone|kigali city')
+        self.assertEqual(block_key('Phone', None), 'phone|')
+
+    def test_block_follows_region_edits(self):
+        item = FoundItem.objects.create(name='Watch', category='Smartwatch', district='Gasabo', province='Kigali')
+        self.assertEqual(item.match_block, 'smartwatch|kigali')
+        item.province = 'Southern'
+        item.save(update_fields=['province'])
+        item.refresh_from_db()
+        self.assertEqual(item.match_block, 'smartwatch|southern')
+
+
+class FuzzyMatchingTests(TestCase):
+    def setUp(self):
+        self.lost = LostItem.objects.create(
+            title='Galaxy Buds', brand='Samsung', category='Earbuds / Headphones',
+            city_town='Kigali', state='Kigali', additional_info='white charging case',
+        )
+
+    def _found(self, **kwargs):
+        fields = {'name': 'Samsung Galaxy Buds', 'category': 'Earbuds / Headphones', 'district': 'Gasabo',
+                  'province': 'Kigali', 'description': 'white case'}
+        fields.update(kwargs)
+        return FoundItem.objects.create(**fields)
+
+    def test_similar_report_in_block_is_matched_with_score(self):
+        found = self._found()
+        results = fuzzy_match_found_item(found)
+        self.assertEqual([item.id for item, _ in results], [self.lost.id])
+        match = Match.objects.get(lost_item=self.lost, found_item=found)
+        self.assertGreaterEqual(match.score, 0.5)
+        self.assertLess(match.score, 1.0)
+        self.assertEqual(match.match_status, 'unclaimed')
+
+    def test_city_and_district_reports_share_a_block(self):
+        # The lost report names the city, the found report its district
+        lost = self.client.post('/api/devices/lost/', {
+            'title': 'iPhone 12', 'brand': 'Apple', 'category': 'Phone', 'cityTown': 'Kigali', 'state': 'Kigali',
+            'additionalInfo': 'blue case',
+        }, format='json')
+        found = self.client.post('/api/devices/found/', {
+            'name': 'Apple iPhone 12', 'category': 'Phone', 'district': 'Gasabo', 'province': 'Kigali',
+            'description': 'blue case',
+        }, format='json')
+        self.assertEqual((lost.status_code, found.status_code), (201, 201))
+        self.assertTrue(Match.objects.filter(lost_item_id=lost.data['id'], found_item_id=found.data['id']).exists())
+
+    def test_other_blocks_and_dates_are_not_compared(self):
+        self._found(province='Southern', district='Huye')
+        self._found(category='Phone')
+        old = self._found()
+        FoundItem.objects.filter(id=old.id).update(date_reported=timezone.now() - timedelta(days=90))
+        self.assertEqual(fuzzy_match_lost_item(self.lost), [])
+
+    def test_conflicting_serial_rules_pair_out(self):
+        self.lost.serial_number = 'AAA111'
+        self.lost.save()
+        self._found(serial_number='BBB222')
+        self.assertEqual(fuzzy_match_lost_item(self.lost), [])
+
+    def test_results_are_ranked_and_weak_ones_dropped(self):
+        weak = self._found(name='Earphones', description='black', district='Huye')
+        strong = self._found()
+        results = fuzzy_match_lost_item(self.lost)
+        self.assertEqual([item.id for item, _ in results], [strong.id])
+        self.assertFalse(Match.objects.filter(found_item=weak).exists())
+
+    def test_create_view_writes_fuzzy_matches(self):
+        resp = self.client.post('/api/devices/found/', {
+            'name': 'Galaxy Buds', 'category': 'Earbuds / Headphones', 'district': 'Gasabo',
+            'province': 'Kigali', 'description': 'Samsung, white case',
+        })
+        self.assertEqual(resp.status_code, 201)
+        self.assertTrue(Match.objects.filter(lost_item=self.lost, found_item_id=resp.data['id']).exists())
+
+    @override_settings(FUZZY_MATCH_CANDIDATE_LIMIT=10)
+    def test_cost_is_bounded_as_tables_grow(self):
+        def run():
+            with CaptureQueriesContext(connection) as queries:
+                fuzzy_match_lost_item(self.lost)
+            return len(queries)
+
+        FoundItem.objects.bulk_create([
+            FoundItem(name='Buds', category='Earbuds / Headphones', district='Gasabo',
+                      match_block=block_key('Earbuds / Headphones', 'Kigali'))
+            for _ in range(5)
+        ])
+        small = run()
+        FoundItem.objects.bulk_create([
+            FoundItem(name='Buds', category='Earbuds / Headphones', district='Gasabo',
+                      match_block=block_key('Earbuds / Headphones', 'Kigali'))
+            for _ in range(100)
+        ])
+        self.assertEqual(run(), small)
+        self.assertLessEqual(Match.objects.filter(lost_item=self.lost).count(), 5)
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command('benchmark_matching', sizes=[50, 200], probes=3, stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(LostItem.objects.count(), 1)
+
+
+class ScoreMigrationTests(TestCase):
+    def setUp(self):
+        lost = LostItem.objects.create(title='Phone', category='Phone', serial_number='SN1')
+        self.serial = Match.objects.create(
+            lost_item=lost, found_item=FoundItem.objects.create(name='Phone', category='Phone', serial_number='sn-1'),
+        )
+        self.manual = Match.objects.create(
+            lost_item=lost, found_item=FoundItem.objects.create(name='Phone', category='Phone', serial_number='SN2'),
+        )
+        self.no_serial = Match.objects.create(
+            lost_item=LostItem.objects.create(title='Bag', category='Bag'),
+            found_item=FoundItem.objects.create(name='Bag', category='Bag'),
+        )
+
+    def _scores(self):
+        return [Match.objects.get(id=m.id).score for m in (self.serial, self.manual, self.no_serial)]
+
+    def test_backfill_scores_serial_matches_only(self):
+        import_module('devices.migrations.0020_fuzzy_matching').backfill_match_blocks(apps, None)
+        self.assertEqual(self._scores(), [1.0, None, None])
+
+
+class RematchCommandTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.checkpoint = os.path.join(self.tmp.name, 'rematch.json')
+
+    def _rematch(self, *args, **options):
+        out = StringIO()
+        call_command('rematch', *args, workers=0, checkpoint=self.checkpoint, stdout=out, **options)
+        return out.getvalue()
+
+    def test_existing_reports_are_matched_in_bulk(self):
+        # Serials filled in later, after creation-time matching already ran
+        lost = [LostItem.objects.create(title='Phone', category='Phone') for _ in range(3)]
+        found = [FoundItem.objects.create(name='Laptop', category='Laptop') for _ in range(3)]
+        for n, (lost_item, found_item) in enumerate(zip(lost, found)):
+            LostItem.objects.filter(id=lost_item.id).update(serial_normalized=f'SN{n}')
+            FoundItem.objects.filter(id=found_item.id).update(serial_normalized=f'SN{n}')
+        output = self._rematch('lost', chunk_size=2)
+        self.assertEqual(Match.objects.count(), 3)
+        self.assertEqual(set(Match.objects.values_list('score', flat=True)), {1.0})
+        self.assertIn('3 reports, 3 matches', output)
+        self.assertIn('rows/s', output)
+        self.assertFalse(os.path.exists(self.checkpoint))
+        # Already matched reports are skipped unless asked for
+        self.assertIn('0 reports', self._rematch('lost'))
+        self.assertIn('3 reports, 0 matches', self._rematch('lost', include_matched=True))
+
+    def test_resumes_from_checkpoint(self):
+        lost = [LostItem.objects.create(title='Phone', category='Phone', serial_number=f'SN{n}') for n in range(4)]
+        for n in range(4):
+            FoundItem.objects.create(name='Laptop', category='Laptop')
+        FoundItem.objects.update(serial_normalized='SN0')
+        with open(self.checkpoint, 'w') as f:
+            json.dump({'lost': lost[0].id, 'found': 0}, f)
+        self._rematch('lost')
+        self.assertFalse(Match.objects.filter(lost_item=lost[0]).exists())
+        with open(self.checkpoint) as f:
+            self.assertEqual(json.load(f), {'found': 0})
+        self.assertIn('4 reports', self._rematch('lost', restart=True))
+        self.assertEqual(Match.objects.filter(lost_item=lost[0]).count(), 4)
@@ -0,0 +1,238 @@
+import re
+from collections import Counter
+from itertools import count
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from notifications.models import Notification
+from reports.models import Report
+from .models import Device, LostItem, FoundItem, Match, Return, Contact, PartnerApiKey
+
+# 10N rows of a bulk INSERT stay under SQLite's 999 parameters, so a
+# legitimate bulk statement is never split into batches
+N = 5
+PAGE = {'page_size': 200}
+
+
+def _shapes(queries):
+    # Queries with literals blanked, so the two runs can be compared
+    shapes = Counter()
+    for query in queries:
+        sql = re.sub(r"'[^']*'|\b\d+\b", '?', query['sql'])
+        sql = re.sub(r'\((?:\?|NULL)(?:, (?:\?|NULL))*\)(?:, \((?:\?|NULL)(?:, (?:\?|NULL))*\))*', '(...)', sql)
+        shapes[re.sub(r'"s\w+_x\w+"', 'savepoint', sql)[:200]] += 1
+    return shapes
+
+
+def _users(n, prefix, ids):
+    User = get_user_model()
+    return User.objects.bulk_create([
+        User(email=f'{prefix}{i}@example.com', username=f'{prefix}{i}') for i in (next(ids) for _ in range(n))
+    ])
+
+
+class QueryBudgetTests(TestCase):
+    """Every endpoint issues the same number of queries for N and 10N rows.
+
+    A serializer or view that starts querying per row fails here.
+    """
+
+    def setUp(self):
+        User = get_user_model()
+        self.admin = User.objects.create_superuser(email='admin@example.com', username='admin', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self._ids = count()
+
+    def assertConstantQueries(self, seed, request):
+        """Run `request` after seeding N and after seeding 10N more rows; query counts must match.
+
+        `request` first runs once on its own seed, so one-off work (the
+        month's first rollup row, lazy caches) is not counted. Each seed
+        adds rows for the next request, which lists see accumulate and
+        claims or creates use up.
+        """
+        seed(N)
+        request()
+        runs = []
+        for size in (N, 10 * N):
+            seed(size)
+            with CaptureQueriesContext(connection) as queries:
+                resp = request()
+                # Streamed responses query while they are consumed
+                b''.join(getattr(resp, 'streaming_content', []))
+            self.assertLess(resp.status_code, 300, getattr(resp, 'data', None))
+            runs.append(_shapes(queries))
+        few, many = runs
+        self.assertEqual(
+            sum(few.values()), sum(many.values()),
+            f'{sum(few.values())} queries for {N} rows, {sum(many.values())} for {10 * N}; '
+            f'extra: {list((many - few).elements())}',
+        )
+
+    def _lost(self, n, **fields):
+        fields = {'loster_email': 'owner@example.com', **fields}
+        return LostItem.objects.bulk_create([LostItem(title='Phone', category='Phone', **fields) for _ in range(n)])
+
+    def _found(self, n, **fields):
+        fields = {'founder_email': 'finder@example.com', **fields}
+        return FoundItem.objects.bulk_create([FoundItem(name='Phone', category='Phone', **fields) for _ in range(n)])
+
+    def _matches(self, n, lost=None, found=None):
+        lost_items = [lost] * n if lost else self._lost(n)
+        found_items = [found] * n if found else self._found(n)
+        return Match.objects.bulk_create([
+            Match(lost_item=l, found_item=f, score=1.0, loster_name='Ann', serial_number='SN1')
+            for l, f in zip(lost_items, found_items)
+        ])
+
+    def _returns(self, n):
+        return Return.objects.bulk_create([
+            Return(lost_item=m.lost_item, found_item=m.found_item, owner=self.admin, finder=self.admin, claimed_by=self.admin)
+            for m in self._matches(n)
+        ])
+
+    def _devices(self, n):
+        devices = Device.objects.bulk_create([
+            Device(user=self.admin, name='Laptop', category='Laptop', serial_number=f'DEV{next(self._ids)}') for _ in range(n)
+        ])
+        for device in devices:
+            self._found(1, device=device)
+        return devices
+
+    def test_item_lists_and_searches(self):
+        seed = lambda n: (self._lost(n, status='lost'), self._found(n, status='found'))
+        for url in (
+            '/api/devices/lost/list/', '/api/devices/found/list/',
+            '/api/devices/lost/search/', '/api/devices/found/search/',
+        ):
+            with self.subTest(url=url):
+                self.assertConstantQueries(seed, lambda: self.client.get(url, PAGE))
+        for url, params in (
+            ('/api/devices/lost/filter/', {}),
+            ('/api/devices/found/filter/', {}),
+            ('/api/devices/lost/by-email/', {'email': 'owner@example.com'}),
+            ('/api/devices/found/by-email/', {'email': 'finder@example.com'}),
+        ):
+            with self.subTest(url=url):
+                self.assertConstantQueries(seed, lambda: self.client.get(url, params))
+
+    def test_serial_search(self):
+        seed = lambda n: (self._lost(n, serial_normalized='SN1'), self._found(n, serial_normalized='SN1'))
+        self.assertConstantQueries(seed, lambda: self.client.get('/api/devices/search/serial/', {'serial_number': 'sn1'}))
+
+    def test_match_return_and_contact_lists(self):
+        contacts = lambda n: Contact.objects.bulk_create([
+            Contact(first_name='A', last_name='B', email='a@example.com', subject='s', message='m') for _ in range(n)
+        ])
+        for url, seed in (
+            ('/api/devices/matches/list/', self._matches),
+            ('/api/devices/returns/list/', self._returns),
+            ('/api/devices/contact/list/', contacts),
+        ):
+            with self.subTest(url=url):
+                self.assertConstantQueries(seed, lambda: self.client.get(url, PAGE))
+
+    def test_details(self):
+        lost, = self._lost(1)
+        found, = self._found(1)
+        match, = self._matches(1, lost=lost, found=found)
+        # Related rows must not be walked by the detail serializers
+        seed = lambda n: (self._matches(n, lost=lost), self._matches(n, found=found))
+        for url in (f'/api/devices/lost/{lost.id}/', f'/api/devices/found/{found.id}/', f'/api/devices/matches/{match.id}/'):
+            with self.subTest(url=url):
+                self.assertConstantQueries(seed, lambda: self.client.get(url))
+
+    def test_my_devices_and_device_search(self):
+        self.assertConstantQueries(self._devices, lambda: self.client.get('/api/devices/mine/'))
+        seed = lambda n: Device.objects.bulk_create([
+            Device(user=user, name='Laptop', category='Laptop', serial_number='SHARED1', serial_normalized='SHARED1')
+            for user in _users(n, 'u', self._ids)
+        ])
+        self.assertConstantQueries(seed, lambda: self.client.get('/api/devices/search/', {'serial_number': 'shared-1'}))
+
+    def _same_serial(self, n):
+        # Reports and registered devices that a new SN1 report matches, all in bulk
+        self._lost(n, serial_number='SN1', serial_normalized='SN1')
+        self._found(n, serial_number='SN1', serial_normalized='SN1', founder_email=None)
+        Device.objects.bulk_create([
+            Device(user=user, name='Phone', category='Phone', serial_number='SN1', serial_normalized='SN1')
+            for user in _users(n, 'd', self._ids)
+        ])
+
+    def test_lost_report_matching_many_found_reports(self):
+        data = {'title': 'Phone', 'category': 'Phone', 'serialNumber': 'SN1', 'losterEmail': 'o@example.com'}
+        self.assertConstantQueries(self._same_serial, lambda: self.client.post('/api/devices/lost/', data, format='json'))
+
+    def test_found_report_matching_many_lost_reports_and_devices(self):
+        data = {'name': 'Phone', 'category': 'Phone', 'serialnumber': 'SN1'}
+        self.assertConstantQueries(self._same_serial, lambda: self.client.post('/api/devices/found/', data, format='json'))
+
+    def test_claims_and_bulk_updates(self):
+        claimable = []
+
+        def seed(n):
+            # One claimable pair whose items also have n rival matches to close
+            lost, = self._lost(1)
+            found, = self._found(1)
+            claimable.append(self._matches(1, lost=lost, found=found)[0])
+            self._matches(n, lost=lost)
+            self._matches(n, found=found)
+        self.assertConstantQueries(
+            seed, lambda: self.client.post('/api/devices/matches/claim/', {'match_id': claimable.pop().id}, format='json'),
+        )
+
+        batches = []
+        seed = lambda n: batches.append([m.id for m in self._matches(n)])
+        self.assertConstantQueries(
+            seed, lambda: self.client.post('/api/devices/matches/claim/bulk/', {'ids': batches.pop()}, format='json'),
+        )
+        for kind, make in (('lost', self._lost), ('found', self._found)):
+            seed = lambda n: batches.append([item.id for item in make(n)])
+            with self.subTest(kind=kind):
+                self.assertConstantQueries(seed, lambda: self.client.patch(
+                    f'/api/devices/{kind}/bulk/', {'ids': batches.pop(), 'status': 'claimed'}, format='json',
+                ))
+
+    def test_serial_check(self):
+        _, key = PartnerApiKey.generate('Pawn shop')
+        partner = APIClient()
+        partner.credentials(HTTP_AUTHORIZATION=f'Api-Key {key}')
+        serials = []
+
+        def seed(n):
+            for _ in range(n):
+                serial = f'CHK{next(self._ids)}'
+                serials.append(serial)
+                self._lost(1, serial_number=serial, serial_normalized=serial)
+        self.assertConstantQueries(seed, lambda: partner.post('/api/devices/serial-check/', {'serials': serials}, format='json'))
+
+    def test_exports(self):
+        seed = lambda n: (self._lost(n), self._found(n), self._matches(n))
+        for resource in ('lost', 'found', 'matches'):
+            with self.subTest(resource=resource):
+                self.assertConstantQueries(
+                    seed, lambda: self.client.get(f'/api/devices/export/{resource}/', {'format': 'csv'}),
+                )
+
+    def test_notifications_reports_and_users(self):
+        notifications = lambda n: Notification.objects.bulk_create([
+            Notification(user=self.admin, message='m') for _ in range(n)
+        ])
+        reports = lambda n: Report.objects.bulk_create([
+            Report(user=self.admin, item_id=1, type='lost') for _ in range(n)
+        ])
+        users = lambda n: _users(n, 'b', self._ids)
+        for url, seed in (
+            ('/api/notifications/', notifications),
+            ('/api/reports/list/', reports),
+            ('/api/auth/users/', users),
+            ('/api/reports/stats/location/', lambda n: self._lost(n, city_town='Kigali')),
+            ('/api/reports/stats/monthly/', lambda n: (self._lost(n), self._returns(n))),
+        ):
+            with self.subTest(url=url):
+                self.assertConstantQueries(seed, lambda: self.client.get(url, PAGE))
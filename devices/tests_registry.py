@@ -0,0 +1,57 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from notifications.models import Notification
+
+from .models import Device, FoundItem
+
+
+class DeviceRegistryTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.owner = User.objects.create_user(email='owner@example.com', username='owner', password='pass')
+        self.device = Device.objects.create(user=self.owner, serial_number='AB-12 cd', name='Laptop', category='Laptop')
+        self.client = APIClient()
+
+    def test_found_report_is_linked_and_owner_notified(self):
+        resp = self.client.post('/api/devices/found/', {
+            'name': 'Laptop', 'category': 'Laptop', 'serialnumber': 'ab12CD', 'district': 'Gasabo',
+        }, format='json')
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(FoundItem.objects.get(id=resp.data['id']).device, self.device)
+        notification = Notification.objects.get(user=self.owner)
+        self.assertIn('AB-12 cd', notification.message)
+        self.assertIn('Gasabo', notification.message)
+
+    def test_unregistered_serial_is_left_alone(self):
+        resp = self.client.post('/api/devices/found/', {'name': 'Laptop', 'category': 'Laptop', 'serialnumber': 'ZZ99'}, format='json')
+        self.assertIsNone(FoundItem.objects.get(id=resp.data['id']).device)
+        self.assertFalse(Notification.objects.exists())
+
+    def test_backfill_links_existing_reports(self):
+        FoundItem.objects.create(name='Laptop', category='Laptop', serial_number='AB12CD')
+        FoundItem.objects.create(name='Phone', category='Phone', serial_number='OTHER')
+        out = StringIO()
+        call_command('link_devices', chunk_size=1, stdout=out)
+        self.assertIn('1 of 2', out.getvalue())
+        self.assertEqual(self.device.found_items.count(), 1)
+        self.assertFalse(Notification.objects.exists())
+
+    def test_my_devices_lists_linked_reports_with_one_prefetch(self):
+        other = Device.objects.create(user=self.owner, serial_number='EF34', name='Phone', category='Phone')
+        for serial in ('AB12CD', 'AB12CD', 'EF34'):
+            self.client.post('/api/devices/found/', {'name': 'Item', 'category': 'Laptop', 'serialnumber': serial}, format='json')
+        self.client.force_authenticate(self.owner)
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.get('/api/devices/mine/')
+        self.assertEqual(len(queries), 2)
+        reports = {device['id']: device['found_reports'] for device in resp.data}
+        self.assertEqual(len(reports[self.device.id]), 2)
+        self.assertEqual(len(reports[other.id]), 1)
+        self.assertEqual(reports[other.id][0]['status'], 'found')
@@ -0,0 +1,82 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from . import response_cache
+from .models import LostItem, FoundItem, Match
+from .status import claim_match
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=True)
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        response_cache.reset_stats()
+        self.client = APIClient()
+        self.lost = LostItem.objects.create(title='Phone', category='Phone', serial_number='SN1')
+        self.found = FoundItem.objects.create(name='Phone', category='Phone', serial_number='SN1')
+        self.match = Match.objects.create(lost_item=self.lost, found_item=self.found, score=1.0)
+
+    def _get(self, url, **params):
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.get(url, params)
+        self.assertEqual(resp.status_code, 200)
+        return resp.json(), len(queries)
+
+    def test_repeated_reads_skip_the_database(self):
+        first, _ = self._get(f'/api/devices/matches/{self.match.id}/')
+        again, queries = self._get(f'/api/devices/matches/{self.match.id}/')
+        self.assertEqual((again, queries), (first, 0))
+        # Parameter order does not matter; values do
+        self._get('/api/devices/lost/list/', view='card', page_size=5)
+        _, queries = self._get('/api/devices/lost/list/', page_size=5, view='card')
+        self.assertEqual(queries, 1)  # the collection version for the conditional GET
+        data, _ = self._get('/api/devices/lost/list/', page_size=5, view='full')
+        self.assertIn('additionalInfo', data['results'][0])
+
+    def test_saves_invalidate_only_what_they_touch(self):
+        self._get(f'/api/devices/lost/{self.lost.id}/')
+        self._get(f'/api/devices/found/{self.found.id}/')
+        self.lost.title = 'Blue phone'
+        self.lost.save()
+        data, queries = self._get(f'/api/devices/lost/{self.lost.id}/')
+        self.assertEqual(data['title'], 'Blue phone')
+        self.assertGreater(queries, 0)
+        _, queries = self._get(f'/api/devices/found/{self.found.id}/')
+        self.assertEqual(queries, 0)
+
+    def test_claims_and_deletes_invalidate(self):
+        data, _ = self._get(f'/api/devices/matches/{self.match.id}/')
+        self.assertEqual(data['match_status'], 'unclaimed')
+        self._get('/api/reports/stats/location/')
+        # Location counters, and their cache tag, move once the claim commits
+        with self.captureOnCommitCallbacks(execute=True):
+            claim_match(self.match.id)
+        data, _ = self._get(f'/api/devices/matches/{self.match.id}/')
+        self.assertEqual(data['match_status'], 'claimed')
+        _, queries = self._get('/api/reports/stats/location/')
+        self.assertGreater(queries, 1)
+        self._get('/api/devices/matches/list/')
+        self.lost.delete()
+        data, _ = self._get('/api/devices/matches/list/')
+        self.assertEqual(data['results'], [])
+        self.assertEqual(self.client.get(f'/api/devices/matches/{self.match.id}/').status_code, 404)
+
+    def test_hit_and_miss_counters(self):
+        for _ in range(3):
+            self._get('/api/devices/categories/')
+        stats = response_cache.stats()['get_categories']
+        self.assertEqual((stats['hit'], stats['miss']), (2, 1))
+        out = StringIO()
+        call_command('response_cache_stats', stdout=out)
+        self.assertIn('get_categories: 2 hits, 1 misses', out.getvalue())
+
+    @override_settings(RESPONSE_CACHE_ENABLED=None)
+    def test_off_with_a_per_process_cache(self):
+        self._get('/api/devices/categories/')
+        self.assertEqual(response_cache.stats()['get_categories']['miss'], 0)
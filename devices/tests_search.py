@@ -0,0 +1,105 @@
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from .models import LostItem, FoundItem
+from .search import LikeSearchBackend, get_search_backend
+from .serial_search import filter_serial_contains
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.iphone = LostItem.objects.create(title='iPhone 13 Pro', category='Phone', brand='Apple', city_town='Kigali', additional_info='Blue case with a crack')
+        self.pixel = LostItem.objects.create(title='Pixel 7', category='Phone', brand='Google', city_town='Huye', serial_number='GP-7788')
+        self.macbook = LostItem.objects.create(title='MacBook Air', category='Laptop', brand='Apple', city_town='Kigali')
+        self.earbuds = FoundItem.objects.create(name='AirPods', category='Earbuds / Headphones', description='White case', district='Gasabo')
+
+    def _ids(self, resp):
+        self.assertEqual(resp.status_code, 200)
+        return [item['id'] for item in resp.data['results']]
+
+    def test_prefix_and_multi_word_matching(self):
+        self.assertEqual(self._ids(self.client.get('/api/devices/lost/search/', {'q': 'iph'})), [self.iphone.id])
+        self.assertEqual(self._ids(self.client.get('/api/devices/lost/search/', {'q': 'apple kig'})), [self.macbook.id, self.iphone.id])
+        self.assertEqual(self._ids(self.client.get('/api/devices/lost/search/', {'q': 'crack'})), [self.iphone.id])
+        self.assertEqual(self._ids(self.client.get('/api/devices/found/search/', {'q': 'airpod'})), [self.earbuds.id])
+
+    def test_title_outranks_description(self):
+        other = LostItem.objects.create(title='Charger', category='Other electronics', additional_info='for my macbook')
+        ids = self._ids(self.client.get('/api/devices/lost/search/', {'q': 'macbook'}))
+        self.assertEqual(ids, [self.macbook.id, other.id])
+
+    def test_filters_and_pagination(self):
+        ids = self._ids(self.client.get('/api/devices/lost/search/', {'q': 'apple', 'category': 'Laptop'}))
+        self.assertEqual(ids, [self.macbook.id])
+        resp = self.client.get('/api/devices/lost/search/', {'q': 'apple', 'page_size': 1})
+        self.assertEqual(len(resp.data['results']), 1)
+        self.assertIsNotNone(resp.data['next'])
+        second = self.client.get(resp.data['next'])
+        self.assertEqual(len(second.data['results']), 1)
+        self.assertIsNone(second.data['next'])
+
+    def test_category_filter_is_case_insensitive_and_partial(self):
+        for params in ({'q': 'apple', 'category': 'lap'}, {'category': 'LAPTOP'}):
+            with self.subTest(params=params):
+                self.assertEqual(self._ids(self.client.get('/api/devices/lost/search/', params)), [self.macbook.id])
+        ids = self._ids(self.client.get('/api/devices/found/search/', {'q': 'white', 'category': 'earbuds'}))
+        self.assertEqual(ids, [self.earbuds.id])
+        self.assertEqual(LikeSearchBackend().search('lost', 'apple', {'category__icontains': 'lap'}), [self.macbook.id])
+        # LIKE wildcards in the parameter are matched literally
+        self.assertEqual(self._ids(self.client.get('/api/devices/lost/search/', {'q': 'apple', 'category': '%'})), [])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.pixel.title = 'Galaxy S21'
+        self.pixel.save()
+        self.assertEqual(get_search_backend().search('lost', 'pixel'), [])
+        self.assertEqual(get_search_backend().search('lost', 'galaxy'), [self.pixel.id])
+        self.pixel.delete()
+        self.assertEqual(get_search_backend().search('lost', 'galaxy'), [])
+
+    def test_serial_is_searchable(self):
+        self.assertEqual(get_search_backend().search('lost', 'GP7788'), [self.pixel.id])
+
+
+class SerialSubstringTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.phone = LostItem.objects.create(title='Phone', serial_number='SN-ABC-12345')
+        self.laptop = LostItem.objects.create(title='Laptop', serial_number='XY99ABC')
+        self.found = FoundItem.objects.create(name='Phone', serial_number='sn abc 12345')
+
+    def _lost(self, needle):
+        return set(filter_serial_contains(LostItem.objects.all(), 'lost', needle).values_list('id', flat=True))
+
+    def test_substring_match_is_normalized(self):
+        self.assertEqual(self._lost('abc'), {self.phone.id, self.laptop.id})
+        self.assertEqual(self._lost('c-123'), {self.phone.id})
+        self.assertEqual(self._lost('ABC1234 5'), {self.phone.id})
+        self.assertEqual(self._lost('ZZZ'), set())
+
+    def test_short_query_matches_whole_serial_only(self):
+        short = LostItem.objects.create(title='Tag', serial_number='a-1')
+        self.assertEqual(self._lost('A1'), {short.id})
+        self.assertEqual(self._lost('--'), set())
+
+    def test_index_follows_serial_edits_and_deletes(self):
+        self.laptop.serial_number = 'QQ-777'
+        self.laptop.save()
+        self.assertEqual(self._lost('ABC'), {self.phone.id})
+        self.assertEqual(self._lost('Q777'), {self.laptop.id})
+        self.phone.delete()
+        self.assertEqual(self._lost('ABC'), set())
+
+    def test_endpoints(self):
+        resp = self.client.get('/api/devices/search/serial/', {'serial_number': 'abc123'})
+        self.assertEqual([i['id'] for i in resp.data['lost_items']], [self.phone.id])
+        self.assertEqual([i['id'] for i in resp.data['found_items']], [self.found.id])
+        resp = self.client.get('/api/devices/lost/search/', {'serial_number': 'abc'})
+        self.assertEqual({i['id'] for i in resp.data['results']}, {self.phone.id, self.laptop.id})
+
+    @override_settings(SERIAL_SEARCH_MAX_RESULTS=2)
+    def test_results_are_capped(self):
+        for n in range(3):
+            LostItem.objects.create(title='Phone', serial_number=f'ABC-{n}')
+        resp = self.client.get('/api/devices/search/serial/', {'serial_number': 'abc'})
+        self.assertEqual(len(resp.data['lost_items']), 2)
@@ -0,0 +1,70 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from .authentication import ApiKeyRateThrottle
+from .models import Device, LostItem, FoundItem, PartnerApiKey
+
+URL = '/api/devices/serial-check/'
+
+
+class SerialCheckTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        owner = get_user_model().objects.create_user(email='owner@example.com', username='owner', password='pass')
+        Device.objects.create(user=owner, serial_number='REG-1', name='Laptop', category='Laptop')
+        LostItem.objects.create(title='Phone', category='Phone', serial_number='lost 2')
+        LostItem.objects.create(title='Phone', category='Phone', serial_number='OLD3', status='claimed')
+        FoundItem.objects.create(name='Phone', category='Phone', serial_number='REG1')
+        self.api_key, key = PartnerApiKey.generate('Pawn shop')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Api-Key {key}')
+
+    def test_batch_statuses_in_request_order(self):
+        serials = ['reg1', 'LOST-2', 'old3', 'unknown', '--']
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.post(URL, {'serials': serials}, format='json')
+        self.assertEqual(resp.status_code, 200)
+        # key lookup plus one query per table
+        self.assertEqual(len(queries), 4)
+        results = resp.data['results']
+        self.assertEqual([r['serial'] for r in results], serials)
+        self.assertEqual(
+            [(r['registered'], r['lost'], r['found']) for r in results],
+            [(True, False, True), (False, True, False), (False, False, False), (False, False, False), (False, False, False)],
+        )
+        self.assertEqual(results[1]['normalized'], 'LOST2')
+
+    def test_requires_active_key(self):
+        anonymous = APIClient()
+        self.assertEqual(anonymous.post(URL, {'serials': ['REG1']}, format='json').status_code, 401)
+        anonymous.credentials(HTTP_AUTHORIZATION='Api-Key wrong')
+        self.assertEqual(anonymous.post(URL, {'serials': ['REG1']}, format='json').status_code, 401)
+        PartnerApiKey.objects.filter(id=self.api_key.id).update(is_active=False)
+        self.assertEqual(self.client.post(URL, {'serials': ['REG1']}, format='json').status_code, 401)
+
+    def test_batch_is_validated(self):
+        self.assertEqual(self.client.post(URL, {'serials': []}, format='json').status_code, 400)
+        self.assertEqual(self.client.post(URL, {'serials': ['x'] * 1001}, format='json').status_code, 400)
+
+    @mock.patch.object(ApiKeyRateThrottle, 'THROTTLE_RATES', {'partner': '2/min'})
+    def test_rate_limited_per_key(self):
+        for _ in range(2):
+            self.assertEqual(self.client.post(URL, {'serials': ['REG1']}, format='json').status_code, 200)
+        self.assertEqual(self.client.post(URL, {'serials': ['REG1']}, format='json').status_code, 429)
+        _, other_key = PartnerApiKey.generate('Repair centre')
+        other = APIClient()
+        other.credentials(HTTP_AUTHORIZATION=f'Api-Key {other_key}')
+        self.assertEqual(other.post(URL, {'serials': ['REG1']}, format='json').status_code, 200)
+
+    def test_admin_cannot_add_keys(self):
+        admin = get_user_model().objects.create_superuser(email='admin@example.com', username='admin', password='pass')
+        self.client.force_login(admin)
+        self.assertEqual(self.client.get('/admin/devices/partnerapikey/add/').status_code, 403)
+        resp = self.client.get(f'/admin/devices/partnerapikey/{self.api_key.id}/change/')
+        self.assertEqual(resp.status_code, 200)
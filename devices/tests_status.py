@@ -0,0 +1,95 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from .models import LostItem, FoundItem, Match, StatusTransition
+
+
+class StatusPropagationTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.owner = User.objects.create_user(email='owner@example.com', username='owner', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+        self.lost = LostItem.objects.create(title='Phone', category='Phone', serial_number='SN1', user=self.owner)
+        self.found = FoundItem.objects.create(name='Phone', category='Phone', serial_number='SN1')
+        Match.objects.create(lost_item=self.lost, found_item=self.found, score=1.0)
+
+    def _claim_lost(self):
+        return self.client.patch(f'/api/devices/lost/{self.lost.id}/update/', {'status': 'claimed'}, format='json')
+
+    def test_claim_follows_matches_only(self):
+        same_serial = FoundItem.objects.create(name='Phone', category='Phone', serial_number='SN1')
+        fuzzy = FoundItem.objects.create(name='Phone', category='Phone')
+        Match.objects.create(lost_item=self.lost, found_item=fuzzy, score=0.7)
+        self.assertEqual(self._claim_lost().status_code, 200)
+        statuses = dict(FoundItem.objects.values_list('id', 'status'))
+        self.assertEqual(statuses[self.found.id], 'claimed')
+        self.assertEqual(statuses[same_serial.id], 'found')
+        self.assertEqual(statuses[fuzzy.id], 'found')
+
+    def test_transitions_are_recorded(self):
+        self._claim_lost()
+        rows = set(StatusTransition.objects.values_list('item_kind', 'item_id', 'from_status', 'to_status', 'reason'))
+        self.assertEqual(rows, {
+            ('lost', self.lost.id, 'lost', 'claimed', 'update'),
+            ('found', self.found.id, 'found', 'claimed', 'match'),
+        })
+
+    def test_invalid_transition_is_rejected_before_saving(self):
+        self._claim_lost()
+        resp = self.client.patch(
+            f'/api/devices/lost/{self.lost.id}/update/', {'status': 'lost', 'title': 'Tablet'}, format='json',
+        )
+        self.assertEqual(resp.status_code, 400)
+        self.lost.refresh_from_db()
+        self.assertEqual((self.lost.status, self.lost.title), ('claimed', 'Phone'))
+        self.assertEqual(StatusTransition.objects.filter(item_kind='lost').count(), 1)
+
+    def test_only_owners_and_authorities_change_status(self):
+        User = get_user_model()
+        stranger = User.objects.create_user(email='x@example.com', username='x', password='pass')
+        authority = User.objects.create_user(email='a@example.com', username='a', password='pass', role='authority')
+        for user in (None, stranger):
+            self.client.force_authenticate(user)
+            self.assertEqual(self._claim_lost().status_code, 403)
+        # Other fields stay editable as before
+        resp = self.client.patch(f'/api/devices/lost/{self.lost.id}/update/', {'title': 'Tablet'}, format='json')
+        self.assertEqual(resp.status_code, 200)
+        self.assertFalse(StatusTransition.objects.exists())
+        self.client.force_authenticate(authority)
+        self.assertEqual(self._claim_lost().status_code, 200)
+        self.found.refresh_from_db()
+        self.assertEqual(self.found.status, 'claimed')
+
+    def test_status_is_validated_as_a_choice(self):
+        resp = self.client.patch(f'/api/devices/lost/{self.lost.id}/update/', {'status': 'stolen'}, format='json')
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn('status', resp.data)
+
+    def test_found_item_status_needs_owner(self):
+        url = f'/api/devices/found/{self.found.id}/update/'
+        self.assertEqual(self.client.patch(url, {'status': 'claimed'}, format='json').status_code, 403)
+        FoundItem.objects.filter(id=self.found.id).update(user=self.owner)
+        self.assertEqual(self.client.patch(url, {'status': 'claimed'}, format='json').status_code, 200)
+
+    def _pair(self):
+        lost = LostItem.objects.create(title='Phone', category='Phone', serial_number='SN1', user=self.owner)
+        Match.objects.create(
+            lost_item=lost, found_item=FoundItem.objects.create(name='Phone', category='Phone', serial_number='SN1'), score=1.0,
+        )
+        return f'/api/devices/lost/{lost.id}/update/'
+
+    def test_query_count_ignores_reports_sharing_the_serial(self):
+        # The first claim also creates the rollup counter rows
+        self._claim_lost()
+        few_url, many_url = self._pair(), self._pair()
+        with CaptureQueriesContext(connection) as few:
+            self.client.patch(few_url, {'status': 'claimed'}, format='json')
+        FoundItem.objects.bulk_create([FoundItem(name='Phone', category='Phone', serial_number='SN1') for _ in range(50)])
+        with CaptureQueriesContext(connection) as many:
+            self.client.patch(many_url, {'status': 'claimed'}, format='json')
+        self.assertEqual(FoundItem.objects.filter(status='claimed').count(), 3)
+        self.assertEqual(len(many), len(few))
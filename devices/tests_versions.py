@@ -0,0 +1,57 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from .models import LostItem, FoundItem, Match, CollectionVersion
+from .status import claim_match
+
+
+class ConditionalListTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.lost = LostItem.objects.create(title='Phone', category='Phone', serial_number='SN1', city_town='Kigali')
+
+    def test_unchanged_collection_is_a_304_from_one_query(self):
+        resp = self.client.get('/api/devices/lost/list/')
+        etag, last_modified = resp['ETag'], resp['Last-Modified']
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.get('/api/devices/lost/list/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual((resp.status_code, len(queries)), (304, 1))
+        self.assertIn('devices_collectionversion', queries[0]['sql'])
+        resp = self.client.get('/api/devices/lost/list/', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(resp.status_code, 304)
+        # Other query strings are other responses
+        resp = self.client.get('/api/devices/lost/list/', {'view': 'card'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+
+    def test_writes_change_the_etag(self):
+        etag = self.client.get('/api/devices/lost/list/')['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            LostItem.objects.create(title='Bag', category='Bag')
+        resp = self.client.get('/api/devices/lost/list/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual((resp.status_code, len(resp.data['results'])), (200, 2))
+        etag = resp['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.lost.delete()
+        self.assertEqual(self.client.get('/api/devices/lost/list/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_claims_bump_versions(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            found = FoundItem.objects.create(name='Phone', category='Phone', serial_number='SN1')
+            match = Match.objects.create(lost_item=self.lost, found_item=found, score=1.0)
+        before = dict(CollectionVersion.objects.values_list('name', 'version'))
+        with self.captureOnCommitCallbacks(execute=True):
+            claim_match(match.id)
+        after = dict(CollectionVersion.objects.values_list('name', 'version'))
+        for name in ('lost_items', 'found_items', 'matches', 'location_stats'):
+            self.assertGreater(after[name], before[name], name)
+
+    def test_stats_endpoints(self):
+        etag = self.client.get('/api/reports/stats/location/')['ETag']
+        self.assertEqual(self.client.get('/api/reports/stats/location/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        etag = self.client.get('/api/reports/stats/monthly/')['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            LostItem.objects.create(title='Bag', category='Bag')
+        self.assertEqual(self.client.get('/api/reports/stats/monthly/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
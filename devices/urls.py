@@ -6,6 +6,7 @@ urlpatterns = [
     path('', views.device_create, name='device-create'),
     path('mine/', views.my_devices_list, name='device-mine'),
     path('search/', views.device_search, name='device-search'),
+    path('serial-check/', views.serial_check, name='device-serial-check'),
     path('<int:id>/', views.device_delete, name='device-delete'),
 
     # Lost item endpoints
@@ -15,6 +16,7 @@ urlpatterns = [
     path('lost/<int:id>/delete/', views.lostitem_delete, name='lostitem-delete'),
     path('lost/list/', views.lostitem_list, name='lostitem-list'),
     path('lost/search/', views.lostitem_search, name='lostitem-search'),
+    path('lost/bulk/', views.lostitem_bulk_update, name='lostitem-bulk-update'),
 
     # Found item endpoints
     path('found/', views.founditem_create, name='founditem-create'),
@@ -23,11 +25,13 @@ urlpatterns = [
     path('found/<int:id>/delete/', views.founditem_delete, name='founditem-delete'),
     path('found/list/', views.founditem_list, name='founditem-list'),
     path('found/search/', views.founditem_search, name='founditem-search'),
+    path('found/bulk/', views.founditem_bulk_update, name='founditem-bulk-update'),
 
     # Match endpoints
     path('matches/', views.match_create, name='match-create'),
     path('matches/list/', views.match_list, name='match-list'),
     path('matches/claim/', views.claim_match, name='match-claim'),
+    path('matches/claim/bulk/', views.claim_match_bulk, name='match-claim-bulk'),
     path('matches/<int:id>/', views.match_detail, name='match-detail'),
     path('matches/<int:id>/delete/', views.match_delete, name='match-delete'),
 
@@ -47,4 +51,7 @@ urlpatterns = [
     path('categories/', views.get_categories, name='get-categories'), 
     path('lost/by-email/', views.lostitem_by_email, name='lostitem-by-email'),
     path('found/by-email/', views.founditem_by_email, name='founditem-by-email'),
+
+    # Bulk export endpoints (authority only)
+    path('export/<str:resource>/', views.export_resource, name='export-resource'),
 ]
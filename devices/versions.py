@@ -0,0 +1,73 @@
+"""Conditional GETs for polled collections, answered from CollectionVersion.
+
+Each collection (``lost_items``, ``found_items``, ``matches``, and the
+report stats) has one CollectionVersion row that ``touch()`` bumps after
+any change to the rows it is built from commits. ``conditional()`` wraps a
+list view so that a request whose If-None-Match / If-Modified-Since still
+matches gets a 304 after one primary-key read of that table, before the
+view queries or serializes anything.
+"""
+import hashlib
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.views.decorators.http import condition
+
+from .models import CollectionVersion
+from .response_cache import invalidate
+
+
+def touch(*names):
+    """Bump these collections' versions once the current transaction commits.
+
+    Their cached responses (devices.response_cache) are dropped too.
+    """
+    transaction.on_commit(lambda: _bump(names))
+    invalidate(*names)
+
+
+def _bump(names):
+    now = timezone.now()
+    updated = CollectionVersion.objects.filter(name__in=names).update(version=F('version') + 1, updated_at=now)
+    if updated == len(names):
+        return
+    for name in names:
+        try:
+            with transaction.atomic():
+                CollectionVersion.objects.get_or_create(name=name, defaults={'version': 1, 'updated_at': now})
+        except IntegrityError:
+            # Another writer created the row first, and bumped it
+            pass
+
+
+def current(names):
+    """{name: (version, updated_at)}; collections never touched are (0, None)."""
+    rows = CollectionVersion.objects.filter(name__in=names).values_list('name', 'version', 'updated_at')
+    found = {name: (version, updated_at) for name, version, updated_at in rows}
+    return {name: found.get(name, (0, None)) for name in names}
+
+
+def conditional(*names, key=None):
+    """View decorator: ETag and Last-Modified from the named collections' versions.
+
+    The ETag also covers the query string, and `key(request)` when given,
+    for responses that depend on something else (e.g. today's date).
+    """
+    def versions(request):
+        # condition() asks for the ETag and Last-Modified separately; read once
+        if not hasattr(request, '_collection_versions'):
+            request._collection_versions = current(names)
+        return request._collection_versions
+
+    def etag(request, *args, **kwargs):
+        parts = [f'{name}.{version}' for name, (version, _) in versions(request).items()]
+        parts.append(request.META.get('QUERY_STRING', ''))
+        if key is not None:
+            parts.append(key(request))
+        return hashlib.blake2b('|'.join(parts).encode(), digest_size=12).hexdigest()
+
+    def last_modified(request, *args, **kwargs):
+        return max((updated_at for _, updated_at in versions(request).values() if updated_at), default=None)
+
+    return condition(etag_func=etag, last_modified_func=last_modified)
@@ -1,15 +1,36 @@
 
 from drf_spectacular.utils import extend_schema
 from rest_framework import status, permissions
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, authentication_classes, permission_classes, renderer_classes, throttle_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.conf import settings
-from django.core.mail import send_mail
 from .models import Device, LostItem, FoundItem, Match, Return, Contact
-from .Serializers import DeviceSerializer
+from .serials import normalize_serial
+from .bloom import serial_lookup
+from .matching import match_lost_item, match_found_item
+from .fuzzy import fuzzy_match_lost_item, fuzzy_match_found_item
+from .registry import link_found_item
+from .exports import EXPORTS, NDJSONRenderer, CSVRenderer, export_rows, stream_csv, stream_ndjson
+from .permissions import IsAuthority
+from .authentication import ApiKeyAuthentication, ApiKeyRateThrottle, HasApiKey
+from .status import ClaimConflict, bulk_claim_matches, bulk_set_status, change_status, claim_match as claim, transition_allowed
+from .search import get_search_backend
+from .versions import conditional
+from .response_cache import cached
+from .serial_search import check_serials, filter_serial_contains, max_results
+from notifications.outbox import queue_emails
+from . import fast_serializers as fast
+from .Serializers import DeviceSerializer, MyDeviceSerializer
 from .Serializers import LostItemSerializer, FoundItemSerializer, MatchSerializer, ReturnSerializer, ContactSerializer
+from .Serializers import LostItemUpdateSerializer, FoundItemUpdateSerializer
+from .Serializers import BulkClaimSerializer, BulkStatusSerializer, BulkResultSerializer
+from .Serializers import SerialCheckSerializer, SerialCheckResultSerializer
 from django.db import transaction
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
+from datetime import datetime
+from rest_framework.renderers import JSONRenderer
+from lost_and_found_tracker.pagination import KeysetPagination, RankedPagination
 
 @extend_schema(
 	tags=["Device"],
@@ -25,12 +46,15 @@ def device_create(request):
 
 @extend_schema(
 	tags=["Device"],
-	responses=DeviceSerializer(many=True))
+	responses=MyDeviceSerializer(many=True))
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def my_devices_list(request):
-	devices = Device.objects.filter(user=request.user)
-	serializer = DeviceSerializer(devices, many=True)
+	devices = Device.objects.filter(user=request.user).prefetch_related(
+		Prefetch('found_items', queryset=FoundItem.objects.only(
+			'id', 'device_id', 'name', 'category', 'district', 'province', 'status', 'date_reported',
+		).order_by('-date_reported', '-id')))
+	serializer = MyDeviceSerializer(devices, many=True)
 	return Response(serializer.data)
 
 @extend_schema(
@@ -39,11 +63,8 @@ def my_devices_list(request):
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
 def device_search(request):
-	serial_number = request.query_params.get('serial_number')
-	if serial_number:
-		devices = Device.objects.filter(serial_number=serial_number)
-	else:
-		devices = Device.objects.none()
+	serial_number = normalize_serial(request.query_params.get('serial_number'))
+	devices = serial_lookup('device', Device.objects.all(), serial_number)
 	serializer = DeviceSerializer(devices, many=True)
 	return Response(serializer.data)
 
@@ -67,6 +88,11 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework import permissions, status
 from rest_framework.response import Response
 
+FIELDS_PARAMETERS = [
+	OpenApiParameter(name='fields', description='Comma-separated response keys to return, e.g. id,title,image', required=False, type=OpenApiTypes.STR),
+	OpenApiParameter(name='view', description='Named field set: card or full (default)', required=False, type=OpenApiTypes.STR),
+]
+
 @extend_schema(
     tags=["Device"],
     request=LostItemSerializer,
@@ -90,59 +116,41 @@ from rest_framework.response import Response
 )
 @api_view(['POST'])
 @permission_classes([permissions.AllowAny])
+@transaction.atomic
 def lostitem_create(request):
     serializer = LostItemSerializer(data=request.data, context={'request': request})
     if serializer.is_valid():
         lost_item = serializer.save()
         # Inverse matching: when a lost item is posted, check for existing found items
         serial_number = getattr(lost_item, 'serial_number', None)
-        if serial_number:
-            matching_found_items = FoundItem.objects.filter(serial_number=serial_number, status='found').order_by('-date_reported')
-            for found_item in matching_found_items:
-                # Create match record if not already exists
-                if not Match.objects.filter(lost_item=lost_item, found_item=found_item).exists():
-                    Match.objects.create(
-                    lost_item=lost_item,
-                    found_item=found_item,
-                    match_status='unclaimed',
-                    loster_name=' '.join([p for p in [getattr(lost_item, 'first_name', None), getattr(lost_item, 'last_name', None)] if p]) or None,
-                    loster_phone_number=getattr(lost_item, 'phone_number', None),
-                    loster_email=getattr(lost_item, 'loster_email', None),
-                    founder_name=' '.join([p for p in [getattr(found_item, 'reporter_first_name', None), getattr(found_item, 'reporter_last_name', None)] if p]) or None,
-                    founder_phone_number=getattr(found_item, 'phone_number', None),
-                    founder_email=getattr(found_item, 'founder_email', None) or getattr(found_item, 'contact_email', None),
-                    device_name=getattr(found_item, 'name', None) or getattr(lost_item, 'title', None),
-                    serial_number=serial_number,
-                    )
-                # Notify both parties if emails are present
-                if getattr(lost_item, 'loster_email', None):
-                    try:
-                        subject = 'Possible Match Found for Your Lost Item'
-                        message = (
-                            f"Hello {lost_item.first_name or 'there'},\n\n"
-                            f"We found a reported found item with the same serial number ({serial_number}).\n"
-                            f"Found item: {found_item.name} in category {found_item.category}.\n\n"
-                            f"Please contact us to verify and arrange collection.\n\n"
-                            f"Best regards,\n"
-                            f"Lost & Found Team"
-                        )
-                        send_mail(subject, message, getattr(settings, 'DEFAULT_FROM_EMAIL', None), [lost_item.loster_email], fail_silently=True)
-                    except Exception as e:
-                        print(f"Failed to send email to loster: {e}")
-                if getattr(found_item, 'founder_email', None):
-                    try:
-                        subject = 'Potential Owner Located for the Found Item'
-                        message = (
-                            f"Hello,\n\n"
-                            f"A lost report matching the serial number ({serial_number}) was posted.\n"
-                            f"Lost item title: {getattr(lost_item, 'title', 'Unknown')}.\n\n"
-                            f"We will facilitate contact to verify ownership.\n\n"
-                            f"Best regards,\n"
-                            f"Lost & Found Team"
-                        )
-                        send_mail(subject, message, getattr(settings, 'DEFAULT_FROM_EMAIL', None), [found_item.founder_email], fail_silently=True)
-                    except Exception as e:
-                        print(f"Failed to send email to founder: {e}")
+        emails = []
+        for found_item in match_lost_item(lost_item):
+            # Notify both parties if emails are present
+            if getattr(lost_item, 'loster_email', None):
+                subject = 'Possible Match Found for Your Lost Item'
+                message = (
+                    f"Hello {lost_item.first_name or 'there'},\n\n"
+                    f"We found a reported found item with the same serial number ({serial_number}).\n"
+                    f"Found item: {found_item.name} in category {found_item.category}.\n\n"
+                    f"Please contact us to verify and arrange collection.\n\n"
+                    f"Best regards,\n"
+                    f"Lost & Found Team"
+                )
+                emails.append((subject, message, [lost_item.loster_email]))
+            if getattr(found_item, 'founder_email', None):
+                subject = 'Potential Owner Located for the Found Item'
+                message = (
+                    f"Hello,\n\n"
+                    f"A lost report matching the serial number ({serial_number}) was posted.\n"
+                    f"Lost item title: {getattr(lost_item, 'title', 'Unknown')}.\n\n"
+                    f"We will facilitate contact to verify ownership.\n\n"
+                    f"Best regards,\n"
+                    f"Lost & Found Team"
+                )
+                emails.append((subject, message, [found_item.founder_email]))
+        queue_emails(emails)
+        # Scored matches for staff review; no email since nothing is certain
+        fuzzy_match_lost_item(lost_item)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -151,7 +159,7 @@ def lostitem_create(request):
 
 @extend_schema(
     tags=["Device"],
-    request=LostItemSerializer, responses=LostItemSerializer)
+    request=LostItemUpdateSerializer, responses=LostItemSerializer)
 @api_view(['PUT', 'PATCH'])
 @permission_classes([permissions.AllowAny])
 def lostitem_update(request, id):
@@ -160,30 +168,19 @@ def lostitem_update(request, id):
     except LostItem.DoesNotExist:
         return Response({'detail': 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
     partial = request.method == 'PATCH'
-    serializer = LostItemSerializer(item, data=request.data, partial=partial, context={'request': request})
+    serializer = LostItemUpdateSerializer(item, data=request.data, partial=partial, context={'request': request})
     if serializer.is_valid():
-        previous_status = item.status
-        updated_item = serializer.save()
-        new_status = updated_item.status
-        # Enforce simple status transitions and side effects
-        if new_status != previous_status:
-            allowed = {
-                'lost': ['claimed'],
-                'claimed': [],
-                'found': ['claimed'],
-            }
-            if previous_status in allowed and new_status not in allowed[previous_status]:
-                # revert and inform client
-                updated_item.status = previous_status
-                updated_item.save(update_fields=['status'])
+        with transaction.atomic():
+            # Checked against the locked row, so a concurrent change can't be skipped over
+            serializer.instance = LostItem.objects.select_for_update().get(id=item.id)
+            # Applied through devices.status below, not by save()
+            new_status = serializer.validated_data.pop('status', serializer.instance.status)
+            if new_status != serializer.instance.status and not transition_allowed(LostItem, serializer.instance.status, new_status):
                 return Response({'detail': 'Invalid status transition'}, status=status.HTTP_400_BAD_REQUEST)
-
-            # If transitioning to claimed, mark matched counterparts as claimed too
-            if new_status == 'claimed':
-                serial_number = getattr(updated_item, 'serial_number', None)
-                if serial_number:
-                    matched_found = FoundItem.objects.filter(serial_number=serial_number)
-                    matched_found.update(status='claimed')
+            updated_item = serializer.save()
+            if new_status != updated_item.status:
+                change_status(LostItem, [updated_item.id], new_status, user=_acting_user(request))
+                updated_item.refresh_from_db(fields=['status', 'updated_at'])
         return Response(LostItemSerializer(updated_item).data)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -200,21 +197,26 @@ def lostitem_delete(request, id):
     item.delete()
     return Response(status=status.HTTP_204_NO_CONTENT)
 
+@conditional('lost_items')
 @extend_schema(
 	tags=["Device"],
+	parameters=FIELDS_PARAMETERS,
 	responses=LostItemSerializer(many=True))
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
+@cached('lost_items')
 def lostitem_list(request):
-	items = LostItem.objects.all().order_by('-date_reported')
-	serializer = LostItemSerializer(items, many=True)
-	return Response(serializer.data)
+	serializer = fast.lost_items.for_request(request)
+	paginator = KeysetPagination(ordering=('-date_reported', '-id'))
+	rows = paginator.paginate_queryset(serializer.values(LostItem.objects.all()), request)
+	return paginator.get_paginated_response(serializer.serialize(rows))
 
 @extend_schema(
 	tags=["Device"],
 	responses=LostItemSerializer)
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
+@cached('lost_items:{id}')
 def lostitem_detail(request, id):
 	try:
 		item = LostItem.objects.get(id=id)
@@ -235,106 +237,113 @@ def lostitem_delete(request, id):
 	item.delete()
 	return Response(status=status.HTTP_204_NO_CONTENT)
 
+SEARCH_PARAMETERS = [
+	OpenApiParameter(name='q', description='Full-text query over title/name, brand, description, location and serial; each word matches as a prefix', required=False, type=OpenApiTypes.STR),
+	OpenApiParameter(name='category', description='Category (case-insensitive, partial)', required=False, type=OpenApiTypes.STR),
+	OpenApiParameter(name='serial_number', description='Serial number (partial)', required=False, type=OpenApiTypes.STR),
+	OpenApiParameter(name='status', description='Item status', required=False, type=OpenApiTypes.STR),
+	OpenApiParameter(name='page', description='Result page when q is given', required=False, type=OpenApiTypes.INT),
+	OpenApiParameter(name='page_size', description='Results per page', required=False, type=OpenApiTypes.INT),
+	*FIELDS_PARAMETERS,
+]
+
+
+def _item_search(request, kind, model, serializer, default_status):
+	serializer = serializer.for_request(request)
+	# `name` and `color` are older aliases; both just add words to the text query
+	text = ' '.join(
+		request.query_params.get(param) for param in ('q', 'name', 'color') if request.query_params.get(param)
+	)
+	category = request.query_params.get('category')
+	serial_number = request.query_params.get('serial_number')
+	item_status = request.query_params.get('status', default_status)
+	filters = {}
+	if category:
+		filters['category__icontains'] = category
+	if item_status:
+		filters['status'] = item_status
+
+	if text.strip():
+		if serial_number:
+			text = f"{text} {normalize_serial(serial_number) or ''}"
+		paginator = RankedPagination()
+		limit, offset = paginator.get_window(request)
+		ids = paginator.paginate_ids(get_search_backend().search(kind, text, filters, limit=limit, offset=offset))
+		return paginator.get_paginated_response(serializer.serialize_ids(model.objects.all(), ids))
+
+	queryset = model.objects.filter(**filters)
+	if serial_number:
+		queryset = filter_serial_contains(queryset, kind, serial_number)
+	paginator = KeysetPagination(ordering=('-date_reported', '-id'))
+	rows = paginator.paginate_queryset(serializer.values(queryset), request)
+	return paginator.get_paginated_response(serializer.serialize(rows))
+
+
 @extend_schema(
 	tags=["Device"],
+	parameters=SEARCH_PARAMETERS,
 	responses=LostItemSerializer(many=True))
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
 def lostitem_search(request):
-	name = request.query_params.get('name')
-	category = request.query_params.get('category')
-	color = request.query_params.get('color')
-	serial_number = request.query_params.get('serial_number')
-	status = request.query_params.get('status', 'lost')  # Default to lost
-	
-	queryset = LostItem.objects.all()
-	if name:
-		queryset = queryset.filter(name__icontains=name)
-	if category:
-		queryset = queryset.filter(category__icontains=category)
-	if color:
-		queryset = queryset.filter(color__icontains=color)
-	if serial_number:
-		queryset = queryset.filter(serial_number__icontains=serial_number)
-	if status:
-		queryset = queryset.filter(status=status)
-	
-	serializer = LostItemSerializer(queryset, many=True)
-	return Response(serializer.data)
+	return _item_search(request, 'lost', LostItem, fast.lost_items, default_status='lost')
 
 @extend_schema(
 	tags=["Device"],
     request=FoundItemSerializer, responses=FoundItemSerializer)
 @api_view(['POST'])
 @permission_classes([permissions.AllowAny])
+@transaction.atomic
 def founditem_create(request):
 	serializer = FoundItemSerializer(data=request.data, context={'request': request})
 	if serializer.is_valid():
 		found_item = serializer.save()
+		# Tell the owner if the serial is in the device registry
+		link_found_item(found_item)
 		serial_number = getattr(found_item, 'serial_number', None)
-		if serial_number:
-			# Check for matching lost items with same serial number
-			matching_lost_items = LostItem.objects.filter(serial_number=serial_number, status='lost').order_by('-date_reported')
+		emails = []
+		# Check for matching lost items with same serial number
+		for lost_item in match_found_item(found_item):
+			# Send email to loster if email is provided
+			if getattr(lost_item, 'loster_email', None):
+				subject = 'Good News! Your Lost Item May Have Been Found'
+				message = (
+					f"Hello {lost_item.first_name or 'there'},\n\n"
+					f"We have great news! A found item with serial number {serial_number} "
+					f"has been reported that matches your lost {lost_item.title}.\n\n"
+					f"Found item details:\n"
+					f"- Name: {found_item.name}\n"
+					f"- Category: {found_item.category}\n"
+					f"- Description: {found_item.description or 'No description provided'}\n\n"
+					f"Please contact us to verify if this is your item and arrange for pickup.\n\n"
+					f"Best regards,\n"
+					f"Lost & Found Team"
+				)
+				emails.append((subject, message, [lost_item.loster_email]))
 			
-			for lost_item in matching_lost_items:
-				# Create match record with default unclaimed status
-				Match.objects.create(
-                    lost_item=lost_item,
-                    found_item=found_item,
-                    match_status='unclaimed',
-                    loster_name=' '.join([p for p in [getattr(lost_item, 'first_name', None), getattr(lost_item, 'last_name', None)] if p]) or None,
-                    loster_phone_number=getattr(lost_item, 'phone_number', None),
-                    loster_email=getattr(lost_item, 'loster_email', None),
-                    founder_name=' '.join([p for p in [getattr(found_item, 'reporter_first_name', None), getattr(found_item, 'reporter_last_name', None)] if p]) or None,
-                    founder_phone_number=getattr(found_item, 'phone_number', None),
-                    founder_email=getattr(found_item, 'founder_email', None) or getattr(found_item, 'contact_email', None),
-                    device_name=getattr(found_item, 'name', None) or getattr(lost_item, 'title', None),
-                    serial_number=serial_number,
-                )
-				
-				# Send email to loster if email is provided
-				if getattr(lost_item, 'loster_email', None):
-					try:
-						subject = 'Good News! Your Lost Item May Have Been Found'
-						message = (
-							f"Hello {lost_item.first_name or 'there'},\n\n"
-							f"We have great news! A found item with serial number {serial_number} "
-							f"has been reported that matches your lost {lost_item.title}.\n\n"
-							f"Found item details:\n"
-							f"- Name: {found_item.name}\n"
-							f"- Category: {found_item.category}\n"
-							f"- Description: {found_item.description or 'No description provided'}\n\n"
-							f"Please contact us to verify if this is your item and arrange for pickup.\n\n"
-							f"Best regards,\n"
-							f"Lost & Found Team"
-						)
-						send_mail(subject, message, getattr(settings, 'DEFAULT_FROM_EMAIL', None), [lost_item.loster_email], fail_silently=False)
-					except Exception as e:
-						print(f"Failed to send email to loster: {e}")
-				
-				# Send email to founder if email is provided
-				if getattr(found_item, 'founder_email', None):
-					try:
-						subject = 'Thank You! Your Found Item Report May Help Someone'
-						message = (
-							f"Hello {(getattr(found_item, 'reporter_first_name', None) or 'there')},\n\n"
-							f"Thank you for reporting the found item: {found_item.name}.\n\n"
-							f"We found a potential match with a lost item that has the same serial number ({serial_number}).\n"
-							f"The owner has been notified and may contact us soon.\n\n"
-							f"Please keep the item safe until we can arrange for verification and return.\n\n"
-							f"Thank you for your kindness!\n\n"
-							f"Best regards,\n"
-							f"Lost & Found Team"
-						)
-						send_mail(subject, message, getattr(settings, 'DEFAULT_FROM_EMAIL', None), [found_item.founder_email], fail_silently=False)
-					except Exception as e:
-						print(f"Failed to send email to founder: {e}")
+			# Send email to founder if email is provided
+			if getattr(found_item, 'founder_email', None):
+				subject = 'Thank You! Your Found Item Report May Help Someone'
+				message = (
+					f"Hello {(getattr(found_item, 'reporter_first_name', None) or 'there')},\n\n"
+					f"Thank you for reporting the found item: {found_item.name}.\n\n"
+					f"We found a potential match with a lost item that has the same serial number ({serial_number}).\n"
+					f"The owner has been notified and may contact us soon.\n\n"
+					f"Please keep the item safe until we can arrange for verification and return.\n\n"
+					f"Thank you for your kindness!\n\n"
+					f"Best regards,\n"
+					f"Lost & Found Team"
+				)
+				emails.append((subject, message, [found_item.founder_email]))
+		queue_emails(emails)
+		# Scored matches for staff review; no email since nothing is certain
+		fuzzy_match_found_item(found_item)
 		return Response(serializer.data, status=status.HTTP_201_CREATED)
 	return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 @extend_schema(
     tags=["Device"],
-    request=FoundItemSerializer, responses=FoundItemSerializer)
+    request=FoundItemUpdateSerializer, responses=FoundItemSerializer)
 @api_view(['PUT', 'PATCH'])
 @permission_classes([permissions.AllowAny])
 def founditem_update(request, id):
@@ -343,28 +352,19 @@ def founditem_update(request, id):
     except FoundItem.DoesNotExist:
         return Response({'detail': 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
     partial = request.method == 'PATCH'
-    serializer = FoundItemSerializer(item, data=request.data, partial=partial, context={'request': request})
+    serializer = FoundItemUpdateSerializer(item, data=request.data, partial=partial, context={'request': request})
     if serializer.is_valid():
-        previous_status = item.status
-        updated_item = serializer.save()
-        new_status = updated_item.status
-        # Enforce simple status transitions and side effects
-        if new_status != previous_status:
-            allowed = {
-                'found': ['claimed'],
-                'claimed': [],
-                'lost': ['claimed'],
-            }
-            if previous_status in allowed and new_status not in allowed[previous_status]:
-                updated_item.status = previous_status
-                updated_item.save(update_fields=['status'])
+        with transaction.atomic():
+            # Checked against the locked row, so a concurrent change can't be skipped over
+            serializer.instance = FoundItem.objects.select_for_update().get(id=item.id)
+            # Applied through devices.status below, not by save()
+            new_status = serializer.validated_data.pop('status', serializer.instance.status)
+            if new_status != serializer.instance.status and not transition_allowed(FoundItem, serializer.instance.status, new_status):
                 return Response({'detail': 'Invalid status transition'}, status=status.HTTP_400_BAD_REQUEST)
-
-            if new_status == 'claimed':
-                serial_number = getattr(updated_item, 'serial_number', None)
-                if serial_number:
-                    matched_lost = LostItem.objects.filter(serial_number=serial_number)
-                    matched_lost.update(status='claimed')
+            updated_item = serializer.save()
+            if new_status != updated_item.status:
+                change_status(FoundItem, [updated_item.id], new_status, user=_acting_user(request))
+                updated_item.refresh_from_db(fields=['status', 'updated_at'])
         return Response(FoundItemSerializer(updated_item).data)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -381,21 +381,26 @@ def founditem_delete(request, id):
     item.delete()
     return Response(status=status.HTTP_204_NO_CONTENT)
 
+@conditional('found_items')
 @extend_schema(
 	tags=["Device"],
+	parameters=FIELDS_PARAMETERS,
 	responses=FoundItemSerializer(many=True))
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
+@cached('found_items')
 def founditem_list(request):
-	items = FoundItem.objects.all().order_by('-date_reported')
-	serializer = FoundItemSerializer(items, many=True)
-	return Response(serializer.data)
+	serializer = fast.found_items.for_request(request)
+	paginator = KeysetPagination(ordering=('-date_reported', '-id'))
+	rows = paginator.paginate_queryset(serializer.values(FoundItem.objects.all()), request)
+	return paginator.get_paginated_response(serializer.serialize(rows))
 
 @extend_schema(
 	tags=["Device"],
 	responses=FoundItemSerializer)
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
+@cached('found_items:{id}')
 def founditem_detail(request, id):
 	try:
 		item = FoundItem.objects.get(id=id)
@@ -418,30 +423,12 @@ def founditem_delete(request, id):
 
 @extend_schema(
 	tags=["Device"],
+	parameters=SEARCH_PARAMETERS,
 	responses=FoundItemSerializer(many=True))
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
 def founditem_search(request):
-	name = request.query_params.get('name')
-	category = request.query_params.get('category')
-	color = request.query_params.get('color')
-	serial_number = request.query_params.get('serial_number')
-	status = request.query_params.get('status', 'found')  # Default to found
-	
-	queryset = FoundItem.objects.all()
-	if name:
-		queryset = queryset.filter(name__icontains=name)
-	if category:
-		queryset = queryset.filter(category__icontains=category)
-	if color:
-		queryset = queryset.filter(color__icontains=color)
-	if serial_number:
-		queryset = queryset.filter(serial_number__icontains=serial_number)
-	if status:
-		queryset = queryset.filter(status=status)
-	
-	serializer = FoundItemSerializer(queryset, many=True)
-	return Response(serializer.data)
+	return _item_search(request, 'found', FoundItem, fast.found_items, default_status='found')
 
 @extend_schema(
 	tags=["Device"],
@@ -459,15 +446,19 @@ def match_create(request):
 		return Response(MatchSerializer(match).data, status=status.HTTP_201_CREATED)
 	return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+@conditional('matches')
 @extend_schema(
 	tags=["Device"],
+	parameters=FIELDS_PARAMETERS,
 	responses=MatchSerializer(many=True))
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
+@cached('matches')
 def match_list(request):
-    matches = Match.objects.select_related('lost_item', 'found_item').all().order_by('-match_date')
-    serializer = MatchSerializer(matches, many=True)
-    return Response(serializer.data)
+    serializer = fast.matches.for_request(request)
+    paginator = KeysetPagination(ordering=('-match_date', '-id'))
+    rows = paginator.paginate_queryset(serializer.values(Match.objects.all()), request)
+    return paginator.get_paginated_response(serializer.serialize(rows))
 
 
 @extend_schema(
@@ -481,43 +472,71 @@ def claim_match(request):
     if not match_id:
         return Response({'detail': 'match_id is required'}, status=status.HTTP_400_BAD_REQUEST)
     try:
-        match = Match.objects.select_related('lost_item', 'found_item').get(id=match_id)
-    except Match.DoesNotExist:
+        match = claim(match_id, user=request.user, notes=request.data.get('notes'))
+    except (Match.DoesNotExist, ValueError):
         return Response({'detail': 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
+    except ClaimConflict as e:
+        return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(MatchSerializer(match).data)
 
-    if match.match_status == 'claimed':
-        return Response({'detail': 'Already claimed'}, status=status.HTTP_400_BAD_REQUEST)
-
-    with transaction.atomic():
-        match.match_status = 'claimed'
-        match.save(update_fields=['match_status'])
-
-        # Update item statuses
-        if match.lost_item:
-            match.lost_item.status = 'claimed'
-            match.lost_item.save(update_fields=['status'])
-        if match.found_item:
-            match.found_item.status = 'claimed'
-            match.found_item.save(update_fields=['status'])
-
-        # Create Return record
-        owner = match.lost_item.user if match.lost_item and match.lost_item.user else None
-        finder = match.found_item.user if match.found_item and match.found_item.user else None
-        Return.objects.create(
-            lost_item=match.lost_item,
-            found_item=match.found_item,
-            owner=owner,
-            finder=finder,
-            confirmation=True,
-            claimed_by=request.user,
-            notes=request.data.get('notes'),
-            owner_email=getattr(match.lost_item, 'loster_email', None),
-            owner_name=' '.join([p for p in [getattr(match.lost_item, 'first_name', None), getattr(match.lost_item, 'last_name', None)] if p]) or None,
-            finder_email=getattr(match.found_item, 'founder_email', None),
-            finder_name=' '.join([p for p in [getattr(match.found_item, 'reporter_first_name', None), getattr(match.found_item, 'reporter_last_name', None)] if p]) or None,
-        )
 
-    return Response(MatchSerializer(match).data)
+def _bulk_response(results):
+    return Response(BulkResultSerializer({
+        'updated': sum(1 for error in results.values() if error is None),
+        'results': [
+            {'id': pk, 'ok': error is None, **({'detail': error} if error else {})}
+            for pk, error in results.items()
+        ],
+    }).data)
+
+
+@extend_schema(
+    tags=["Device"],
+    request=BulkClaimSerializer,
+    responses=BulkResultSerializer,
+)
+@api_view(['POST'])
+@permission_classes([IsAuthority])
+def claim_match_bulk(request):
+    serializer = BulkClaimSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    data = serializer.validated_data
+    return _bulk_response(bulk_claim_matches(data['ids'], user=request.user, notes=data.get('notes')))
+
+
+def _acting_user(request):
+    return request.user if request.user.is_authenticated else None
+
+
+def _bulk_status(request, model):
+    serializer = BulkStatusSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    data = serializer.validated_data
+    return _bulk_response(bulk_set_status(model, data['ids'], data['status'], user=request.user))
+
+
+@extend_schema(
+    tags=["Device"],
+    request=BulkStatusSerializer,
+    responses=BulkResultSerializer,
+)
+@api_view(['PATCH'])
+@permission_classes([IsAuthority])
+def lostitem_bulk_update(request):
+    return _bulk_status(request, LostItem)
+
+
+@extend_schema(
+    tags=["Device"],
+    request=BulkStatusSerializer,
+    responses=BulkResultSerializer,
+)
+@api_view(['PATCH'])
+@permission_classes([IsAuthority])
+def founditem_bulk_update(request):
+    return _bulk_status(request, FoundItem)
 
 
 @extend_schema(
@@ -526,9 +545,10 @@ def claim_match(request):
 )
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
+@cached('matches:{id}')
 def match_detail(request, id):
     try:
-        match = Match.objects.select_related('lost_item', 'found_item').get(id=id)
+        match = Match.objects.only(*Match.READ_FIELDS).get(id=id)
     except Match.DoesNotExist:
         return Response({'detail': 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
     return Response(MatchSerializer(match).data)
@@ -554,6 +574,7 @@ def match_delete(request, id):
     request=None,
     parameters=[
         OpenApiParameter(name='email', description='Owner email', required=True, type=OpenApiTypes.STR),
+        *FIELDS_PARAMETERS,
     ],
     responses=LostItemSerializer(many=True),
 )
@@ -564,7 +585,8 @@ def lostitem_by_email(request):
     if not email:
         return Response({'error': 'email query parameter is required'}, status=status.HTTP_400_BAD_REQUEST)
     items = LostItem.objects.filter(loster_email=email).order_by('-date_reported')
-    return Response(LostItemSerializer(items, many=True).data)
+    serializer = fast.lost_items.for_request(request)
+    return Response(serializer.serialize(serializer.values(items)))
 
 
 @extend_schema(
@@ -572,6 +594,7 @@ def lostitem_by_email(request):
     request=None,
     parameters=[
         OpenApiParameter(name='email', description='Finder email', required=True, type=OpenApiTypes.STR),
+        *FIELDS_PARAMETERS,
     ],
     responses=FoundItemSerializer(many=True),
 )
@@ -582,7 +605,8 @@ def founditem_by_email(request):
     if not email:
         return Response({'error': 'email query parameter is required'}, status=status.HTTP_400_BAD_REQUEST)
     items = FoundItem.objects.filter(founder_email=email).order_by('-date_reported')
-    return Response(FoundItemSerializer(items, many=True).data)
+    serializer = fast.found_items.for_request(request)
+    return Response(serializer.serialize(serializer.values(items)))
 
 @extend_schema(
 	tags=["Device"],
@@ -601,10 +625,12 @@ def return_create(request):
 	responses=ReturnSerializer(many=True))
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
+@cached('returns')
 def return_list(request):
-	returns = Return.objects.all().order_by('-return_date')
+	paginator = KeysetPagination(ordering=('-return_date', '-id'))
+	returns = paginator.paginate_queryset(Return.objects.all(), request)
 	serializer = ReturnSerializer(returns, many=True)
-	return Response(serializer.data)
+	return paginator.get_paginated_response(serializer.data)
 
 
 @extend_schema(
@@ -626,9 +652,10 @@ def contact_create(request):
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
 def contact_list(request):
-	contacts = Contact.objects.all().order_by('-created_at')
+	paginator = KeysetPagination(ordering=('-created_at', '-id'))
+	contacts = paginator.paginate_queryset(Contact.objects.all(), request)
 	serializer = ContactSerializer(contacts, many=True)
-	return Response(serializer.data)
+	return paginator.get_paginated_response(serializer.data)
 
 @extend_schema(
 	tags=["Contact"],
@@ -646,30 +673,33 @@ def contact_delete(request, id):
 
 @extend_schema(
 	tags=["Device"],
+	parameters=FIELDS_PARAMETERS,
 	responses=LostItemSerializer(many=True))
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
 def lostitem_filter_by_status(request):
 	status = request.query_params.get('status', 'lost')
 	items = LostItem.objects.filter(status=status).order_by('-date_reported')
-	serializer = LostItemSerializer(items, many=True)
-	return Response(serializer.data)
+	serializer = fast.lost_items.for_request(request)
+	return Response(serializer.serialize(serializer.values(items)))
 
 
 @extend_schema(
 	tags=["Device"],
+	parameters=FIELDS_PARAMETERS,
 	responses=FoundItemSerializer(many=True))
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
 def founditem_filter_by_status(request):
 	status = request.query_params.get('status', 'found')
 	items = FoundItem.objects.filter(status=status).order_by('-date_reported')
-	serializer = FoundItemSerializer(items, many=True)
-	return Response(serializer.data)
+	serializer = fast.found_items.for_request(request)
+	return Response(serializer.serialize(serializer.values(items)))
 
 
 @extend_schema(
 	tags=["Device"],
+	parameters=FIELDS_PARAMETERS,
 	responses=LostItemSerializer(many=True))
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
@@ -678,25 +708,82 @@ def search_by_serial_number(request):
 	if not serial_number:
 		return Response({'error': 'serial_number parameter is required'}, status=status.HTTP_400_BAD_REQUEST)
 	
-	# Search in both lost and found items
-	lost_items = LostItem.objects.filter(serial_number__icontains=serial_number)
-	found_items = FoundItem.objects.filter(serial_number__icontains=serial_number)
-	
-	lost_serializer = LostItemSerializer(lost_items, many=True)
-	found_serializer = FoundItemSerializer(found_items, many=True)
+	normalized = normalize_serial(serial_number)
+	if not normalized:
+		return Response({'lost_items': [], 'found_items': []})
+
+	# Search in both lost and found items, newest first, capped per kind
+	lost_serializer, found_serializer = fast.for_request(request, fast.lost_items, fast.found_items)
+	limit = max_results()
+	lost_items = filter_serial_contains(LostItem.objects.all(), 'lost', normalized).order_by('-date_reported', '-id')
+	found_items = filter_serial_contains(FoundItem.objects.all(), 'found', normalized).order_by('-date_reported', '-id')
 	
 	return Response({
-		'lost_items': lost_serializer.data,
-		'found_items': found_serializer.data
+		'lost_items': lost_serializer.serialize(lost_serializer.values(lost_items)[:limit]),
+		'found_items': found_serializer.serialize(found_serializer.values(found_items)[:limit]),
 	})
 
 
+@extend_schema(
+	tags=["Device"],
+	request=SerialCheckSerializer,
+	responses=SerialCheckResultSerializer)
+@api_view(['POST'])
+@authentication_classes([ApiKeyAuthentication])
+@permission_classes([HasApiKey])
+@throttle_classes([ApiKeyRateThrottle])
+def serial_check(request):
+	"""Check a batch of serials, e.g. a partner's intake, in one request."""
+	serializer = SerialCheckSerializer(data=request.data)
+	if not serializer.is_valid():
+		return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+	return Response({'results': check_serials(serializer.validated_data['serials'])})
+
+
 @extend_schema(
 	tags=["Device"],
 	responses=LostItemSerializer(many=True))
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
+@cached()
 def get_categories(request):
 	from .models import CATEGORY_CHOICES
 	return Response({'categories': [{'value': choice[0], 'label': choice[1]} for choice in CATEGORY_CHOICES]})
 
+
+
+@extend_schema(
+	tags=["Device"],
+	parameters=[
+		OpenApiParameter(name='format', description='ndjson (default) or csv', required=False, type=OpenApiTypes.STR),
+		OpenApiParameter(name='status', description='Only rows with this status', required=False, type=OpenApiTypes.STR),
+		OpenApiParameter(name='date_from', description='YYYY-MM-DD, inclusive', required=False, type=OpenApiTypes.DATE),
+		OpenApiParameter(name='date_to', description='YYYY-MM-DD, inclusive', required=False, type=OpenApiTypes.DATE),
+	],
+	responses={200: OpenApiTypes.STR})
+@api_view(['GET'])
+@renderer_classes([NDJSONRenderer, CSVRenderer, JSONRenderer])
+@permission_classes([IsAuthority])
+def export_resource(request, resource):
+	if resource not in EXPORTS:
+		return Response({'detail': 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
+	export_format = request.query_params.get('format', 'ndjson')
+	if export_format not in ('ndjson', 'csv'):
+		return Response({'error': 'format must be ndjson or csv'}, status=status.HTTP_400_BAD_REQUEST)
+
+	dates = {}
+	for param in ('date_from', 'date_to'):
+		raw = request.query_params.get(param)
+		if raw:
+			try:
+				dates[param] = datetime.strptime(raw, '%Y-%m-%d').date()
+			except ValueError:
+				return Response({'error': f'{param} must be YYYY-MM-DD'}, status=status.HTTP_400_BAD_REQUEST)
+
+	columns, rows = export_rows(resource, status=request.query_params.get('status'), **dates)
+	if export_format == 'csv':
+		response = StreamingHttpResponse(stream_csv(columns, rows), content_type='text/csv')
+	else:
+		response = StreamingHttpResponse(stream_ndjson(rows), content_type='application/x-ndjson')
+	response['Content-Disposition'] = f'attachment; filename="{resource}.{export_format}"'
+	return response
@@ -0,0 +1,165 @@
+import base64
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def get_page_size(request, param='page_size'):
+    default = getattr(settings, 'API_PAGE_SIZE', 50)
+    maximum = getattr(settings, 'API_MAX_PAGE_SIZE', 200)
+    try:
+        page_size = int(request.query_params.get(param, default))
+    except (TypeError, ValueError):
+        page_size = default
+    return max(1, min(page_size, maximum))
+
+
+class KeysetPagination(BasePagination):
+    """Opaque cursor pagination over a (timestamp, id) style ordering.
+
+    Each page is a range read past the last row of the previous page, so it
+    costs the same no matter how deep the client has scrolled.
+
+        paginator = KeysetPagination(ordering=('-date_reported', '-id'))
+        page = paginator.paginate_queryset(queryset, request)
+        return paginator.get_paginated_response(Serializer(page, many=True).data)
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self, ordering=('-created_at', '-id')):
+        directions = {field.startswith('-') for field in ordering}
+        if len(directions) != 1:
+            raise ValueError('KeysetPagination ordering fields must share one direction')
+        self.ordering = tuple(ordering)
+        self.fields = [field.lstrip('-') for field in ordering]
+        self.descending = directions.pop()
+
+    def get_page_size(self, request):
+        return get_page_size(request, self.page_size_query_param)
+
+    def encode_cursor(self, values):
+        raw = json.dumps([v.isoformat() if hasattr(v, 'isoformat') else v for v in values])
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.fields):
+            raise NotFound(self.invalid_cursor_message)
+        return values
+
+    def to_python(self, model, values):
+        """Cursor values as the ordering fields' Python types; a tampered cursor is a 404."""
+        try:
+            values = [model._meta.get_field(field).to_python(value) for field, value in zip(self.fields, values)]
+        except (ValidationError, ValueError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+        if any(value is None for value in values):
+            raise NotFound(self.invalid_cursor_message)
+        return values
+
+    def _after(self, values):
+        # (a, b) < (x, y)  ==  a < x OR (a = x AND b < y), which the index can range-scan
+        op = 'lt' if self.descending else 'gt'
+        condition = Q()
+        for i, field in enumerate(self.fields):
+            term = Q(**{f'{field}__{op}': values[i]})
+            for prev_field, prev_value in zip(self.fields[:i], values[:i]):
+                term &= Q(**{prev_field: prev_value})
+            condition |= term
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        queryset = queryset.order_by(*self.ordering)
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            queryset = queryset.filter(self._after(self.to_python(queryset.model, cursor)))
+        rows = list(queryset[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        return self.page
+
+    def _row_values(self, row):
+        if isinstance(row, dict):
+            return [row[field] for field in self.fields]
+        return [getattr(row, field) for field in self.fields]
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self._row_values(self.page[-1])))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class RankedPagination(BasePagination):
+    """Page-number pagination for relevance-ranked results (e.g. full-text search).
+
+    Ranked ids come from a backend rather than a queryset, so the caller asks
+    for the (limit, offset) window and hands back what it fetched:
+
+        paginator = RankedPagination()
+        limit, offset = paginator.get_window(request)
+        ids = paginator.paginate_ids(backend.search(..., limit=limit, offset=offset))
+    """
+    page_query_param = 'page'
+    page_size_query_param = 'page_size'
+
+    def get_window(self, request):
+        self.request = request
+        self.page_size = get_page_size(request, self.page_size_query_param)
+        try:
+            self.page_number = max(1, int(request.query_params.get(self.page_query_param, 1)))
+        except (TypeError, ValueError):
+            raise NotFound('Invalid page')
+        # one extra row tells us whether there is a next page
+        return self.page_size + 1, (self.page_number - 1) * self.page_size
+
+    def paginate_ids(self, ids):
+        self.has_next = len(ids) > self.page_size
+        return list(ids[:self.page_size])
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.page_query_param, self.page_number + 1)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return KeysetPagination.get_paginated_response_schema(self, schema)
@@ -90,6 +90,13 @@ DATABASES = {
     "default": dj_database_url.parse(DATABASE_URL, conn_max_age=600)
 }
 
+if DATABASES["default"]["ENGINE"] == "django.db.backends.sqlite3":
+    # Take the write lock when a transaction starts, so concurrent writers
+    # queue up instead of failing to upgrade a read lock, and run tests on
+    # a file so threaded tests share one database
+    DATABASES["default"].setdefault("OPTIONS", {})["transaction_mode"] = "IMMEDIATE"
+    DATABASES["default"]["TEST"] = {"NAME": f"{DATABASES['default']['NAME']}.test"}
+
 # ==========================
 # Password validation
 # ==========================
@@ -148,8 +155,47 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.AllowAny',
     ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    # Per partner API key (devices.authentication.ApiKeyRateThrottle)
+    'DEFAULT_THROTTLE_RATES': {
+        'partner': '120/min',
+    },
 }
 
+# Cursor-paginated list endpoints: default and maximum ?page_size=
+API_PAGE_SIZE = 50
+API_MAX_PAGE_SIZE = 200
+
+# Full-text search for lost/found items: None picks FTS5 on SQLite and
+# tsvector/GIN on PostgreSQL, or give a dotted path to a devices.search backend
+DEVICES_SEARCH_BACKEND = None
+# Cap on rows returned per item kind by the partial serial lookup
+SERIAL_SEARCH_MAX_RESULTS = 50
+
+# Scored matching for reports without a usable serial (devices.fuzzy)
+FUZZY_MATCH_WINDOW_DAYS = 30
+FUZZY_MATCH_CANDIDATE_LIMIT = 200
+FUZZY_MATCH_MIN_SCORE = 0.5
+FUZZY_MATCH_MAX_MATCHES = 5
+
+# Photo matching (devices.imagehash): max dHash bit difference for a
+# candidate, and seconds before a process reloads its in-memory hash index
+IMAGE_MATCH_MAX_DISTANCE = 7
+IMAGE_INDEX_MAX_AGE = 300
+
+# Bloom filters of stored serials (devices.bloom) let exact-serial lookups
+# skip the database for unknown serials. None enables them only when the
+# default cache is shared between processes. Snapshots written by
+# `manage.py rebuild_serial_filter` are loaded from SERIAL_BLOOM_SNAPSHOT_DIR.
+SERIAL_BLOOM_ENABLED = None
+SERIAL_BLOOM_ERROR_RATE = 0.01
+SERIAL_BLOOM_SNAPSHOT_DIR = os.environ.get('SERIAL_BLOOM_SNAPSHOT_DIR') or None
+
+# Public GET responses are cached (devices.response_cache) and invalidated
+# by model signals. Like the Bloom filters, None enables the cache only when
+# it is shared between processes.
+RESPONSE_CACHE_ENABLED = None
+RESPONSE_CACHE_TIMEOUT = 300
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
@@ -196,6 +242,15 @@ EMAIL_HOST_USER = "egide1234567@gmail.com"
 EMAIL_HOST_PASSWORD = os.getenv("EMAIL_PASSWORD", "uher kgcr lokd vohu")  # Gmail App Password
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 
+# Outgoing mail is queued in notifications.EmailOutbox and delivered by
+# `python manage.py send_outbox`; set EMAIL_OUTBOX_EAGER to send on commit instead.
+EMAIL_OUTBOX_EAGER = config('EMAIL_OUTBOX_EAGER', default=False, cast=bool)
+EMAIL_OUTBOX_BATCH_SIZE = 50
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_BACKOFF_SECONDS = 30
+# A worker that dies mid-batch leaves rows 'sending'; they are retried after this
+EMAIL_OUTBOX_CLAIM_SECONDS = 10 * 60
+
 # ==========================
 # Phone Number
 # ==========================
@@ -204,7 +259,24 @@ PHONENUMBER_DEFAULT_REGION = 'US'
 # ==========================
 # Redis
 # ==========================
-REDIS_URL = "redis://127.0.0.1:6379/0"
+# The shared cache in production (e.g. redis://127.0.0.1:6379/0); without
+# it each process has its own locmem cache. Tests run with
+# lost_and_found_tracker.test_settings, which always uses locmem.
+REDIS_URL = config('REDIS_URL', default='')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
 
 # ==========================
 # AWS S3 (optional for file storage)
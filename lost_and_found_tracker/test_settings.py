@@ -0,0 +1,14 @@
+"""Settings for test runs: `python manage.py test --settings=lost_and_found_tracker.test_settings`
+(or DJANGO_SETTINGS_MODULE for other runners).
+
+Tests never touch a shared cache, even when REDIS_URL is set, so no state
+leaks between runs and the response cache and serial Bloom filters stay off
+unless a test turns them on with override_settings.
+"""
+from .settings import *  # noqa: F401,F403
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
@@ -1,5 +1,6 @@
 
 from django.db import models
+from django.utils import timezone
 from authentication.models import User
 
 class Notification(models.Model):
@@ -8,5 +9,39 @@ class Notification(models.Model):
 	is_read = models.BooleanField(default=False)
 	created_at = models.DateTimeField(auto_now_add=True)
 
+	class Meta:
+		indexes = [
+			models.Index(fields=['user', 'created_at', 'id']),
+		]
+
 	def __str__(self):
 		return f"Notification for {self.user.email}: {self.message[:30]}"
+
+
+class EmailOutbox(models.Model):
+	STATUS_CHOICES = (
+		('pending', 'Pending'),
+		('sending', 'Sending'),
+		('sent', 'Sent'),
+		('failed', 'Failed'),
+	)
+
+	subject = models.CharField(max_length=255)
+	body = models.TextField()
+	html_body = models.TextField(blank=True, null=True)
+	from_email = models.CharField(max_length=254, blank=True, null=True)
+	recipients = models.JSONField(default=list)
+	status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+	attempts = models.PositiveIntegerField(default=0)
+	next_attempt_at = models.DateTimeField(default=timezone.now)
+	last_error = models.TextField(blank=True, null=True)
+	created_at = models.DateTimeField(auto_now_add=True)
+	sent_at = models.DateTimeField(null=True, blank=True)
+
+	class Meta:
+		indexes = [
+			models.Index(fields=['status', 'next_attempt_at']),
+		]
+
+	def __str__(self):
+		return f"Email to {', '.join(self.recipients)}: {self.subject} ({self.status})"
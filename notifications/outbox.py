@@ -0,0 +1,136 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_BACKOFF_SECONDS = 30
+MAX_BACKOFF_SECONDS = 60 * 60
+DEFAULT_CLAIM_SECONDS = 10 * 60
+
+
+def queue_emails(messages):
+    """Queue (subject, message, recipient_list[, html_message]) tuples in one INSERT.
+
+    Rows are written in the caller's transaction, so an email only goes out
+    if the data it talks about was committed.
+    """
+    from_email = getattr(settings, 'DEFAULT_FROM_EMAIL', None)
+    rows = []
+    for subject, message, recipient_list, *rest in messages:
+        recipients = [r for r in recipient_list if r]
+        if recipients:
+            rows.append(EmailOutbox(
+                subject=subject,
+                body=message,
+                html_body=rest[0] if rest else None,
+                from_email=from_email,
+                recipients=recipients,
+            ))
+    if not rows:
+        return []
+    EmailOutbox.objects.bulk_create(rows)
+    if getattr(settings, 'EMAIL_OUTBOX_EAGER', False):
+        # Development convenience: deliver right after the surrounding commit
+        transaction.on_commit(deliver_pending)
+    return rows
+
+
+def queue_email(subject, message, recipient_list, html_message=None):
+    """Queue a single email for the outbox worker instead of talking to SMTP."""
+    rows = queue_emails([(subject, message, recipient_list, html_message)])
+    return rows[0] if rows else None
+
+
+def _backoff(attempts):
+    base = getattr(settings, 'EMAIL_OUTBOX_BACKOFF_SECONDS', DEFAULT_BACKOFF_SECONDS)
+    return timedelta(seconds=min(base * (2 ** (attempts - 1)), MAX_BACKOFF_SECONDS))
+
+
+def _build_message(email, connection):
+    msg = EmailMultiAlternatives(
+        subject=email.subject,
+        body=email.body,
+        from_email=email.from_email,
+        to=email.recipients,
+        connection=connection,
+    )
+    if email.html_body:
+        msg.attach_alternative(email.html_body, 'text/html')
+    return msg
+
+
+def _claim(batch_size, lease):
+    """Mark a batch of due rows 'sending' in one short transaction and return them.
+
+    A claim lasts until next_attempt_at; rows a crashed worker left
+    'sending' are claimed again after that.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True)
+            .filter(status__in=('pending', 'sending'), next_attempt_at__lte=now)
+            .order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        if batch:
+            EmailOutbox.objects.filter(pk__in=[email.pk for email in batch]).update(
+                status='sending', next_attempt_at=now + lease, attempts=F('attempts') + 1,
+            )
+    for email in batch:
+        email.attempts += 1
+    return batch
+
+
+def deliver_pending(batch_size=None):
+    """Send one batch of due outbox emails over a single connection.
+
+    Returns a (sent, failed) tuple. Failed rows are rescheduled with an
+    exponential backoff until EMAIL_OUTBOX_MAX_ATTEMPTS is reached. No
+    transaction is open while talking to SMTP: rows are claimed first and
+    each result is written on its own.
+    """
+    batch_size = batch_size or getattr(settings, 'EMAIL_OUTBOX_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+    max_attempts = getattr(settings, 'EMAIL_OUTBOX_MAX_ATTEMPTS', DEFAULT_MAX_ATTEMPTS)
+    lease = timedelta(seconds=getattr(settings, 'EMAIL_OUTBOX_CLAIM_SECONDS', DEFAULT_CLAIM_SECONDS))
+    sent = failed = 0
+    batch = _claim(batch_size, lease)
+    if not batch:
+        return sent, failed
+
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as e:
+        logger.warning('Email outbox could not open a connection: %s', e)
+        connection = None
+
+    for email in batch:
+        try:
+            if connection is None:
+                raise RuntimeError('no email connection')
+            _build_message(email, connection).send()
+        except Exception as e:
+            failed += 1
+            result = {'last_error': str(e)}
+            if email.attempts >= max_attempts:
+                result['status'] = 'failed'
+            else:
+                result.update(status='pending', next_attempt_at=timezone.now() + _backoff(email.attempts))
+        else:
+            sent += 1
+            result = {'status': 'sent', 'sent_at': timezone.now(), 'last_error': None}
+        EmailOutbox.objects.filter(pk=email.pk).update(**result)
+
+    if connection is not None:
+        connection.close()
+    return sent, failed
@@ -1,3 +1,73 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .models import EmailOutbox
+from .outbox import queue_email, deliver_pending
+
+
+class FailingEmailBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise ConnectionError('smtp unavailable')
+
+
+class StatusRecordingBackend(BaseEmailBackend):
+    seen = []
+
+    def send_messages(self, email_messages):
+        self.seen.extend(EmailOutbox.objects.values_list('status', flat=True))
+        return len(email_messages)
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class EmailOutboxTests(TestCase):
+    def test_queue_does_not_send_until_worker_runs(self):
+        queue_email('Hello', 'Body', ['a@example.com'], html_message='<p>Body</p>')
+        self.assertEqual(len(mail.outbox), 0)
+        sent, failed = deliver_pending()
+        self.assertEqual((sent, failed), (1, 0))
+        self.assertEqual(mail.outbox[0].subject, 'Hello')
+        self.assertEqual(mail.outbox[0].alternatives[0][1], 'text/html')
+        self.assertEqual(EmailOutbox.objects.get().status, 'sent')
+
+    def test_blank_recipients_are_not_queued(self):
+        self.assertIsNone(queue_email('Hello', 'Body', [None, '']))
+        self.assertFalse(EmailOutbox.objects.exists())
+
+    @override_settings(EMAIL_BACKEND='notifications.tests.FailingEmailBackend', EMAIL_OUTBOX_MAX_ATTEMPTS=2)
+    def test_failures_back_off_then_give_up(self):
+        email = queue_email('Hello', 'Body', ['a@example.com'])
+        self.assertEqual(deliver_pending(), (0, 1))
+        email.refresh_from_db()
+        self.assertEqual(email.status, 'pending')
+        self.assertEqual(email.attempts, 1)
+        self.assertGreater(email.next_attempt_at, timezone.now())
+        # not due yet
+        self.assertEqual(deliver_pending(), (0, 0))
+
+        EmailOutbox.objects.update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(deliver_pending(), (0, 1))
+        email.refresh_from_db()
+        self.assertEqual(email.status, 'failed')
+        self.assertIn('smtp unavailable', email.last_error)
+
+    @override_settings(EMAIL_BACKEND='notifications.tests.StatusRecordingBackend')
+    def test_rows_are_claimed_before_sending(self):
+        StatusRecordingBackend.seen = []
+        queue_email('Hello', 'Body', ['a@example.com'])
+        self.assertEqual(deliver_pending(), (1, 0))
+        self.assertEqual(StatusRecordingBackend.seen, ['sending'])
+        self.assertEqual(EmailOutbox.objects.get().status, 'sent')
+
+    def test_stale_claims_are_retried(self):
+        email = queue_email('Hello', 'Body', ['a@example.com'])
+        # A worker died mid-batch, and its claim has not run out yet
+        EmailOutbox.objects.update(status='sending', attempts=1, next_attempt_at=timezone.now() + timedelta(minutes=5))
+        self.assertEqual(deliver_pending(), (0, 0))
+        EmailOutbox.objects.update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(deliver_pending(), (1, 0))
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), ('sent', 2))
@@ -3,6 +3,7 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from lost_and_found_tracker.pagination import KeysetPagination
 from .models import Notification
 from .serializers import NotificationSerializer
 
@@ -18,9 +19,10 @@ class NotificationMarkReadResponseSerializer(Response):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def notification_list(request):
-	notifications = Notification.objects.filter(user=request.user).order_by('-created_at')
+	paginator = KeysetPagination(ordering=('-created_at', '-id'))
+	notifications = paginator.paginate_queryset(Notification.objects.filter(user=request.user), request)
 	serializer = NotificationSerializer(notifications, many=True)
-	return Response(serializer.data)
+	return paginator.get_paginated_response(serializer.data)
 
 @extend_schema(
 	tags=["Notifications"],
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from reports.rollups import ROLLUP_SOURCES, rebuild, rebuild_location_counts
+
+LOCATIONS = 'locations'
+
+
+class Command(BaseCommand):
+    help = 'Recompute MonthlyMetric and LocationCategoryCount rollups from the source tables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'rollups', nargs='*',
+            help=f"Rollups to rebuild (default: all of {', '.join([*ROLLUP_SOURCES, LOCATIONS])}).",
+        )
+
+    def handle(self, *args, **options):
+        requested = set(options['rollups'])
+        unknown = requested - set(ROLLUP_SOURCES) - {LOCATIONS}
+        if unknown:
+            raise CommandError(f"Unknown rollups: {', '.join(sorted(unknown))}")
+
+        metrics = [metric for metric in ROLLUP_SOURCES if metric in requested] if requested else list(ROLLUP_SOURCES)
+        if metrics:
+            written = rebuild(metrics)
+            self.stdout.write(self.style.SUCCESS(f'Rebuilt monthly metrics: {written} month rows written.'))
+        if not requested or LOCATIONS in requested:
+            written = rebuild_location_counts()
+            self.stdout.write(self.style.SUCCESS(f'Rebuilt location counts: {written} day rows written.'))
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.6 on 2026-10-18 12:10
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+
+ROLLUP_SOURCES = {
+    'lost_items': ('devices', 'LostItem', 'date_reported'),
+    'found_items': ('devices', 'FoundItem', 'date_reported'),
+    'matches': ('devices', 'Match', 'match_date'),
+    'returns': ('devices', 'Return', 'return_date'),
+    'new_users': ('authentication', 'User', 'date_joined'),
+}
+
+
+def populate_rollups(apps, schema_editor):
+    MonthlyMetric = apps.get_model('reports', 'MonthlyMetric')
+    rows = []
+    for metric, (app_label, model_name, date_field) in ROLLUP_SOURCES.items():
+        model = apps.get_model(app_label, model_name)
+        qs = (
+            model.objects.annotate(month=TruncMonth(date_field))
+            .values('month')
+            .annotate(total=Count('id'))
+            .order_by()
+        )
+        rows.extend(
+            MonthlyMetric(metric=metric, month=row['month'].date(), total=row['total'])
+            for row in qs
+        )
+    MonthlyMetric.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0002_keyset_pagination_indexes'),
+        ('devices', '0017_keyset_pagination_indexes'),
+        ('reports', '0002_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyMetric',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(choices=[('lost_items', 'Lost items'), ('found_items', 'Found items'), ('matches', 'Matches'), ('returns', 'Returns'), ('new_users', 'New users')], max_length=20)),
+                ('month', models.DateField()),
+                ('total', models.IntegerField(default=0)),
+            ],
+            options={
+                'unique_together': {('month', 'metric')},
+            },
+        ),
+        migrations.RunPython(populate_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.6 on 2026-10-18 13:40
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+LOCATION_SOURCES = {
+    'lost': ('LostItem', 'city_town'),
+    'found': ('FoundItem', 'district'),
+}
+
+
+def populate_location_counts(apps, schema_editor):
+    LocationCategoryCount = apps.get_model('reports', 'LocationCategoryCount')
+    totals = {}
+    for kind, (model_name, location_field) in LOCATION_SOURCES.items():
+        model = apps.get_model('devices', model_name)
+        qs = (
+            model.objects.annotate(day=TruncDate('date_reported'))
+            .values(location_field, 'category', 'status', 'day')
+            .annotate(total=Count('id'))
+            .order_by()
+        )
+        for row in qs:
+            key = (kind, row[location_field] or 'Unknown', row['category'] or 'Unknown', row['status'] or '', row['day'])
+            totals[key] = totals.get(key, 0) + row['total']
+    LocationCategoryCount.objects.bulk_create(
+        LocationCategoryCount(kind=kind, location=location, category=category, status=status, day=day, total=total)
+        for (kind, location, category, status, day), total in totals.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devices', '0017_keyset_pagination_indexes'),
+        ('reports', '0003_monthlymetric'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LocationCategoryCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('lost', 'Lost'), ('found', 'Found')], max_length=10)),
+                ('location', models.CharField(max_length=100)),
+                ('category', models.CharField(max_length=100)),
+                ('status', models.CharField(max_length=50)),
+                ('day', models.DateField()),
+                ('total', models.IntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'day'], name='reports_loc_kind_06b3b4_idx')],
+                'unique_together': {('kind', 'location', 'category', 'status', 'day')},
+            },
+        ),
+        migrations.RunPython(populate_location_counts, migrations.RunPython.noop),
+    ]
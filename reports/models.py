@@ -18,6 +18,56 @@ class Report(models.Model):
 	details = models.TextField(blank=True, null=True)
 	report_date = models.DateTimeField(auto_now_add=True)
 
+	class Meta:
+		indexes = [
+			models.Index(fields=['report_date', 'id']),
+		]
+
+	def __str__(self):
+		return f"Report by {self.user.email} on item {self.item_id} ({self.type})"
+
+
+class MonthlyMetric(models.Model):
+	METRIC_CHOICES = (
+		('lost_items', 'Lost items'),
+		('found_items', 'Found items'),
+		('matches', 'Matches'),
+		('returns', 'Returns'),
+		('new_users', 'New users'),
+	)
+
+	metric = models.CharField(max_length=20, choices=METRIC_CHOICES)
+	# First day of the month the counted rows were created in
+	month = models.DateField()
+	total = models.IntegerField(default=0)
+
+	class Meta:
+		unique_together = ('month', 'metric')
+
 	def __str__(self):
-		return f"Report by {self.user.email} on item {self.item_id} ({self.type})" 
+		return f"{self.metric} {self.month:%Y-%m}: {self.total}"
 
+
+class LocationCategoryCount(models.Model):
+	KIND_CHOICES = (
+		('lost', 'Lost'),
+		('found', 'Found'),
+	)
+
+	kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+	# city_town for lost items, district for found items; 'Unknown' when blank
+	location = models.CharField(max_length=100)
+	category = models.CharField(max_length=100)
+	status = models.CharField(max_length=50)
+	# Day the items were reported, so windows can be summed from daily buckets
+	day = models.DateField()
+	total = models.IntegerField(default=0)
+
+	class Meta:
+		unique_together = ('kind', 'location', 'category', 'status', 'day')
+		indexes = [
+			models.Index(fields=['kind', 'day']),
+		]
+
+	def __str__(self):
+		return f"{self.kind} {self.location}/{self.category} {self.day}: {self.total}"
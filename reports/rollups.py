@@ -0,0 +1,146 @@
+from datetime import datetime
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate, TruncMonth
+from django.utils import timezone
+
+from authentication.models import User
+from devices.models import LostItem, FoundItem, Match, Return
+from devices.versions import touch
+from .models import MonthlyMetric, LocationCategoryCount
+
+# metric -> (model, timestamp field the month is taken from)
+ROLLUP_SOURCES = {
+	'lost_items': (LostItem, 'date_reported'),
+	'found_items': (FoundItem, 'date_reported'),
+	'matches': (Match, 'match_date'),
+	'returns': (Return, 'return_date'),
+	'new_users': (User, 'date_joined'),
+}
+
+# kind -> (model, location field)
+LOCATION_SOURCES = {
+	'lost': (LostItem, 'city_town'),
+	'found': (FoundItem, 'district'),
+}
+
+
+def month_start(value):
+	if isinstance(value, datetime):
+		if timezone.is_aware(value):
+			value = timezone.localtime(value)
+		value = value.date()
+	return value.replace(day=1)
+
+
+def bump(metric, when, delta=1):
+	"""Add delta to the metric's counter for the month containing `when`, once the caller commits.
+
+	The counter row is shared by every writer in the month, so it is only
+	locked after the caller's transaction, not for the rest of it.
+	"""
+	month = month_start(when)
+	transaction.on_commit(lambda: _bump_month(metric, month, delta))
+
+
+def _bump_month(metric, month, delta):
+	# A transaction of its own, so touch() bumps the version once the counter is written
+	with transaction.atomic():
+		touch('monthly_stats')
+		updated = MonthlyMetric.objects.filter(metric=metric, month=month).update(total=F('total') + delta)
+		if updated:
+			return
+		try:
+			with transaction.atomic():
+				MonthlyMetric.objects.create(metric=metric, month=month, total=delta)
+		except IntegrityError:
+			# Another writer created the row first
+			MonthlyMetric.objects.filter(metric=metric, month=month).update(total=F('total') + delta)
+
+
+def rebuild(metrics=None):
+	"""Recount rollups from the source tables. Returns the number of rows written."""
+	metrics = metrics or list(ROLLUP_SOURCES)
+	rows = []
+	for metric in metrics:
+		model, date_field = ROLLUP_SOURCES[metric]
+		qs = (
+			model.objects.annotate(month=TruncMonth(date_field))
+			.values('month')
+			.annotate(total=Count('id'))
+			.order_by()
+		)
+		rows.extend(
+			MonthlyMetric(metric=metric, month=month_start(row['month']), total=row['total'])
+			for row in qs
+		)
+	with transaction.atomic():
+		MonthlyMetric.objects.filter(metric__in=metrics).delete()
+		MonthlyMetric.objects.bulk_create(rows)
+		touch('monthly_stats')
+	return len(rows)
+
+
+def _day(value):
+	if isinstance(value, datetime):
+		if timezone.is_aware(value):
+			value = timezone.localtime(value)
+		value = value.date()
+	return value
+
+
+def location_key(kind, location, category, status, reported):
+	"""Bucket an item falls into: (kind, location, category, status, day)."""
+	return (kind, location or 'Unknown', category or 'Unknown', status or '', _day(reported))
+
+
+def instance_location_key(kind, instance):
+	_, location_field = LOCATION_SOURCES[kind]
+	return location_key(kind, getattr(instance, location_field), instance.category, instance.status, instance.date_reported)
+
+
+def bump_location(key, delta=1):
+	"""Add delta to a location bucket's counter once the caller commits, as bump() does."""
+	transaction.on_commit(lambda: _bump_location(key, delta))
+
+
+def _bump_location(key, delta):
+	kind, location, category, status, day = key
+	lookup = {'kind': kind, 'location': location, 'category': category, 'status': status, 'day': day}
+	# As in _bump_month: touch() takes effect once the counter is written
+	with transaction.atomic():
+		touch('location_stats')
+		if LocationCategoryCount.objects.filter(**lookup).update(total=F('total') + delta):
+			return
+		try:
+			with transaction.atomic():
+				LocationCategoryCount.objects.create(total=delta, **lookup)
+		except IntegrityError:
+			LocationCategoryCount.objects.filter(**lookup).update(total=F('total') + delta)
+
+
+def rebuild_location_counts():
+	"""Recount LocationCategoryCount from the item tables. Returns rows written."""
+	rows = []
+	for kind, (model, location_field) in LOCATION_SOURCES.items():
+		qs = (
+			model.objects.annotate(day=TruncDate('date_reported'))
+			.values(location_field, 'category', 'status', 'day')
+			.annotate(total=Count('id'))
+			.order_by()
+		)
+		totals = {}
+		for row in qs:
+			# None and '' both land in the 'Unknown' bucket
+			key = location_key(kind, row[location_field], row['category'], row['status'], row['day'])
+			totals[key] = totals.get(key, 0) + row['total']
+		rows.extend(
+			LocationCategoryCount(kind=k, location=loc, category=cat, status=st, day=day, total=total)
+			for (k, loc, cat, st, day), total in totals.items()
+		)
+	with transaction.atomic():
+		LocationCategoryCount.objects.all().delete()
+		LocationCategoryCount.objects.bulk_create(rows)
+		touch('location_stats')
+	return len(rows)
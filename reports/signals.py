@@ -0,0 +1,94 @@
+from collections import Counter
+
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from devices.models import Match, Return
+from devices.signals import matches_created, items_status_changed, returns_created
+from .rollups import (
+	ROLLUP_SOURCES, LOCATION_SOURCES, bump, bump_location, location_key, instance_location_key, month_start,
+)
+
+
+def _connect(metric, model, date_field):
+	def on_save(sender, instance, created, raw=False, **kwargs):
+		if created and not raw:
+			bump(metric, getattr(instance, date_field), 1)
+
+	def on_delete(sender, instance, **kwargs):
+		bump(metric, getattr(instance, date_field), -1)
+
+	post_save.connect(on_save, sender=model, weak=False, dispatch_uid=f'rollup-save-{metric}')
+	post_delete.connect(on_delete, sender=model, weak=False, dispatch_uid=f'rollup-delete-{metric}')
+
+
+for _metric, (_model, _date_field) in ROLLUP_SOURCES.items():
+	_connect(_metric, _model, _date_field)
+
+
+def _connect_location(kind, model, location_field):
+	tracked = {location_field, 'category', 'status'}
+
+	def before_save(sender, instance, raw=False, update_fields=None, **kwargs):
+		# Remember which bucket the stored row was in so a move can be applied after save
+		instance._location_key = None
+		if raw or instance._state.adding:
+			return
+		if update_fields is not None and not tracked & set(update_fields):
+			return
+		old = sender.objects.filter(pk=instance.pk).values(location_field, 'category', 'status', 'date_reported').first()
+		if old:
+			instance._location_key = location_key(kind, old[location_field], old['category'], old['status'], old['date_reported'])
+
+	def on_save(sender, instance, created, raw=False, **kwargs):
+		if raw:
+			return
+		if created:
+			bump_location(instance_location_key(kind, instance), 1)
+			return
+		old_key = getattr(instance, '_location_key', None)
+		new_key = instance_location_key(kind, instance)
+		if old_key is not None and old_key != new_key:
+			bump_location(old_key, -1)
+			bump_location(new_key, 1)
+
+	def on_delete(sender, instance, **kwargs):
+		bump_location(instance_location_key(kind, instance), -1)
+
+	pre_save.connect(before_save, sender=model, weak=False, dispatch_uid=f'location-presave-{kind}')
+	post_save.connect(on_save, sender=model, weak=False, dispatch_uid=f'location-save-{kind}')
+	post_delete.connect(on_delete, sender=model, weak=False, dispatch_uid=f'location-delete-{kind}')
+
+
+for _kind, (_model, _location_field) in LOCATION_SOURCES.items():
+	_connect_location(_kind, _model, _location_field)
+
+
+@receiver(matches_created, sender=Match, dispatch_uid='rollup-bulk-matches')
+def count_bulk_matches(sender, matches, **kwargs):
+	for month, total in Counter(month_start(match.match_date) for match in matches).items():
+		bump('matches', month, total)
+
+
+@receiver(returns_created, sender=Return, dispatch_uid='rollup-bulk-returns')
+def count_bulk_returns(sender, returns, **kwargs):
+	for month, total in Counter(month_start(ret.return_date) for ret in returns).items():
+		bump('returns', month, total)
+
+
+@receiver(items_status_changed, dispatch_uid='location-bulk-status')
+def move_bulk_status(sender, changes, new_status, **kwargs):
+	kind = next((k for k, (model, _) in LOCATION_SOURCES.items() if model is sender), None)
+	if kind is None:
+		return
+	_, location_field = LOCATION_SOURCES[kind]
+	old_status = dict(changes)
+	deltas = Counter()
+	rows = sender.objects.filter(id__in=list(old_status)).values('id', location_field, 'category', 'date_reported')
+	for row in rows:
+		bucket = (row[location_field], row['category'])
+		deltas[location_key(kind, *bucket, old_status[row['id']], row['date_reported'])] -= 1
+		deltas[location_key(kind, *bucket, new_status, row['date_reported'])] += 1
+	for key, delta in deltas.items():
+		if delta:
+			bump_location(key, delta)
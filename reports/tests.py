@@ -1,4 +1,9 @@
-from django.test import TestCase, override_settings
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
 from rest_framework.test import APIClient
 from devices.models import LostItem, FoundItem
 
@@ -6,12 +11,101 @@ from devices.models import LostItem, FoundItem
 class ReportsTests(TestCase):
     def setUp(self):
         self.client = APIClient()
-        LostItem.objects.create(title='Lost Phone', category='Phone', city_town='Kigali')
-        LostItem.objects.create(title='Lost Laptop', category='Laptop', city_town='Kigali')
-        FoundItem.objects.create(name='Phone', category='Phone', district='Gasabo')
+        # Counters are bumped once the creating transaction commits
+        with self.captureOnCommitCallbacks(execute=True):
+            LostItem.objects.create(title='Lost Phone', category='Phone', city_town='Kigali')
+            LostItem.objects.create(title='Lost Laptop', category='Laptop', city_town='Kigali')
+            FoundItem.objects.create(name='Phone', category='Phone', district='Gasabo')
 
     def test_location_stats(self):
         response = self.client.get('/api/reports/stats/location/')
         self.assertEqual(response.status_code, 200)
         self.assertIn('lost', response.data)
         self.assertIn('found', response.data)
+
+    def test_monthly_stats_read_from_rollups(self):
+        from .models import MonthlyMetric
+        this_month = timezone.now().strftime('%Y-%m')
+        response = self.client.get('/api/reports/stats/monthly/', {'start': this_month, 'end': this_month})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['series']['lost_items'], [2])
+        self.assertEqual(response.data['series']['found_items'], [1])
+        self.assertTrue(MonthlyMetric.objects.filter(metric='lost_items').exists())
+
+    def test_rollups_follow_deletes_and_rebuild(self):
+        from .models import MonthlyMetric
+        month = timezone.now().date().replace(day=1)
+        with self.captureOnCommitCallbacks() as callbacks:
+            LostItem.objects.filter(title='Lost Laptop').delete()
+            # The shared month row is left alone until the delete commits
+            self.assertEqual(MonthlyMetric.objects.get(metric='lost_items', month=month).total, 2)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(MonthlyMetric.objects.get(metric='lost_items', month=month).total, 1)
+        MonthlyMetric.objects.all().delete()
+        call_command('rebuild_rollups', stdout=StringIO())
+        self.assertEqual(MonthlyMetric.objects.get(metric='lost_items', month=month).total, 1)
+        self.assertEqual(MonthlyMetric.objects.get(metric='found_items', month=month).total, 1)
+
+    def test_location_stats_from_counters(self):
+        response = self.client.get('/api/reports/stats/location/')
+        kigali = response.data['lost']['Kigali']
+        self.assertEqual(kigali['total'], 2)
+        self.assertEqual(kigali['by_category'], {'Laptop': 1, 'Phone': 1})
+        self.assertEqual(kigali['top_category'], 'Laptop')
+        self.assertEqual(response.data['found']['Gasabo']['top_category'], 'Phone')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            LostItem.objects.create(title='Another Phone', category='Phone', city_town='Kigali')
+        response = self.client.get('/api/reports/stats/location/')
+        self.assertEqual(response.data['lost']['Kigali']['top_category'], 'Phone')
+
+    def test_location_counters_follow_status_changes_and_deletes(self):
+        from devices.status import set_status
+        item = LostItem.objects.get(title='Lost Phone')
+        with self.captureOnCommitCallbacks(execute=True):
+            item.city_town = 'Musanze'
+            item.save()
+            set_status(LostItem.objects.filter(id=item.id), 'claimed')
+            LostItem.objects.filter(title='Lost Laptop').delete()
+
+        response = self.client.get('/api/reports/stats/location/')
+        self.assertEqual(list(response.data['lost']), ['Musanze'])
+        claimed = self.client.get('/api/reports/stats/location/', {'status': 'claimed'})
+        self.assertEqual(claimed.data['lost']['Musanze']['total'], 1)
+        self.assertEqual(self.client.get('/api/reports/stats/location/', {'status': 'lost'}).data['lost'], {})
+
+    def test_location_stats_window(self):
+        today = timezone.localdate().isoformat()
+        response = self.client.get('/api/reports/stats/location/', {'since': today, 'until': today})
+        self.assertEqual(response.data['lost']['Kigali']['total'], 2)
+        response = self.client.get('/api/reports/stats/location/', {'until': '2000-01-01'})
+        self.assertEqual(response.data['lost'], {})
+        self.assertEqual(self.client.get('/api/reports/stats/location/', {'since': 'yesterday'}).status_code, 400)
+
+
+
+class RollupOrderingTests(TransactionTestCase):
+    """Collection versions move only once the counters they describe are written."""
+
+    def _totals_at_bump(self):
+        from devices import versions
+        from .models import MonthlyMetric, LocationCategoryCount
+        counters = {'monthly_stats': MonthlyMetric, 'location_stats': LocationCategoryCount}
+        seen = {}
+        bump = versions._bump
+
+        def record(names):
+            for name in set(names) & set(counters):
+                seen[name] = counters[name].objects.values_list('total', flat=True).first()
+            bump(names)
+
+        with mock.patch.object(versions, '_bump', record):
+            LostItem.objects.create(title='Lost Phone', category='Phone', city_town='Kigali')
+        return seen
+
+    def test_monthly_version_follows_the_counter(self):
+        self.assertEqual(self._totals_at_bump()['monthly_stats'], 1)
+
+    def test_location_version_follows_the_counter(self):
+        self.assertEqual(self._totals_at_bump()['location_stats'], 1)
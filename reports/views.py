@@ -3,14 +3,14 @@ from rest_framework import status, serializers, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from drf_spectacular.utils import extend_schema
-from .models import Report
+from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiTypes
+from lost_and_found_tracker.pagination import KeysetPagination
+from devices.versions import conditional
+from devices.response_cache import cached
+from .models import Report, MonthlyMetric, LocationCategoryCount
 from .serializers import ReportSerializer
-from devices.models import LostItem, FoundItem
-from django.db.models import Count
-from django.db.models.functions import TruncMonth
-from authentication.models import User
-from devices.models import Match, Return
+from django.db.models import F, Sum, Window
+from django.db.models.functions import FirstValue
 from datetime import datetime
 
 # ======================
@@ -54,58 +54,74 @@ def create_report(request):
 @api_view(['GET'])
 @permission_classes([permissions.IsAdminUser])
 def list_reports(request):
-	reports = Report.objects.all().order_by('-report_date')
+	paginator = KeysetPagination(ordering=('-report_date', '-id'))
+	reports = paginator.paginate_queryset(Report.objects.all(), request)
 	serializer = ReportSerializer(reports, many=True)
-	return Response(serializer.data)
+	return paginator.get_paginated_response(serializer.data)
 
 
+@conditional('location_stats')
 @extend_schema(
-    tags=["Reports"],
-    responses={200: serializers.JSONField},
-    summary="Location-based statistics",
-    description="Aggregated statistics of lost and found items by location and top categories."
+	tags=["Reports"],
+	parameters=[
+		OpenApiParameter(name='since', description='YYYY-MM-DD, inclusive', required=False, type=OpenApiTypes.DATE),
+		OpenApiParameter(name='until', description='YYYY-MM-DD, inclusive', required=False, type=OpenApiTypes.DATE),
+		OpenApiParameter(name='status', description='Only count items with this status', required=False, type=OpenApiTypes.STR),
+	],
+	responses={200: serializers.JSONField},
+	summary="Location-based statistics",
+	description="Aggregated statistics of lost and found items by location and top categories."
 )
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
+@cached('location_stats')
 def location_statistics(request):
-    # Example heuristic: use city_town for lost and district for found when present
-    lost_by_location = (
-        LostItem.objects.values('city_town', 'category')
-        .annotate(total=Count('id'))
-        .order_by('-total')
-    )
-    found_by_location = (
-        FoundItem.objects.values('district', 'category')
-        .annotate(total=Count('id'))
-        .order_by('-total')
-    )
-
-    # Build summaries: top category per location
-    def summarize(rows, location_key):
-        summary = {}
-        for row in rows:
-            loc = row.get(location_key) or 'Unknown'
-            cat = row.get('category') or 'Unknown'
-            total = row.get('total', 0)
-            if loc not in summary:
-                summary[loc] = {'total': 0, 'by_category': {}, 'top_category': None}
-            summary[loc]['total'] += total
-            summary[loc]['by_category'][cat] = summary[loc]['by_category'].get(cat, 0) + total
-        # compute top
-        for loc, data in summary.items():
-            if data['by_category']:
-                data['top_category'] = max(data['by_category'].items(), key=lambda kv: kv[1])[0]
-        return summary
-
-    lost_summary = summarize(lost_by_location, 'city_town')
-    found_summary = summarize(found_by_location, 'district')
-
-    return Response({
-        'lost': lost_summary,
-        'found': found_summary,
-    })
+	filters = {}
+	for param, lookup in (('since', 'day__gte'), ('until', 'day__lte')):
+		raw = request.query_params.get(param)
+		if raw:
+			try:
+				filters[lookup] = datetime.strptime(raw, '%Y-%m-%d').date()
+			except ValueError:
+				return Response({'error': f'{param} must be YYYY-MM-DD'}, status=status.HTTP_400_BAD_REQUEST)
+	if request.query_params.get('status'):
+		filters['status'] = request.query_params['status']
+
+	# Counters are kept per (location, category, status, day): lost items by
+	# city_town, found items by district. The top category per location is
+	# picked by a window over the summed counters.
+	def summarize(kind):
+		rows = (
+			LocationCategoryCount.objects.filter(kind=kind, **filters)
+			.values('location', 'category')
+			.annotate(items=Sum('total'))
+			.filter(items__gt=0)
+			.annotate(top_category=Window(
+				FirstValue('category'),
+				partition_by=[F('location')],
+				order_by=[F('items').desc(), F('category').asc()],
+			))
+			.order_by('-items')
+		)
+		summary = {}
+		for row in rows:
+			data = summary.setdefault(row['location'], {'total': 0, 'by_category': {}, 'top_category': row['top_category']})
+			data['total'] += row['items']
+			data['by_category'][row['category']] = row['items']
+		return summary
 
+	return Response({
+		'lost': summarize('lost'),
+		'found': summarize('found'),
+	})
 
+
+def _current_month(request):
+	# The default window ends at the current month
+	return f'{datetime.utcnow():%Y-%m}'
+
+
+@conditional('monthly_stats', key=_current_month)
 @extend_schema(
 	tags=["Reports"],
 	responses={200: serializers.JSONField},
@@ -117,6 +133,7 @@ def location_statistics(request):
 )
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
+@cached('monthly_stats', key=_current_month)
 def monthly_statistics(request):
 	# Parse range
 	start_param = request.query_params.get('start')
@@ -156,22 +173,24 @@ def monthly_statistics(request):
 	months = month_range(start_dt, end_dt)
 	labels = [f"{datetime(y, m, 1):%b %Y}" for (y, m) in months]
 
-	# Query and aggregate per month for each model
-	def aggregate(model, date_field):
-		qs = (
-			model.objects.filter(**{f"{date_field}__date__gte": start_dt.date(), f"{date_field}__date__lte": end_dt.date()})
-			.annotate(month=TruncMonth(date_field))
-			.values('month')
-			.annotate(total=Count('id'))
-		)
-		by_month = { (row['month'].year, row['month'].month): row['total'] for row in qs }
+	# Read the precomputed per-month counters for the whole window at once
+	rollups = MonthlyMetric.objects.filter(
+		month__gte=start_dt.date().replace(day=1),
+		month__lte=end_dt.date().replace(day=1),
+	).values_list('metric', 'month', 'total')
+	by_metric = {}
+	for metric, month, total in rollups:
+		by_metric.setdefault(metric, {})[(month.year, month.month)] = total
+
+	def series(metric):
+		by_month = by_metric.get(metric, {})
 		return [by_month.get((y, m), 0) for (y, m) in months]
 
-	lost_counts = aggregate(LostItem, 'date_reported')
-	found_counts = aggregate(FoundItem, 'date_reported')
-	match_counts = aggregate(Match, 'match_date')
-	return_counts = aggregate(Return, 'return_date')
-	user_counts = aggregate(User, 'date_joined')
+	lost_counts = series('lost_items')
+	found_counts = series('found_items')
+	match_counts = series('matches')
+	return_counts = series('returns')
+	user_counts = series('new_users')
 
 	return Response({
 		'labels': labels,